@@ -0,0 +1,90 @@
+"""Benchmark of the latency between receiving an answer and waking its waiter.
+
+Compares the former polling of an ``asyncio.Event`` every millisecond with waiting
+for the future of an ``AnswerTable`` entry. A helper thread plays the role of the
+receive thread and resolves the answer. Additionally the CPU time consumed by an
+idle wait is measured.
+
+Run from the top directory of the repository:
+```sh
+python3 -m benchmarks.bench_answer_latency
+```
+"""
+
+import asyncio
+import statistics
+import threading
+import time
+
+from cri_lib.cri_answers import AnswerTable
+from cri_lib.cri_errors import CRICommandTimeOutError
+
+
+async def legacy_wait(event: asyncio.Event, timeout: float) -> None:
+    """Waiting as implemented before ``AnswerTable``."""
+    t_start = time.time()
+    while not event.is_set():
+        await asyncio.sleep(0.001)
+        if time.time() - t_start > timeout:
+            raise TimeoutError
+
+
+async def measure_latency(kind: str, samples: int) -> list[float]:
+    latencies = []
+    answers = AnswerTable()
+    for _ in range(samples):
+        event = asyncio.Event()
+        answers.register("1")
+        set_time_ns = 0
+
+        def set_event() -> None:
+            nonlocal set_time_ns
+            time.sleep(0.0005)
+            set_time_ns = time.perf_counter_ns()
+            if kind == "legacy":
+                event.set()
+            else:
+                answers.resolve("1")
+
+        threading.Thread(target=set_event).start()
+        if kind == "legacy":
+            await legacy_wait(event, timeout=1.0)
+        else:
+            await answers.wait_async("1", timeout=1.0)
+        latencies.append((time.perf_counter_ns() - set_time_ns) / 1000)
+    return latencies
+
+
+async def measure_idle_cpu(kind: str, duration: float) -> float:
+    answers = AnswerTable()
+    answers.register("1")
+    t_cpu = time.process_time()
+    try:
+        if kind == "legacy":
+            await legacy_wait(asyncio.Event(), timeout=duration)
+        else:
+            await answers.wait_async("1", timeout=duration)
+    except (TimeoutError, CRICommandTimeOutError):
+        pass
+    return (time.process_time() - t_cpu) / duration
+
+
+def main(samples: int = 200, idle_duration: float = 1.0) -> dict[str, dict[str, float]]:
+    results = {}
+    for kind in ("legacy", "future"):
+        latencies = asyncio.run(measure_latency(kind, samples))
+        results[kind] = {
+            "latency_median_us": statistics.median(latencies),
+            "latency_max_us": max(latencies),
+            "idle_cpu_fraction": asyncio.run(measure_idle_cpu(kind, idle_duration)),
+        }
+        print(
+            f"{kind:7s}: ack-to-wakeup median {results[kind]['latency_median_us']:8.1f} us, "
+            f"max {results[kind]['latency_max_us']:8.1f} us, "
+            f"idle CPU {100 * results[kind]['idle_cpu_fraction']:5.1f} %"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    main()
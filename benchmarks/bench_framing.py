@@ -0,0 +1,121 @@
+"""Benchmark of splitting received data into CRI frames.
+
+Compares the former framing of ``CRIClient._bg_receive_thread``, which searched the
+whole buffer and re-sliced it after every frame, with ``CRIFrameScanner``.
+Each read delivers a burst of STATUS, RUNSTATE, CYCLESTAT and VARIABLES messages.
+
+Run from the top directory of the repository:
+```sh
+python3 -m benchmarks.bench_framing
+```
+"""
+
+import itertools
+import time
+
+from cri_lib import CRIFrameScanner
+
+STATUS_MESSAGE = " ".join(
+    [
+        "CRISTART 1 STATUS MODE joint",
+        "POSJOINTSETPOINT " + " ".join(f"{i}.00" for i in range(1, 17)),
+        "POSJOINTCURRENT " + " ".join(f"{i}.00" for i in range(1, 17)),
+        "POSCARTROBOT 10.0 20.0 30.0 0.00 90.00 0.00",
+        "POSCARTPLATFORM 10.0 20.0 180.00",
+        "OVERRIDE 80.0 DIN 0000000000000FF00 DOUT 0000000000000FF00",
+        "ESTOP 3 SUPPLY 23000 CURRENTALL 2600",
+        "CURRENTJOINTS " + " ".join(str(10 * i) for i in range(1, 17)),
+        "ERROR NoError " + " ".join(["0"] * 16),
+        "KINSTATE 0 OPMODE 0 CARTSPEED 123.4 GSIG 00ff00ff00ff",
+        "FRAMEROBOT MyFrame 1.0 2.0 3.0 4.0 5.0 6.0 CRIEND",
+    ]
+)
+MESSAGES = [
+    STATUS_MESSAGE.encode() + b"\n",
+    b"CRISTART 2 RUNSTATE MAIN testmotion.xml pickpart.xml 12 3 0 2 CRIEND\n",
+    b"CRISTART 3 CYCLESTAT 9.5 12.3 CRIEND\n",
+    b"CRISTART 4 VARIABLES ValueNrVariable #programrunning 0 ValuePosVariable #position "
+    + " ".join(["1.0"] * 15).encode()
+    + b" CRIEND\n",
+]
+
+
+class BurstSocket:
+    """Socket replacement delivering the same burst of frames on every read.
+
+    Like a real socket, ``recv`` allocates a new bytes object and ``recv_into``
+    copies into the given buffer.
+    """
+
+    def __init__(self, burst: bytes) -> None:
+        self.burst = burst
+        self._source = bytearray(burst)
+
+    def recv(self, bufsize: int) -> bytes:
+        return bytes(self._source)
+
+    def recv_into(self, buffer: memoryview) -> int:
+        buffer[: len(self.burst)] = self.burst
+        return len(self.burst)
+
+
+def make_burst(frames_per_read: int) -> bytes:
+    return b"".join(itertools.islice(itertools.cycle(MESSAGES), frames_per_read))
+
+
+def legacy_framing(sock: BurstSocket, reads: int) -> int:
+    """Framing as implemented before ``CRIFrameScanner``, parsing omitted."""
+    frames = 0
+    message_buffer = bytearray()
+    for _ in range(reads):
+        message_buffer.extend(sock.recv(4096))
+        while (end_idx := message_buffer.find(b"CRIEND")) != -1:
+            start_idx = message_buffer.find(b"CRISTART")
+            if start_idx != -1:
+                message_buffer[start_idx : end_idx + 6].decode()
+                frames += 1
+            if len(message_buffer) > end_idx + 7:
+                message_buffer = message_buffer[end_idx + 7 :]
+            else:
+                message_buffer.clear()
+    return frames
+
+
+def scanner_framing(sock: BurstSocket, reads: int) -> int:
+    frames = 0
+    scanner = CRIFrameScanner(min_read_size=len(sock.burst))
+    for _ in range(reads):
+        scanner.recv_into(sock)
+        for frame in scanner.frames():
+            frame.decode()
+            frames += 1
+    return frames
+
+
+def frames_per_second(framing, frames_per_read: int, min_frames: int = 20000) -> float:
+    sock = BurstSocket(make_burst(frames_per_read))
+    reads = max(1, min_frames // frames_per_read)
+    t_start = time.perf_counter()
+    frames = framing(sock, reads)
+    return frames / (time.perf_counter() - t_start)
+
+
+def main() -> dict[str, dict[int, float]]:
+    results: dict[str, dict[int, float]] = {"legacy": {}, "scanner": {}}
+    for frames_per_read in (1, 10, 100, 1000):
+        results["legacy"][frames_per_read] = frames_per_second(
+            legacy_framing, frames_per_read
+        )
+        results["scanner"][frames_per_read] = frames_per_second(
+            scanner_framing, frames_per_read
+        )
+        print(
+            f"{frames_per_read:5d} frames/read: "
+            f"legacy {results['legacy'][frames_per_read]:12.0f} frames/s, "
+            f"scanner {results['scanner'][frames_per_read]:12.0f} frames/s"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    main()
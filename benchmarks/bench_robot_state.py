@@ -0,0 +1,88 @@
+"""Benchmark of the memory footprint of robot states.
+
+Measures the deep size of a ``RobotState`` and the memory retained per parsed
+STATUS message if every published snapshot is kept, e.g. in a history.
+Additionally the number of container objects created per STATUS message and the
+size of the individual value types are reported.
+
+Run from the top directory of the repository:
+```sh
+python3 -m benchmarks.bench_robot_state
+```
+"""
+
+import dataclasses
+import gc
+import json
+import sys
+import threading
+import tracemalloc
+
+from cri_lib import (
+    CRIProtocolParser,
+    ErrorStates,
+    JointsState,
+    PosVariable,
+    RobotCartesianPosition,
+    RobotState,
+)
+
+from .bench_framing import STATUS_MESSAGE
+
+
+def deep_size(obj: object, seen: set[int] | None = None) -> int:
+    """Size of an object including all objects referenced by it, counted once."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or isinstance(obj, type):
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif dataclasses.is_dataclass(obj):
+        if hasattr(obj, "__dict__"):
+            size += deep_size(obj.__dict__, seen)
+        for f in dataclasses.fields(obj):
+            size += deep_size(getattr(obj, f.name), seen)
+    return size
+
+
+def measure_history(iterations: int) -> dict[str, float]:
+    """Parses STATUS messages and keeps every published snapshot."""
+    parser = CRIProtocolParser(RobotState(), threading.Lock())
+    parser.parse_message(STATUS_MESSAGE)
+    history = []
+
+    gc.collect()
+    objects_before = len(gc.get_objects())
+    tracemalloc.start()
+    for _ in range(iterations):
+        parser.parse_message(STATUS_MESSAGE)
+        history.append(parser.robot_state)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    objects_after = len(gc.get_objects())
+
+    return {
+        "robot_state_bytes": deep_size(history[-1]),
+        "retained_bytes_per_status": retained / iterations,
+        "gc_objects_per_status": (objects_after - objects_before) / iterations,
+    }
+
+
+def main(iterations: int = 2000) -> dict[str, float]:
+    results = {
+        "robot_state_default_bytes": deep_size(RobotState()),
+        **measure_history(iterations),
+    }
+    for cls in (JointsState, RobotCartesianPosition, PosVariable, ErrorStates):
+        results[f"{cls.__name__}_bytes"] = deep_size(cls())
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(main(), indent=2))
@@ -0,0 +1,315 @@
+"""Benchmark suite with machine-readable results for comparing library versions.
+
+Measures
+- the throughput of ``CRIProtocolParser.parse_message`` per message category,
+- the throughput of the receive thread framing received data, with and without
+  parsing, and of the former framing against ``CRIFrameScanner`` at 10 frames per
+  read,
+- the round trip latency of commands through ``CRIController.send_command`` and
+  ``_wait_for_answer`` against a ``CRISimulator`` at several STATUS rates,
+- the memory per connection of ``CRIClient`` and ``AsyncCRIClient``.
+
+The simulator runs in a separate process, so it neither competes with the client for
+the GIL nor is its memory attributed to the client. The results are printed or
+written as JSON, including the library and Python version.
+
+Run from the top directory of the repository:
+```sh
+python3 -m benchmarks.bench_suite --output results.json
+```
+"""
+
+import argparse
+import asyncio
+import gc
+import importlib.metadata
+import json
+import logging
+import multiprocessing
+import platform
+import socket
+import statistics
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from cri_lib import (
+    AsyncCRIClient,
+    CRIClient,
+    CRIController,
+    CRIFrameScanner,
+    CRIProtocolParser,
+    CRISimulator,
+    RobotState,
+)
+
+from . import bench_framing as framing
+from .bench_framing import STATUS_MESSAGE
+
+AXES_MESSAGE = "CRISTART 1 CONFIG Axes " + " ".join(
+    f"A{i} 1 -180 180 100" for i in range(1, 7)
+)
+
+CATEGORY_MESSAGES = {
+    "STATUS": STATUS_MESSAGE,
+    "RUNSTATE": "CRISTART 2 RUNSTATE MAIN testmotion.xml pickpart.xml 12 3 0 2 CRIEND",
+    "CYCLESTAT": "CRISTART 3 CYCLESTAT 9.5 12.3 CRIEND",
+    "VARIABLES": (
+        "CRISTART 4 VARIABLES ValueNrVariable #programrunning 0 ValuePosVariable "
+        "#position " + " ".join(["1.0"] * 15) + " CRIEND"
+    ),
+    "CMDACK": "CRISTART 5 CMDACK 42 CRIEND",
+    "CMDERROR": "CRISTART 6 CMDERROR 42 Robot not enabled CRIEND",
+    "EXECEND": "CRISTART 7 EXECEND CRIEND",
+    "INFO": "CRISTART 8 INFO BoardTemp " + " ".join(["30.0"] * 16) + " CRIEND",
+    "CONFIG": AXES_MESSAGE + " CRIEND",
+    "CANBridge": (
+        "CRISTART 9 CANBridge Msg ID 32 Len 8 Data 0 1 2 3 4 5 6 7 Time 0 "
+        "SystemTime 456789 CRIEND"
+    ),
+}
+"""a typical message of every benchmarked category"""
+
+BURST = "".join(
+    CATEGORY_MESSAGES[category]
+    for category in ("STATUS", "RUNSTATE", "CYCLESTAT", "VARIABLES")
+).encode()
+"""data of one read of the receive thread"""
+
+
+def rate(function: Callable[[], Any], duration: float) -> float:
+    """Calls `function` repeatedly for at least `duration` seconds, returns calls/s."""
+    calls = 0
+    batch = 1
+    t_start = time.perf_counter()
+    while (elapsed := time.perf_counter() - t_start) < duration:
+        for _ in range(batch):
+            function()
+        calls += batch
+        batch *= 2
+    return calls / elapsed
+
+
+def bench_parser(duration: float) -> dict[str, float]:
+    """Messages per second parsed by ``CRIProtocolParser.parse_message``."""
+    results = {}
+    for category, message in CATEGORY_MESSAGES.items():
+        parser = CRIProtocolParser(RobotState(), threading.Lock())
+        parser.parse_message(AXES_MESSAGE + " CRIEND")
+        results[category] = rate(lambda: parser.parse_message(message), duration)
+    return results
+
+
+def _send_bursts(sock: socket.socket, bursts: int) -> None:
+    data = BURST * 100
+    for _ in range(bursts // 100):
+        sock.sendall(data)
+
+
+def bench_framing(duration: float) -> dict[str, float]:
+    """Frames per second received over a local socket, with and without parsing."""
+    bursts = max(100, int(duration * 20000) // 100 * 100)
+    frames = 4 * bursts
+
+    # framing only
+    client_sock, server_sock = socket.socketpair()
+    sender = threading.Thread(target=_send_bursts, args=(server_sock, bursts))
+    scanner = CRIFrameScanner()
+    received = 0
+    t_start = time.perf_counter()
+    sender.start()
+    while received < frames:
+        scanner.recv_into(client_sock)
+        for frame in scanner.frames():
+            frame.decode()
+            received += 1
+    scanner_rate = received / (time.perf_counter() - t_start)
+    sender.join()
+    client_sock.close()
+    server_sock.close()
+
+    # receive thread of a client including parsing
+    client = CRIClient()
+    client_sock, server_sock = socket.socketpair()
+    client.sock = client_sock
+    client.sock.settimeout(0.1)
+    client.connected = True
+    client._parse_message(AXES_MESSAGE + " CRIEND")
+    done = threading.Event()
+    statuses = 0
+
+    def count(state: RobotState) -> None:
+        nonlocal statuses
+        statuses += 1
+        if statuses == bursts:
+            done.set()
+
+    client.register_status_callback(count)
+    t_start = time.perf_counter()
+    client.receive_thread.start()
+    _send_bursts(server_sock, bursts)
+    done.wait()
+    receive_thread_rate = frames / (time.perf_counter() - t_start)
+    client.connected = False
+    client.receive_thread.join()
+    client_sock.close()
+    server_sock.close()
+
+    # former framing against the scanner at a realistic batch size
+    min_frames = max(1000, int(duration * 200000))
+    return {
+        "scanner_frames_per_s": scanner_rate,
+        "receive_thread_frames_per_s": receive_thread_rate,
+        "legacy_10_frames_per_read_frames_per_s": framing.frames_per_second(
+            framing.legacy_framing, 10, min_frames
+        ),
+        "scanner_10_frames_per_read_frames_per_s": framing.frames_per_second(
+            framing.scanner_framing, 10, min_frames
+        ),
+    }
+
+
+def _serve_simulator(ports, stop, status_rate: float) -> None:
+    simulator = CRISimulator(status_rate=status_rate)
+    ports.put(simulator.start_in_thread())
+    stop.wait()
+    simulator.stop_in_thread()
+
+
+@contextmanager
+def simulator_process(status_rate: float) -> Iterator[int]:
+    """Runs a ``CRISimulator`` in a separate process, yields its port."""
+    ports: multiprocessing.Queue = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    process = multiprocessing.Process(
+        target=_serve_simulator, args=(ports, stop, status_rate), daemon=True
+    )
+    process.start()
+    try:
+        yield ports.get(timeout=30)
+    finally:
+        stop.set()
+        process.join(timeout=10)
+
+
+def bench_round_trip(samples: int, status_rate: float) -> dict[str, float]:
+    """Latency of a command and its CMDACK through ``CRIController``."""
+    with simulator_process(status_rate) as port:
+        controller = CRIController()
+        controller.connect("127.0.0.1", port)
+        try:
+            latencies = []
+            for i in range(samples + samples // 10):
+                t_start = time.perf_counter_ns()
+                msg_id = controller.send_command("CMD Override 100", True)
+                controller._wait_for_answer(msg_id)
+                if i >= samples // 10:
+                    # the first tenth warms up
+                    latencies.append((time.perf_counter_ns() - t_start) / 1000)
+        finally:
+            controller.close()
+
+    latencies.sort()
+    return {
+        "median_us": statistics.median(latencies),
+        "p90_us": latencies[int(0.9 * (len(latencies) - 1))],
+        "p99_us": latencies[int(0.99 * (len(latencies) - 1))],
+        "max_us": latencies[-1],
+        "commands_per_s": 1e6 / statistics.mean(latencies),
+    }
+
+
+def _traced_bytes() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def bench_memory(connections: int, settle: float) -> dict[str, float]:
+    """Memory allocated per connected client receiving STATUS messages at 100 Hz."""
+    results = {}
+    with simulator_process(status_rate=100) as port:
+        tracemalloc.start()
+        try:
+            before = _traced_bytes()
+            threads = threading.active_count()
+            clients = [CRIClient() for _ in range(connections)]
+            for client in clients:
+                client.connect("127.0.0.1", port)
+            time.sleep(settle)
+            results["CRIClient_bytes"] = (_traced_bytes() - before) / connections
+            results["CRIClient_threads"] = (
+                threading.active_count() - threads
+            ) / connections
+            for client in clients:
+                client.close()
+            del clients
+
+            async def connect_async() -> float:
+                before = _traced_bytes()
+                clients = [AsyncCRIClient() for _ in range(connections)]
+                for client in clients:
+                    await client.connect("127.0.0.1", port)
+                await asyncio.sleep(settle)
+                size = (_traced_bytes() - before) / connections
+                for client in clients:
+                    await client.close()
+                return size
+
+            results["AsyncCRIClient_bytes"] = asyncio.run(connect_async())
+        finally:
+            tracemalloc.stop()
+    return results
+
+
+def metadata() -> dict[str, str]:
+    try:
+        version = importlib.metadata.version("cri_lib")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    return {
+        "cri_lib_version": version,
+        "python_version": platform.python_version(),
+        "python_implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def main(
+    duration: float = 1.0,
+    samples: int = 1000,
+    status_rates: tuple[float, ...] = (0, 100, 1000),
+    connections: int = 10,
+) -> dict[str, Any]:
+    return {
+        "metadata": metadata(),
+        "parser_messages_per_s": bench_parser(duration),
+        "framing": bench_framing(duration),
+        "round_trip": {
+            f"status_{status_rate:g}_hz": bench_round_trip(samples, status_rate)
+            for status_rate in status_rates
+        },
+        "memory_per_connection": bench_memory(connections, settle=duration),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--quick", action="store_true", help="short measurements")
+    args = parser.parse_args()
+    # closing clients log the lost connection as error
+    logging.basicConfig(level=logging.CRITICAL)
+
+    if args.quick:
+        results = main(duration=0.2, samples=200, connections=3)
+    else:
+        results = main()
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    print(json.dumps(results, indent=2))
@@ -2,15 +2,29 @@
 .. include:: ../README.md
 """
 
+from .cri_answers import AdaptiveTimeout, AnswerTable
+from .cri_async_controller import AsyncCRIClient, AsyncCRIController
 from .cri_controller import CRIClient, CRIConnector, CRIController, MotionType
+from .cri_deploy import DeployResult
+from .cri_dispatcher import CallbackDispatcher
 from .cri_errors import (
     CRICommandError,
     CRICommandTimeOutError,
     CRIConnectionError,
     CRIError,
 )
+from .cri_export import export_recording
+from .cri_file_list import FileListCache
+from .cri_framing import CRIFrameScanner
+from .cri_path import PathResult, PathSegment, Waypoint
+from .cri_pipeline import CommandPipeline
 from .cri_protocol_parser import CRIProtocolParser
+from .cri_recorder import CRIRecorder, CRIRecordReader, RecordedFrame, RecordingBlock
+from .cri_simulator import CRISimulator
+from .cri_stats import CRIStats, LatencyHistogram
+from .cri_upload import UploadResult
 from .robot_state import (
+    BitView,
     ErrorStates,
     JointsState,
     KinematicsState,
@@ -25,4 +39,12 @@ from .robot_state import (
     RobotMode,
     RobotState,
     RunState,
+    changed_bits,
+    din_mask,
+    pack_bits,
+    test_bits,
 )
+from .robot_state_arrays import RobotStateArrays, numpy_available
+from .robot_state_history import HistoryWindow, RobotStateHistory
+from .robot_state_stream import RobotStateStream
+from .robot_state_subscriptions import RobotStateSubscriptions, StateSubscription
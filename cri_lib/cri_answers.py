@@ -0,0 +1,455 @@
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any
+
+from .cri_errors import CRICommandTimeOutError
+from .cri_stats import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _AnswerEntry:
+    """Expected answer with the time it was registered."""
+
+    future: concurrent.futures.Future = field(default_factory=concurrent.futures.Future)
+    registered: float = field(default_factory=monotonic)
+    waiters: int = 0
+    kind: str | None = None
+    """command type whose round trip time is recorded on resolution"""
+
+
+def command_kind(command: str) -> str:
+    """Returns the type of a command for round trip statistics.
+
+    The type consists of the first two words, e.g. `CMD Enable` or
+    `SYSTEM GetBoardTemp`, and for moves the third word, e.g. `CMD Move Joint`.
+
+    Parameters
+    ----------
+    command : str
+        command without `CRISTART`, counter and `CRIEND`
+    """
+    words = command.split(maxsplit=3)
+    if len(words) > 2 and words[1] == "Move":
+        return " ".join(words[:3])
+    return " ".join(words[:2])
+
+
+@dataclass
+class AdaptiveTimeout:
+    """Timeout policy deriving answer timeouts from observed round trip times.
+
+    Once `min_samples` round trips of a command type were observed, waiting for an
+    answer of this type times out after `multiplier` times the `percentile` of its
+    round trip times, but not before `min_timeout` seconds. Timeouts passed to the wait
+    methods are upper bounds, a policy only shortens them. Answers without a command
+    type, e.g. `EXECEND` or `status`, are not affected.
+    """
+
+    multiplier: float = 10.0
+    """factor applied to the percentile of the round trip times"""
+    percentile: float = 0.99
+    """percentile of the round trip times as fraction"""
+    min_timeout: float = 0.5
+    """lower bound of adaptive timeouts in seconds"""
+    min_samples: int = 20
+    """number of round trips of a command type required before adapting"""
+
+    def timeout(
+        self, round_trip_times: LatencyHistogram | None, timeout: float | None
+    ) -> float | None:
+        """Returns the timeout for an answer.
+
+        Parameters
+        ----------
+        round_trip_times : LatencyHistogram | None
+            observed round trip times of the command type
+        timeout : float | None
+            requested timeout in seconds, infinite if `None`
+
+        Returns
+        -------
+        float | None
+            timeout in seconds, infinite if `None`
+        """
+        if round_trip_times is None or round_trip_times.count < self.min_samples:
+            return timeout
+        adaptive = max(
+            self.min_timeout,
+            self.multiplier * round_trip_times.percentile(self.percentile) / 1e6,
+        )
+        return adaptive if timeout is None else min(timeout, adaptive)
+
+
+class AnswerTable:
+    """Thread-safe table correlating expected answers with their waiters.
+
+    Every expected answer is represented by a ``concurrent.futures.Future`` which is
+    resolved by the receive path with `None` (success) or an error message. Waiting is
+    possible from any thread via ``wait`` and from any event loop via ``wait_async``,
+    no event loop is needed for blocking waits.
+
+    Entries which are registered but never waited for (orphans) are expired once they
+    are older than `max_age` seconds or if the table exceeds `max_entries`, so the
+    table cannot grow without bound in long running processes. Entries with an active
+    waiter are never expired by age.
+
+    Answers registered with a command type record their round trip time, from
+    registration to resolution, in `round_trip_times`. An optional `timeout_policy`
+    derives the timeouts of waits from these.
+    """
+
+    DEFAULT_MAX_ENTRIES = 1024
+    DEFAULT_MAX_AGE_SEC = 120.0
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_age: float = DEFAULT_MAX_AGE_SEC,
+    ) -> None:
+        """Create an empty answer table.
+
+        Parameters
+        ----------
+        max_entries : int
+            maximum number of entries, the oldest entries are expired if exceeded
+        max_age : float
+            age in seconds after which entries without waiter are expired
+        """
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _AnswerEntry] = OrderedDict()
+
+        self.registered_count = 0
+        """number of registered answers"""
+        self.resolved_count = 0
+        """number of answers which were received while registered"""
+        self.timed_out_count = 0
+        """number of waits which timed out"""
+        self.expired_count = 0
+        """number of entries removed because of their age or the table size"""
+        self.round_trip_times: dict[str, LatencyHistogram] = {}
+        """round trip times per command type"""
+        self.timeout_policy: AdaptiveTimeout | None = None
+        """policy shortening the timeouts of answers with a command type"""
+
+    def __contains__(self, answer_id: str) -> bool:
+        with self._lock:
+            return answer_id in self._entries
+
+    @property
+    def outstanding(self) -> int:
+        """Number of registered answers which were not yet received."""
+        with self._lock:
+            return sum(not entry.future.done() for entry in self._entries.values())
+
+    def counters(self) -> dict[str, int]:
+        """Returns a snapshot of the table counters.
+
+        Returns
+        -------
+        dict[str, int]
+            entries, outstanding, registered, resolved, timed_out and expired counts
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "outstanding": sum(
+                    not entry.future.done() for entry in self._entries.values()
+                ),
+                "registered": self.registered_count,
+                "resolved": self.resolved_count,
+                "timed_out": self.timed_out_count,
+                "expired": self.expired_count,
+            }
+
+    def round_trip_snapshot(self) -> dict[str, dict[str, Any]]:
+        """Returns the round trip time statistics per command type.
+
+        Returns
+        -------
+        dict[str, dict[str, Any]]
+            ``LatencyHistogram.snapshot`` per command type
+        """
+        with self._lock:
+            round_trip_times = dict(self.round_trip_times)
+        return {
+            kind: histogram.snapshot() for kind, histogram in round_trip_times.items()
+        }
+
+    def register(
+        self, answer_id: str, kind: str | None = None
+    ) -> concurrent.futures.Future:
+        """Registers an expected answer.
+
+        If the answer is already registered and not yet received, the existing future
+        is shared, so several waiters for e.g. the next `status` are all notified.
+
+        Parameters
+        ----------
+        answer_id : str
+            message id or fixed answer name
+        kind : str | None
+            command type of the answer, see ``command_kind``, to record its round
+            trip time
+
+        Returns
+        -------
+        concurrent.futures.Future
+            future resolved with `None` or an error message when the answer arrives
+        """
+        with self._lock:
+            expired = self._expire(monotonic())
+
+            entry = self._entries.get(answer_id)
+            if entry is None or entry.future.done():
+                entry = _AnswerEntry(kind=kind)
+                self._entries[answer_id] = entry
+                self._entries.move_to_end(answer_id)
+                self.registered_count += 1
+
+        self._fail_expired(expired)
+        return entry.future
+
+    def is_outstanding(self, answer_id: str) -> bool:
+        """Returns whether an answer is registered and was not yet received.
+
+        Parameters
+        ----------
+        answer_id : str
+            message id or fixed answer name
+        """
+        with self._lock:
+            entry = self._entries.get(answer_id)
+            return entry is not None and not entry.future.done()
+
+    def discard(self, answer_id: str) -> None:
+        """Removes an answer from the table without resolving it.
+
+        Parameters
+        ----------
+        answer_id : str
+            message id or fixed answer name
+        """
+        with self._lock:
+            self._entries.pop(answer_id, None)
+
+    def resolve(self, answer_id: str, error: str | None = None) -> bool:
+        """Resolves a registered answer.
+
+        Parameters
+        ----------
+        answer_id : str
+            message id or fixed answer name
+        error : str | None
+            error message if the answer indicates an error
+
+        Returns
+        -------
+        bool
+            `True` if the answer was registered and not yet resolved
+        """
+        with self._lock:
+            entry = self._entries.get(answer_id)
+            if entry is None or entry.future.done():
+                return False
+            self.resolved_count += 1
+            if entry.kind is not None:
+                if (histogram := self.round_trip_times.get(entry.kind)) is None:
+                    histogram = self.round_trip_times[entry.kind] = LatencyHistogram()
+                histogram.record(int((monotonic() - entry.registered) * 1e9))
+
+        # callbacks of the future (e.g. waking an event loop) run outside of the lock
+        try:
+            entry.future.set_result(error)
+        except concurrent.futures.InvalidStateError:
+            return False
+        return True
+
+    def fail_all(self, exc: Exception) -> None:
+        """Fails all pending answers, e.g. when the connection was lost.
+
+        Parameters
+        ----------
+        exc : Exception
+            exception raised to all waiters
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+
+        for entry in entries:
+            if not entry.future.done():
+                try:
+                    entry.future.set_exception(exc)
+                except concurrent.futures.InvalidStateError:
+                    pass
+
+    def wait(self, answer_id: str, timeout: float | None) -> str | None:
+        """Blocks the calling thread until the answer is received.
+
+        The answer is removed from the table after the call, even if there was a timeout.
+
+        Parameters
+        ----------
+        answer_id : str
+            message id or fixed answer name
+        timeout : float | None
+            maximum wait time in seconds, infinite if `None`, might be shortened by
+            the `timeout_policy`
+
+        Returns
+        -------
+        None | str
+            `None` if the answer was not registered or received without error,
+            otherwise the error message
+
+        Raises
+        ------
+        CRICommandTimeOutError
+            raised if no answer was received in given timeout
+        """
+        if (entry := self._begin_wait(answer_id)) is None:
+            return None
+        timeout = self._timeout(entry, timeout)
+
+        try:
+            return entry.future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            with self._lock:
+                self.timed_out_count += 1
+            raise CRICommandTimeOutError()
+        finally:
+            self._end_wait(answer_id, entry)
+
+    def watch(self, answer_id: str) -> concurrent.futures.Future | None:
+        """Returns the future of a registered answer without blocking.
+
+        The caller counts as waiter, so the answer does not expire by age, and the
+        answer is removed from the table once the future is done.
+
+        Parameters
+        ----------
+        answer_id : str
+            message id or fixed answer name
+
+        Returns
+        -------
+        concurrent.futures.Future | None
+            future resolved with `None` or an error message, `None` if the answer was
+            not registered
+        """
+        if (entry := self._begin_wait(answer_id)) is None:
+            return None
+        entry.future.add_done_callback(lambda _: self._end_wait(answer_id, entry))
+        return entry.future
+
+    async def wait_async(self, answer_id: str, timeout: float | None) -> str | None:
+        """Waits for the answer in the running event loop without polling.
+
+        The answer is removed from the table after the call, even if there was a timeout.
+
+        Parameters
+        ----------
+        answer_id : str
+            message id or fixed answer name
+        timeout : float | None
+            maximum wait time in seconds, infinite if `None`, might be shortened by
+            the `timeout_policy`
+
+        Returns
+        -------
+        None | str
+            `None` if the answer was not registered or received without error,
+            otherwise the error message
+
+        Raises
+        ------
+        CRICommandTimeOutError
+            raised if no answer was received in given timeout
+        """
+        if (entry := self._begin_wait(answer_id)) is None:
+            return None
+        timeout = self._timeout(entry, timeout)
+
+        try:
+            # shield the future as it might be shared with other waiters
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(entry.future)), timeout
+            )
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timed_out_count += 1
+            raise CRICommandTimeOutError()
+        finally:
+            self._end_wait(answer_id, entry)
+
+    def expire(self) -> None:
+        """Removes orphaned entries. Called automatically on every registration."""
+        with self._lock:
+            expired = self._expire(monotonic())
+        self._fail_expired(expired)
+
+    def _timeout(self, entry: _AnswerEntry, timeout: float | None) -> float | None:
+        if (policy := self.timeout_policy) is None or entry.kind is None:
+            return timeout
+        return policy.timeout(self.round_trip_times.get(entry.kind), timeout)
+
+    def _begin_wait(self, answer_id: str) -> _AnswerEntry | None:
+        with self._lock:
+            entry = self._entries.get(answer_id)
+            if entry is not None:
+                entry.waiters += 1
+            return entry
+
+    def _end_wait(self, answer_id: str, entry: _AnswerEntry) -> None:
+        with self._lock:
+            entry.waiters -= 1
+            if self._entries.get(answer_id) is entry:
+                del self._entries[answer_id]
+
+    def _expire(self, now: float) -> list[tuple[str, _AnswerEntry]]:
+        """Removes orphaned entries, must be called with the lock held.
+
+        The removed entries are returned to be failed with ``_fail_expired`` after
+        releasing the lock, as callbacks of their futures might use the table.
+        """
+        expired = []
+        for answer_id, entry in self._entries.items():
+            if now - entry.registered < self.max_age:
+                break
+            if entry.waiters == 0:
+                expired.append(answer_id)
+
+        overflow = len(self._entries) - len(expired) - self.max_entries + 1
+        if overflow > 0:
+            skip = set(expired)
+            # expire entries without waiter first
+            candidates = sorted(
+                (answer_id for answer_id in self._entries if answer_id not in skip),
+                key=lambda answer_id: self._entries[answer_id].waiters > 0,
+            )
+            expired.extend(candidates[:overflow])
+
+        self.expired_count += len(expired)
+        if expired:
+            logger.debug("Expired %d orphaned answers.", len(expired))
+        return [(answer_id, self._entries.pop(answer_id)) for answer_id in expired]
+
+    @staticmethod
+    def _fail_expired(expired: list[tuple[str, _AnswerEntry]]) -> None:
+        for answer_id, entry in expired:
+            if not entry.future.done():
+                try:
+                    entry.future.set_exception(
+                        CRICommandTimeOutError(f"Answer {answer_id} expired.")
+                    )
+                except concurrent.futures.InvalidStateError:
+                    pass
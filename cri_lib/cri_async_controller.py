@@ -0,0 +1,1051 @@
+import asyncio
+import logging
+from pathlib import Path
+from time import monotonic
+from typing import Any, Literal
+
+from .cri_client_base import CRIClientBase
+from .cri_controller import DEFAULT, MotionType
+from .cri_errors import CRICommandTimeOutError, CRIConnectionError, CRIError
+from .cri_framing import CRIFrameScanner
+from .cri_path import move_command
+from .cri_upload import (
+    ProgressCallback,
+    UploadResult,
+    read_upload_lines,
+    run_upload_async,
+    upload_steps,
+)
+from .robot_state import KinematicsState
+
+logger = logging.getLogger(__name__)
+
+
+class _CRIProtocol(asyncio.BufferedProtocol):
+    """Receives data of an ``AsyncCRIClient`` directly into a ``CRIFrameScanner``."""
+
+    def __init__(self, client: "AsyncCRIClient") -> None:
+        self.client = client
+        self.scanner = CRIFrameScanner()
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        return self.scanner.get_buffer(sizehint)
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self.scanner.buffer_updated(nbytes)
+        if (stats := self.client.stats) is not None:
+            stats.record_received(nbytes, self.scanner.pending_bytes)
+        recorder = self.client.recorder
+        for frame in self.scanner.frames():
+            if recorder is not None:
+                recorder.record(frame)
+            try:
+                self.client._parse_message(frame)
+            except Exception:
+                # a malformed message must not tear down the connection
+                logger.exception("Failed to parse message.")
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.client._connection_lost(exc)
+
+
+class AsyncCRIClient(CRIClientBase):
+    """Client with implementations for read-only communication running in an asyncio event loop.
+
+    In contrast to ``CRIClient`` no threads are started. Receiving, parsing and the
+    ALIVEJOG heartbeat are handled by the event loop the client was connected in, so
+    many connections can be served by a single thread.
+    All methods must be called from within this event loop.
+    """
+
+    def __init__(self) -> None:
+        """Create an ``AsyncCRIClient`` without connecting it yet.
+
+        Call ``connect`` to connect and start receiving data.
+        """
+        super().__init__()
+
+        self._list_files_lock = asyncio.Lock()
+        """only one `CMD ListFiles` at a time, as all share the `info_filelist` answer"""
+
+        self.transport: asyncio.Transport | None = None
+
+        self.can_queue: asyncio.Queue = asyncio.Queue()
+
+        self.jog_task: asyncio.Task | None = None
+
+    async def connect(
+        self,
+        host: str,
+        port: int = 3920,
+        application_name: str = "CRI-Python-Lib",
+        application_version: str = "0-0-0-0",
+    ) -> Literal[True]:
+        """
+        Connect to iRC.
+
+        Parameters
+        ----------
+        host : str
+            IP address or hostname of iRC
+        port : int
+            port of iRC
+        application_name : str
+            optional name of your application sent to controller
+        application_version: str
+            optional version of your application sent to controller
+
+        Returns
+        -------
+        bool
+            True if connected.
+            Otherwise an exception is raised.
+
+        Raises
+        ------
+        CRIConnectionError
+            When already connected or connection fails.
+        """
+        if self.connected:
+            raise CRIConnectionError("Already connected.")
+
+        loop = asyncio.get_running_loop()
+        try:
+            transport, _ = await loop.create_connection(
+                lambda: _CRIProtocol(self), host, port
+            )
+        except ConnectionRefusedError:
+            raise CRIConnectionError(
+                f"Connection refused: Unable to connect to {host}:{port}"
+            )
+        except Exception as e:
+            raise CRIConnectionError("Failed to connect to iRC.") from e
+
+        self.transport = transport  # type: ignore
+        self.connected = True
+
+        # Start sending ALIVEJOG message
+        self.jog_task = loop.create_task(self._bg_alivejog())
+
+        self._send_command(self._hello_command(application_name, application_version))
+
+        # Request the axis count, this is needed for interpreting some messages
+        self._send_command("CONFIG GetAxes")
+
+        logger.debug("Connected to %s:%d", host, port)
+        return True
+
+    async def close(self) -> None:
+        """
+        Close network connection.
+        """
+        if not self.connected or self.transport is None:
+            return
+
+        self._send_command("QUIT")
+
+        self.connected = False
+
+        if self.jog_task is not None:
+            self.jog_task.cancel()
+            try:
+                await self.jog_task
+            except asyncio.CancelledError:
+                pass
+            self.jog_task = None
+
+        self.transport.close()
+        self.stop_recording()
+
+    def _connection_lost(self, exc: Exception | None) -> None:
+        """Called by the protocol if the connection was closed. Fails all pending answers."""
+        if self.connected:
+            logger.error("Connection lost: %s", exc)
+        self.connected = False
+
+        self._disconnected(CRIConnectionError("ConnectionLost"))
+
+    def _write(self, data: bytes) -> None:
+        """Hands the data to the transport without blocking."""
+        if self.transport is None:
+            raise CRIConnectionError("Not connected.")
+        self.transport.write(data)
+        self._record_sent(data)
+
+    async def _bg_alivejog(self) -> None:
+        """
+        Background task sending alivejog messages to keep connection alive.
+        """
+        while self.connected:
+            try:
+                self._send_command(self._alivejog_command())
+            except CRIConnectionError:
+                logger.error("AliveJog Task: Connection lost.")
+                return
+            if (stats := self.stats) is not None:
+                stats.record_alivejog(self.jog_intervall)
+
+            await asyncio.sleep(self.jog_intervall)
+
+    async def _wait_for_answer(
+        self,
+        message_id: str | int,
+        timeout: float | None = DEFAULT,  # type: ignore
+    ) -> None | str:
+        """Waits for an answer to a message.
+        The answer will be removed after the call, even if there was a timeout. Choose timeout accordingly.
+
+        Parameters
+        ----------
+        message_id : int or str
+            message id of sent message of which an answer is expected
+
+        timeout : float | DEFAULT | None
+            timeout for wait in seconds.
+            - `DEFAULT` uses `self.DEFAULT_ANSWER_TIMEOUT`
+            - `None` will wait indefinetly
+
+        Returns
+        -------
+        None | str
+            returns `None` if an answer was received with no error
+            returns an error message if an `CMDERROR` was received
+
+        Raises
+        ------
+        CRICommandTimeOutError
+            raised if no answer was received in given timeout
+        CRIConnectionError
+            raised if the connection was lost while waiting
+        """
+        if timeout is DEFAULT:
+            timeout = self.DEFAULT_ANSWER_TIMEOUT
+        return await self.answers.wait_async(str(message_id), timeout)
+
+    async def _command(
+        self,
+        command: str,
+        name: str,
+        fixed_answer_name: str | None = None,
+        timeout: float | None = DEFAULT,  # type: ignore
+    ) -> bool:
+        """Sends a command and waits for its acknowledgement.
+
+        Parameters
+        ----------
+        command : str
+            Command to be sent without `CRISTART`, counter and `CRIEND`
+        name : str
+            name of the command for logging
+        fixed_answer_name : str | None
+            name of the answer if it is not acknowledged by message id
+        timeout : float | DEFAULT | None
+            timeout for wait in seconds
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        msg_id = self._send_command(command, True, fixed_answer_name)
+        answer_id = fixed_answer_name if fixed_answer_name is not None else msg_id
+        if (
+            error_msg := await self._wait_for_answer(answer_id, timeout=timeout)
+        ) is not None:
+            logger.debug("Error in %s command: %s", name, error_msg)
+            return False
+        else:
+            return True
+
+    async def wait_for_status_update(self, timeout: float | None = None) -> None:
+        """Wait for next STATUS message.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Maximum wait time, infinite if `None`
+
+        Raises
+        ------
+        CRICommandTimeOutError
+            raised if no status update was received in given timeout
+        """
+        self._register_answer("status")
+        await self._wait_for_answer("status", timeout)
+
+    async def wait_for_kinematics_ready(self, timeout: float = 30) -> bool:
+        """Wait until drive state is indicated as ready.
+
+        Parameters
+        ----------
+        timeout : float
+            maximum time to wait in seconds
+
+        Returns
+        -------
+        bool
+            `True`if drives are ready, `False` if not ready or timeout
+        """
+        deadline = monotonic() + timeout
+        while (remaining := deadline - monotonic()) > 0.0:
+            try:
+                await self.wait_for_status_update(timeout=remaining)
+            except CRICommandTimeOutError:
+                return False
+            robot_state = self.robot_state
+            if (robot_state.kinematics_state == KinematicsState.NO_ERROR) and (
+                robot_state.combined_axes_error == "NoError"
+            ):
+                return True
+
+        return False
+
+    async def get_board_temperatures(
+        self,
+        timeout: float | None = DEFAULT,  # type: ignore
+    ) -> bool:
+        """Receive motor controller PCB temperatures and save in robot state
+
+        Parameters
+        ----------
+        timeout: float | None
+            timeout for waiting in seconds or None for infinite waiting
+        """
+        return await self._command(
+            "SYSTEM GetBoardTemp", "GetBoardTemp", "info_boardtemp", timeout
+        )
+
+    async def get_motor_temperatures(
+        self,
+        timeout: float | None = DEFAULT,  # type: ignore
+    ) -> bool:
+        """Receive motor temperatures and save in robot state
+
+        Parameters
+        ----------
+        timeout: float | None
+            timeout for waiting in seconds or None for infinite waiting
+        """
+        return await self._command(
+            "SYSTEM GetMotorTemp", "GetMotorTemp", "info_motortemp", timeout
+        )
+
+    async def list_files(
+        self, target_directory: str = "Programs", max_age: float | None = None
+    ) -> list[str] | None:
+        """Request a list of all files in the directory, which is relative to the /Data/ directory.
+
+        Listings are cached per directory for `file_lists.ttl` seconds and invalidated
+        by ``upload_file`` into the directory. Concurrent calls for the same directory
+        share one request.
+
+        Parameters
+        ----------
+        target_directory : str
+            directory on iRC `/Data/<target_directory>` in which files are located, e.g. `Programs` for normal robot programs
+        max_age : float | None
+            maximum age in seconds of a cached listing, `0` always requests a new one,
+            `file_lists.ttl` if `None`
+
+        Returns
+        -------
+        list[str] | None
+            the files in the directory or `None` if the request failed, also if it
+            timed out or the connection was lost
+        """
+        if (files := self.file_lists.get(target_directory, max_age)) is not None:
+            return files
+
+        future, owner = self.file_lists.begin(target_directory)
+        if not owner:
+            # the owner resolves the future before its deadline has passed
+            files = await asyncio.wrap_future(future)
+            return None if files is None else list(files)
+
+        # a single deadline for waiting on other directories and on the answer,
+        # each holder of the lock releases it once its own deadline has passed
+        deadline = monotonic() + self.DEFAULT_ANSWER_TIMEOUT
+        success = False
+        try:
+            async with self._list_files_lock:
+                self.file_lists.expect(target_directory)
+                success = await self._command(
+                    f"CMD ListFiles {target_directory}",
+                    "ListFiles",
+                    "info_filelist",
+                    timeout=max(0.0, deadline - monotonic()),
+                )
+        except CRIError as e:
+            # not connected, connection lost or no answer in time
+            logger.debug("Error in ListFiles command: %s", e)
+        finally:
+            files = self.file_lists.finish(target_directory, future, success)
+        return files
+
+
+class AsyncCRIController(AsyncCRIClient):
+    """A connected ``AsyncCRIClient`` with control capabilities."""
+
+    ACTIVE_JOG_INTERVAL_SEC = 0.02
+    UPLOAD_WINDOW = 64
+
+    def __init__(self) -> None:
+        self.live_jog_active: bool = False
+        self.jog_speeds: dict[str, float] = {
+            "A1": 0.0,
+            "A2": 0.0,
+            "A3": 0.0,
+            "A4": 0.0,
+            "A5": 0.0,
+            "A6": 0.0,
+            "E1": 0.0,
+            "E2": 0.0,
+            "E3": 0.0,
+        }
+        super().__init__()
+
+    def _alivejog_command(self) -> str:
+        """Overrides ``AsyncCRIClient._alivejog_command`` to send possibly nonzero jog speeds."""
+        if self.live_jog_active:
+            return "ALIVEJOG " + " ".join(
+                str(speed) for speed in self.jog_speeds.values()
+            )
+        else:
+            return "ALIVEJOG 0 0 0 0 0 0 0 0 0"
+
+    def send_command(self, command, register_answer=False, fixed_answer_name=None):
+        """Wraps the superclass method to make it public."""
+        return super()._send_command(command, register_answer, fixed_answer_name)
+
+    async def reset(self) -> bool:
+        """Reset robot clears errors and fetches current axis positions from the modules.
+
+        Returns
+        -------
+        bool:
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        return await self._command("CMD Reset", "RESET")
+
+    async def enable(self) -> bool:
+        """Enable robot activates the motors.
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        return await self._command("CMD Enable", "ENABLE")
+
+    async def disable(self) -> bool:
+        """Disable robot stops currently running programs, movements and deactivates the motors.
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        return await self._command("CMD Disable", "DISABLE")
+
+    async def set_active_control(self, active: bool) -> bool:
+        """Acquire or return active control of robot
+
+        Parameters
+        ----------
+        active : bool
+            `True` acquire active control
+            `False` return active control
+        """
+        return await self._command(
+            f"CMD SetActive {str(active).lower()}",
+            "set active control",
+            f"Active_{str(active).lower()}",
+        )
+
+    async def zero_all_joints(self) -> bool:
+        """Set all joints to zero
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        return await self._command("CMD SetJointsToZero", "SetJointsToZero")
+
+    async def reference_all_joints(self, *, timeout: float = 30) -> bool:
+        """Reference all joints. Long timout of 30 seconds.
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        return await self._command(
+            "CMD ReferenceAllJoints", "ReferenceAllJoints", timeout=timeout
+        )
+
+    async def reference_single_joint(self, joint: str, *, timeout: float = 30) -> bool:
+        """Reference a single joint. Long timout of 30 seconds.
+
+        Parameters
+        ----------
+        joint : str
+            joint name with either 'A', 'E', 'T' or 'P' as first character and an corresponding index as second
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        if (
+            joint[0] == "A" or joint[0] == "E" or joint[0] == "T" or joint[0] == "P"
+        ) and (int(joint[1]) > 0):
+            joint_msg = joint[0] + str(int(joint[1]) - 1)
+        else:
+            return False
+
+        return await self._command(
+            f"CMD ReferenceSingleJoint {joint_msg}",
+            "ReferenceSingleJoint",
+            timeout=timeout,
+        )
+
+    async def get_referencing_info(self) -> bool:
+        """Request the referencing state of all axes and save it in the robot state.
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        return await self._command(
+            "CMD GetReferencingInfo", "GetReferencingInfo", "info_referencing"
+        )
+
+    async def _move(
+        self,
+        command: str,
+        name: str,
+        wait_move_finished: bool,
+        move_finished_timeout: float | None,
+    ) -> bool:
+        """Sends a move command and optionally waits for the move to finish.
+
+        Parameters
+        ----------
+        command : str
+            move command, see ``move_command``
+        name : str
+            name of the move for logging
+        wait_move_finished : bool
+            wait until movement is finished
+        move_finished_timeout : float | None
+            timout in seconds for waiting for the move to finish, `None` will wait indefinetly
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        if wait_move_finished:
+            self._register_answer("EXECEND")
+
+        if not await self._command(command, name, timeout=self.MOVE_ANSWER_TIMEOUT):
+            return False
+
+        if wait_move_finished:
+            if (
+                error_msg := await self._wait_for_answer(
+                    "EXECEND", timeout=move_finished_timeout
+                )
+            ) is not None:
+                logger.debug("Exec Error in %s command: %s", name, error_msg)
+                return False
+
+        return True
+
+    async def move_joints(
+        self,
+        A1: float,
+        A2: float,
+        A3: float,
+        A4: float,
+        A5: float,
+        A6: float,
+        E1: float,
+        E2: float,
+        E3: float,
+        velocity: float,
+        wait_move_finished: bool = False,
+        move_finished_timeout: float | None = 300.0,
+        acceleration: float | None = None,
+    ) -> bool:
+        """Absolute joint move, see ``CRIController.move_joints``"""
+        return await self._move(
+            move_command(
+                "Joint",
+                (A1, A2, A3, A4, A5, A6, E1, E2, E3),
+                velocity,
+                acceleration=acceleration,
+            ),
+            "Move Joints",
+            wait_move_finished,
+            move_finished_timeout,
+        )
+
+    async def move_joints_relative(
+        self,
+        A1: float,
+        A2: float,
+        A3: float,
+        A4: float,
+        A5: float,
+        A6: float,
+        E1: float,
+        E2: float,
+        E3: float,
+        velocity: float,
+        wait_move_finished: bool = False,
+        move_finished_timeout: float | None = 300.0,
+        acceleration: float | None = None,
+    ) -> bool:
+        """Relative joint move, see ``CRIController.move_joints_relative``"""
+        return await self._move(
+            move_command(
+                "RelativeJoint",
+                (A1, A2, A3, A4, A5, A6, E1, E2, E3),
+                velocity,
+                acceleration=acceleration,
+            ),
+            "Move Joints Relative",
+            wait_move_finished,
+            move_finished_timeout,
+        )
+
+    async def move_cartesian(
+        self,
+        X: float,
+        Y: float,
+        Z: float,
+        A: float,
+        B: float,
+        C: float,
+        E1: float,
+        E2: float,
+        E3: float,
+        velocity: float,
+        frame: str = "#base",
+        wait_move_finished: bool = False,
+        move_finished_timeout: float | None = 300.0,
+        acceleration: float | None = None,
+    ) -> bool:
+        """Cartesian move, see ``CRIController.move_cartesian``"""
+        return await self._move(
+            move_command(
+                "Cart",
+                (X, Y, Z, A, B, C, E1, E2, E3),
+                velocity,
+                frame,
+                acceleration,
+            ),
+            "Move Cartesian",
+            wait_move_finished,
+            move_finished_timeout,
+        )
+
+    async def move_base_relative(
+        self,
+        X: float,
+        Y: float,
+        Z: float,
+        A: float,
+        B: float,
+        C: float,
+        E1: float,
+        E2: float,
+        E3: float,
+        velocity: float,
+        frame: str = "#base",
+        wait_move_finished: bool = False,
+        move_finished_timeout: float | None = 300.0,
+        acceleration: float | None = None,
+    ) -> bool:
+        """Relative cartesian move in base coordinate system, see ``CRIController.move_base_relative``"""
+        return await self._move(
+            move_command(
+                "RelativeBase",
+                (X, Y, Z, A, B, C, E1, E2, E3),
+                velocity,
+                frame,
+                acceleration,
+            ),
+            "Move BaseRelative",
+            wait_move_finished,
+            move_finished_timeout,
+        )
+
+    async def move_tool_relative(
+        self,
+        X: float,
+        Y: float,
+        Z: float,
+        A: float,
+        B: float,
+        C: float,
+        E1: float,
+        E2: float,
+        E3: float,
+        velocity: float,
+        frame: str = "#base",
+        wait_move_finished: bool = False,
+        move_finished_timeout: float | None = 300.0,
+        acceleration: float | None = None,
+    ) -> bool:
+        """Relative cartesian move in tool coordinate system, see ``CRIController.move_tool_relative``"""
+        return await self._move(
+            move_command(
+                "RelativeTool",
+                (X, Y, Z, A, B, C, E1, E2, E3),
+                velocity,
+                frame,
+                acceleration,
+            ),
+            "Move ToolRelative",
+            wait_move_finished,
+            move_finished_timeout,
+        )
+
+    async def stop_move(self) -> bool:
+        """Stop movement
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        return await self._command("CMD Move Stop", "Move Stop", timeout=5.0)
+
+    def start_jog(self) -> None:
+        """starts live jog. Set speeds via set_jog_values"""
+        self.jog_intervall = self.ACTIVE_JOG_INTERVAL_SEC
+        self.live_jog_active = True
+
+    def stop_jog(self) -> None:
+        """stops live jog."""
+        self.live_jog_active = False
+        self.jog_intervall = self.ALIVE_JOG_INTERVAL_SEC
+        self.jog_speeds = dict.fromkeys(self.jog_speeds, 0.0)
+
+    def set_jog_values(
+        self,
+        A1: float,
+        A2: float,
+        A3: float,
+        A4: float,
+        A5: float,
+        A6: float,
+        E1: float,
+        E2: float,
+        E3: float,
+    ) -> None:
+        """
+        Sets live jog axes speeds.
+
+        Parameters
+        ----------
+            A1-A6, E1-3 : float
+                axes speeds in percent of maximum speed
+        """
+        self.jog_speeds = {
+            "A1": A1,
+            "A2": A2,
+            "A3": A3,
+            "A4": A4,
+            "A5": A5,
+            "A6": A6,
+            "E1": E1,
+            "E2": E2,
+            "E3": E3,
+        }
+
+    async def set_motion_type(self, motion_type: MotionType) -> bool:
+        """Set motion type
+
+        Parameters
+        ----------
+        motion_type : MotionType
+            motion type
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        return await self._command(f"CMD MotionType{motion_type.value}", "MotionType")
+
+    async def set_override(self, override: float) -> bool:
+        """Set override
+
+        Parameters
+        ----------
+        override : float
+            override percent
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        return await self._command(f"CMD Override {override}", "Override")
+
+    async def set_dout(self, id: int, value: bool) -> bool:
+        """Set digital out
+
+        Parameters
+        ----------
+        id : int
+            index of DOUT (0 to 63)
+
+        value : bool
+            value to set DOUT to
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        if (id < 0) or (id > 63):
+            raise ValueError
+
+        return await self._command(f"CMD DOUT {id} {str(value).lower()}", "DOUT")
+
+    async def set_din(self, id: int, value: bool) -> bool:
+        """Set digital inout, only available in simulation
+
+        Parameters
+        ----------
+        id : int
+            index of DIN (0 to 63)
+
+        value : bool
+            value to set DIN to
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        if (id < 0) or (id > 63):
+            raise ValueError
+
+        return await self._command(f"CMD DIN {id} {str(value).lower()}", "DIN")
+
+    async def set_global_signal(self, id: int, value: bool) -> bool:
+        """Set global signal
+
+        Parameters
+        ----------
+        id : int
+            index of signal (0 to 99)
+
+        value : bool
+            value to set signal to
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        if (id < 0) or (id > 99):
+            raise ValueError
+
+        return await self._command(f"CMD GSIG {id} {str(value).lower()}", "GSIG")
+
+    async def load_programm(self, program_name: str) -> bool:
+        """Load a program file from disk into the robot controller
+
+        Parameters
+        ----------
+        program_name : str
+            the name in the directory /Data/Programs/, e.g. “test.xml”
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        return await self._command(f"CMD LoadProgram {program_name}", "load_program")
+
+    async def load_logic_programm(self, program_name: str) -> bool:
+        """Load a logic program file from disk into the robot controller
+
+        Parameters
+        ----------
+        program_name : str
+            the name in the directory /Data/Programs/, e.g. “test.xml”
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        return await self._command(
+            f"CMD LoadLogicProgram {program_name}", "load_logic_program"
+        )
+
+    async def start_programm(self) -> bool:
+        """Start currently loaded Program
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        return await self._command("CMD StartProgram", "start_program")
+
+    async def stop_programm(self) -> bool:
+        """Stop currently running Program
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        return await self._command("CMD StopProgram", "stop_program")
+
+    async def pause_programm(self) -> bool:
+        """Pause currently running Program
+
+        Returns
+        -------
+        bool
+            `True` if request was successful
+            `False` if request was not successful
+        """
+        return await self._command("CMD PauseProgram", "pause_program")
+
+    async def upload_file(
+        self,
+        path: str | Path,
+        target_directory: str,
+        window: int = UPLOAD_WINDOW,
+        progress: ProgressCallback | None = None,
+    ) -> UploadResult:
+        """Uploads file to iRC into `/Data/<target_directory>`
+
+        The lines are streamed with up to `window` lines waiting for their
+        acknowledgement. Every acknowledgement is verified, the upload stops at the
+        first rejected line. CRI has no command to abort an upload, so a failed
+        upload is not finished and may leave an incomplete file on the robot
+        controller, which is replaced when the file is uploaded again.
+
+        Parameters
+        ----------
+        path : str | Path
+            Path to file which should be uploaded
+
+        target_directory : str
+            directory on iRC `/Data/<target_directory>` into which file will be uploaded, e.g. `Programs` for normal robot programs
+
+        window : int
+            maximum number of lines waiting for their acknowledgement
+
+        progress : Callable[[int, int], None] | None
+            called with the number of acknowledged lines and the number of lines
+
+        Returns
+        -------
+        UploadResult
+            evaluates to `True` if the file was uploaded successfully, otherwise
+            contains the error message and the number of the failing line
+        """
+        file_path = Path(path)
+        result = UploadResult(f"{target_directory}/{file_path.name}")
+        if (lines := read_upload_lines(file_path)) is None:
+            return result.fail(0, f"Error reading {file_path}")
+        steps = upload_steps(result, lines, self._send_watched, window, progress)
+        try:
+            await run_upload_async(steps, self.DEFAULT_ANSWER_TIMEOUT)
+        finally:
+            # listings requested before or during the upload are outdated
+            self.file_lists.invalidate(target_directory)
+        return result
+
+    def enable_can_bridge(self, enabled: bool) -> None:
+        """Enables or diables CAN bridge mode. All other functions are disabled in CAN bridge mode.
+
+        Parameters
+        ----------
+        enabled : bool
+            `True` bridge mode enabled
+            `False` bridge mode disabled
+        """
+        if enabled is True:
+            self.can_mode = True
+            self._send_command("CANBridge SwitchOn")
+        else:
+            self._send_command("CANBridge SwitchOff")
+            self.can_mode = False
+
+    def can_send(self, msg_id: int, length: int, data: bytearray) -> None:
+        """Send CAN message in CAN bridge mode.
+
+        Parameters
+        ----------
+        msg_id : int
+            message id of can message
+        length : int
+            length of data to send. Actual length used of the 8 data bytes
+        data : bytearray
+            data for CAN message always 8 bytes
+        """
+        if not self.can_mode:
+            logger.debug("can_send: CAN mode not enabled")
+            return
+
+        command = f"CANBridge Msg ID {msg_id} Len {length} Data " + " ".join(
+            [str(int(i)) for i in data]
+        )
+
+        self._send_command(command)
+
+    async def can_receive(self, timeout: float | None = None) -> dict[str, Any] | None:
+        """Receive CAN message in CAN bridge mode from the receive queue.
+
+        Parameters
+        ----------
+        timeout : float | None
+            maximum wait time in seconds, infinite if `None`
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Returns the CAN message (see ``CRIProtocolParser._parse_can_bridge``) or None if nothing was received within the timeout.
+        """
+        if not self.can_mode:
+            logger.debug("can_receive: CAN mode not enabled")
+            return None
+
+        try:
+            return await asyncio.wait_for(self.can_queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
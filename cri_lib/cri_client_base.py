@@ -0,0 +1,465 @@
+import asyncio
+import logging
+import os
+import threading
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from time import perf_counter_ns
+from typing import Any, Callable
+
+from .cri_answers import AdaptiveTimeout, AnswerTable, command_kind
+from .cri_dispatcher import CallbackDispatcher
+from .cri_errors import CRIConnectionError
+from .cri_file_list import FileListCache
+from .cri_protocol_parser import CRIProtocolParser
+from .cri_recorder import Compression, CRIRecorder
+from .cri_stats import CRIStats
+from .robot_state import RobotState
+from .robot_state_history import RobotStateHistory
+from .robot_state_stream import RobotStateStream
+from .robot_state_subscriptions import RobotStateSubscriptions, StateSubscription
+
+logger = logging.getLogger(__name__)
+
+
+class CRIClientBase:
+    """Transport independent part of ``CRIClient`` and ``AsyncCRIClient``.
+
+    Builds the commands, parses the received messages and notifies callbacks,
+    subscriptions, streams, the history and the recorder. Subclasses implement
+    connecting, writing with ``_write``, receiving and waiting for answers.
+    Messages are processed by the receiving context of the subclass, the receive
+    thread of ``CRIClient`` or the event loop of ``AsyncCRIClient``.
+    """
+
+    ALIVE_JOG_INTERVAL_SEC = 0.2
+    DEFAULT_ANSWER_TIMEOUT = 10.0
+    MOVE_ANSWER_TIMEOUT = 30.0
+    """timeout for the acknowledgement of move commands, which the robot controller
+    only sends once the move is queued, shortened by an adaptive timeout policy"""
+
+    can_queue: Any
+    """received CAN bridge messages, a ``Queue`` or ``asyncio.Queue`` of the subclass"""
+
+    def __init__(self) -> None:
+        self.robot_state_lock = threading.Lock()
+
+        self.file_lists = FileListCache()
+        """cached file listings per directory, see ``list_files``"""
+
+        self.parser = CRIProtocolParser(RobotState(), self.robot_state_lock)
+
+        self.connected = False
+
+        self.can_mode: bool = False
+
+        self.jog_intervall = self.ALIVE_JOG_INTERVAL_SEC
+
+        self.sent_command_counter_lock = threading.Lock()
+        self.sent_command_counter = 0
+        self.answers = AnswerTable()
+
+        self.status_callback: Callable | None = None
+        self.can_callback: Callable | None = None
+        self._execend_listener: Callable[[str | None], None] | None = None
+        self._execend_listener_lock = threading.Lock()
+        """makes installing an `EXECEND` listener a compare-and-set"""
+        self.history: RobotStateHistory | None = None
+        self.recorder: CRIRecorder | None = None
+        self.stats: CRIStats | None = None
+        self.subscriptions = RobotStateSubscriptions()
+        self._status_streams: tuple[RobotStateStream, ...] = ()
+
+    @property
+    def robot_state(self) -> RobotState:
+        """Latest robot state snapshot.
+
+        Every parsed message publishes a new ``RobotState`` instead of modifying the
+        previous one, so a reference obtained here is a consistent snapshot which does
+        not change while it is read. Access it again to get newer data.
+        """
+        return self.parser.robot_state
+
+    @staticmethod
+    def _hello_command(application_name: str, application_version: str) -> str:
+        """Returns the hello message, this lets the robot control know who we are and what our time is (for logging / troubleshooting)"""
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        return f'INFO Hello "{application_name}" {application_version} {now}'
+
+    def _register_answer(self, answer_id: str) -> Future:
+        return self.answers.register(answer_id)
+
+    def _write(self, data: bytes) -> None:
+        """Writes an encoded message to the connection, implemented by subclasses.
+
+        Implementations call ``_record_sent`` once the data was written and raise
+        an exception if writing failed.
+        """
+        raise NotImplementedError
+
+    def _record_sent(self, data: bytes) -> None:
+        """Passes a written message to the recorder and the stats."""
+        if (recorder := self.recorder) is not None:
+            recorder.record(data, sent=True)
+        if (stats := self.stats) is not None:
+            stats.record_sent(len(data))
+
+    def _send_command(
+        self,
+        command: str,
+        register_answer: bool = False,
+        fixed_answer_name: str | None = None,
+    ) -> int:
+        """Sends the given command to iRC.
+
+        The method is marked private because technically it can be used to send control commands as well.
+
+        Parameters
+        ----------
+        command : str
+            Command to be sent without `CRISTART`, counter and `CRIEND`
+
+        Returns
+        -------
+        int
+            The sent message_id.
+
+        Raises
+        ------
+        CRIConnectionError
+            When not connected or connection was lost.
+        """
+        if not self.connected:
+            logger.error("Not connected. Use connect() to establish a connection.")
+            raise CRIConnectionError(
+                "Not connected. Use connect() to establish a connection."
+            )
+
+        with self.sent_command_counter_lock:
+            # skip ids whose answer is still outstanding after the counter wrapped
+            while True:
+                command_counter = self.sent_command_counter
+
+                if self.sent_command_counter >= 9999:
+                    self.sent_command_counter = 1
+                else:
+                    self.sent_command_counter += 1
+
+                if not self.answers.is_outstanding(str(command_counter)):
+                    break
+
+        message = f"CRISTART {command_counter} {command} CRIEND"
+
+        if fixed_answer_name is not None:
+            answer_id = fixed_answer_name
+        else:
+            answer_id = str(command_counter)
+
+        if register_answer:
+            self.answers.register(answer_id, command_kind(command))
+
+        try:
+            self._write(message.encode())
+        except Exception:
+            logger.exception("Failed to send command.")
+            if register_answer:
+                self.answers.discard(answer_id)
+            self.connected = False
+            raise CRIConnectionError("ConnectionLost")
+
+        logger.debug("Sent command: %s", message)
+        return command_counter
+
+    def _send_watched(self, command: str) -> Future | None:
+        """Sends a command and returns the future of its answer, see ``AnswerTable.watch``."""
+        return self.answers.watch(str(self._send_command(command, True)))
+
+    def _alivejog_command(self) -> str:
+        """Returns the next ALIVEJOG message to send."""
+        return "ALIVEJOG 0 0 0 0 0 0 0 0 0"
+
+    def _disconnected(self, error: CRIConnectionError) -> None:
+        """Fails all pending answers and ends all ``status_updates`` iterations."""
+        self.answers.fail_all(error)
+        for stream in self._status_streams:
+            stream.close()
+
+    def _parse_message(self, message: str | bytes | bytearray | memoryview) -> None:
+        """Internal function to parse a message. If an answer is registered for a certain msg_id it is resolved."""
+        if isinstance(message, memoryview):
+            message = str(message, "utf-8")
+        elif not isinstance(message, str):
+            message = message.decode()
+
+        if "STATUS" not in message:
+            logger.debug("Received: %s", message)
+
+        if (stats := self.stats) is None:
+            notification = self.parser.parse_message(message)
+        else:
+            start_ns = perf_counter_ns()
+            notification = self.parser.parse_message(message)
+            parts = message.split(maxsplit=3)
+            stats.record_parse(
+                parts[2] if len(parts) > 3 else "UNKNOWN",
+                perf_counter_ns() - start_ns,
+            )
+
+        if self.subscriptions:
+            self.subscriptions.dispatch(self.robot_state)
+
+        if notification is not None:
+            if notification["answer"] == "status" and self.history is not None:
+                self.history.append(self.robot_state)
+
+            if notification["answer"] == "status" and self.status_callback is not None:
+                if stats is None:
+                    self.status_callback(self.robot_state)
+                else:
+                    start_ns = perf_counter_ns()
+                    self.status_callback(self.robot_state)
+                    stats.status_callback_time.record(perf_counter_ns() - start_ns)
+
+            if notification["answer"] == "status":
+                for stream in self._status_streams:
+                    stream.publish(self.robot_state)
+
+            if notification["answer"] == "EXECEND" and (
+                listener := self._execend_listener
+            ):
+                listener(notification.get("error"))
+
+            if notification["answer"] == "CAN":
+                if self.can_callback is not None:
+                    self.can_callback(notification["can"])
+                else:
+                    self.can_queue.put_nowait(notification["can"])
+
+            if notification["answer"] == "info_filelist":
+                self.file_lists.receive(
+                    notification["directory"], notification["files"]
+                )
+
+            self.answers.resolve(
+                notification["answer"],  # type: ignore
+                notification.get("error", None),
+            )
+
+    def register_status_callback(
+        self,
+        callback: Callable | None,
+        dispatcher: CallbackDispatcher | None = None,
+    ) -> None:
+        """Register a callback which is called every time a STATUS message was parsed to the state.
+        The callback must have the following definition:
+        def callback(state: RobotState)
+        Keep the callback as fast as possible as it will be executed by the receive thread, or the event loop of an ``AsyncCRIClient``, and no messages will be processed, while is runs.
+        Also keep thread safety in mind, as the callback will not be executed by the thread which registered it.
+
+        Parameters
+        ----------
+        callback : Callable
+            callback function to be called, pass `None` to deregister a callback
+        dispatcher : CallbackDispatcher | None
+            dispatcher executing the callback off the receive thread or event loop,
+            see ``CallbackDispatcher``
+        """
+        if callback is not None and dispatcher is not None:
+            callback = dispatcher.wrap(callback)
+        self.status_callback = callback
+
+    def register_can_callback(
+        self,
+        callback: Callable | None,
+        dispatcher: CallbackDispatcher | None = None,
+    ) -> None:
+        """Register a callback which is called for every received CAN bridge message.
+        The callback must have the following definition:
+        def callback(message: dict[str, Any])
+        While a callback is registered, messages are not added to the receive queue
+        of ``can_receive``.
+
+        Parameters
+        ----------
+        callback : Callable
+            callback function to be called, pass `None` to deregister a callback
+        dispatcher : CallbackDispatcher | None
+            dispatcher executing the callback off the receive thread or event loop,
+            see ``CallbackDispatcher``
+        """
+        if callback is not None and dispatcher is not None:
+            callback = dispatcher.wrap(callback)
+        self.can_callback = callback
+
+    def subscribe(
+        self,
+        fields: str | Iterable[str],
+        callback: Callable[[dict[str, Any], RobotState], None],
+        min_interval: float = 0.0,
+        dispatcher: CallbackDispatcher | None = None,
+    ) -> StateSubscription:
+        """Register a callback which is called when the value of one of `fields` changes.
+
+        In contrast to ``register_status_callback`` any number of callbacks can be
+        registered and they are only called for changes of their fields, also by
+        other messages than STATUS, e.g. RUNSTATE for `main_runstate`. The callback
+        must have the following definition:
+        def callback(changes: dict[str, Any], state: RobotState)
+        It is executed by the receive thread or event loop, see
+        ``RobotStateSubscriptions.subscribe``.
+
+        Parameters
+        ----------
+        fields : str | Iterable[str]
+            ``RobotState`` attributes optionally followed by attributes and indices,
+            e.g. `kinematics_state`, `din[12]`, `joints_current.A1`
+        callback : Callable[[dict[str, Any], RobotState], None]
+            function called with the changed values and the robot state
+        min_interval : float
+            minimum time in seconds between two calls, changes in between are
+            coalesced
+        dispatcher : CallbackDispatcher | None
+            dispatcher executing the callback off the receive thread or event loop
+
+        Returns
+        -------
+        StateSubscription
+            the subscription, call its ``cancel`` method to unsubscribe
+        """
+        if dispatcher is not None:
+            callback = dispatcher.wrap(callback)
+        return self.subscriptions.subscribe(fields, callback, min_interval)
+
+    async def status_updates(
+        self, max_rate: float | None = None
+    ) -> AsyncIterator[RobotState]:
+        """Iterate over the robot state snapshots of STATUS messages as they arrive.
+
+        Usage: ``async for state in client.status_updates(max_rate=50):``. The
+        snapshots are passed to the running event loop without polling, also from
+        the receive thread of a ``CRIClient``. If the loop body is slower than the
+        STATUS messages, intermediate snapshots are skipped and the next iteration
+        gets the latest one. The iteration ends when the connection is closed or lost.
+
+        Parameters
+        ----------
+        max_rate : float | None
+            maximum number of snapshots per second, unlimited if `None`
+
+        Yields
+        ------
+        RobotState
+            latest robot state snapshot
+        """
+        stream = RobotStateStream(asyncio.get_running_loop())
+        self._status_streams = self._status_streams + (stream,)
+        try:
+            async for robot_state in stream.updates(max_rate):
+                yield robot_state
+        finally:
+            self._status_streams = tuple(
+                other for other in self._status_streams if other is not stream
+            )
+
+    def start_recording(
+        self, path: str | os.PathLike, compression: Compression = None
+    ) -> CRIRecorder:
+        """Record all received and sent frames to a file, see ``CRIRecorder``.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            path of the recording, must not exist yet
+        compression : "zlib" | "lzma" | None
+            compression of the recording
+
+        Returns
+        -------
+        CRIRecorder
+            the recorder, also available as `recorder`
+        """
+        self.stop_recording()
+        self.recorder = CRIRecorder(path, compression)
+        return self.recorder
+
+    def stop_recording(self) -> None:
+        """Stop a recording started with ``start_recording`` and close its files."""
+        if (recorder := self.recorder) is not None:
+            self.recorder = None
+            recorder.close()
+
+    def enable_history(
+        self, capacity: int = RobotStateHistory.DEFAULT_CAPACITY
+    ) -> RobotStateHistory:
+        """Enable recording of the robot state of every STATUS message in a ring buffer.
+
+        All memory of the history is allocated once, the oldest samples are overwritten
+        when `capacity` is exceeded. Set `history` to `None` to disable recording.
+
+        Parameters
+        ----------
+        capacity : int
+            maximum number of recorded STATUS messages
+
+        Returns
+        -------
+        RobotStateHistory
+            the history, also available as `history`
+        """
+        self.history = RobotStateHistory(capacity)
+        return self.history
+
+    def enable_stats(self) -> CRIStats:
+        """Enable counters of the receive and send paths, see ``CRIStats``.
+
+        The counters are cheap enough to stay enabled in production. Read them with
+        ``stats.snapshot()``, set `stats` to `None` to disable them.
+
+        Returns
+        -------
+        CRIStats
+            the counters, also available as `stats`
+        """
+        self.stats = CRIStats(self.answers)
+        return self.stats
+
+    def round_trip_times(self) -> dict[str, dict[str, Any]]:
+        """Round trip times of commands per command type, e.g. `CMD Move Joint`.
+
+        The time from sending a command until its answer arrived is recorded for every
+        command waiting for an answer, also without ``enable_stats``.
+
+        Returns
+        -------
+        dict[str, dict[str, Any]]
+            `count`, `mean_us`, `max_us`, `p50_us`, `p90_us`, `p99_us` and `buckets_us`
+            per command type
+        """
+        return self.answers.round_trip_snapshot()
+
+    def enable_adaptive_timeouts(
+        self, policy: AdaptiveTimeout | None = None
+    ) -> AdaptiveTimeout:
+        """Derive the timeouts of command answers from their observed round trip times.
+
+        Once enough answers of a command type were received, waiting for the next one
+        fails after a multiple of the observed round trip time instead of the fixed
+        timeout, e.g. 30 s for the acknowledgement of moves, so a dead connection is
+        detected quickly. Fixed timeouts still apply as upper bounds. Waiting for
+        `EXECEND` is not affected. Set `answers.timeout_policy` to `None` to disable.
+
+        Parameters
+        ----------
+        policy : AdaptiveTimeout | None
+            timeout policy, a default ``AdaptiveTimeout`` if `None`
+
+        Returns
+        -------
+        AdaptiveTimeout
+            the policy, also available as `answers.timeout_policy`
+        """
+        if policy is None:
+            policy = AdaptiveTimeout()
+        self.answers.timeout_policy = policy
+        return policy
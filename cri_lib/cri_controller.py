@@ -3,17 +3,27 @@ import contextlib
 import logging
 import socket
 import threading
-from collections.abc import AsyncIterator
-from datetime import datetime, timezone
+from collections.abc import AsyncIterator, Iterable
 from enum import Enum
 from pathlib import Path
 from queue import Empty, Queue
-from time import sleep, time
-from typing import Any, Callable, Literal
-
-from .cri_errors import CRICommandError, CRICommandTimeOutError, CRIConnectionError
-from .cri_protocol_parser import CRIProtocolParser
-from .robot_state import KinematicsState, RobotState
+from time import monotonic, sleep, time
+from typing import Any, Literal
+
+from .cri_client_base import CRIClientBase
+from .cri_deploy import DeployResult, deploy_programs
+from .cri_errors import CRICommandError, CRIConnectionError, CRIError
+from .cri_framing import CRIFrameScanner
+from .cri_path import PathResult, Waypoint, execute_path, move_command
+from .cri_pipeline import CommandPipeline
+from .cri_upload import (
+    ProgressCallback,
+    UploadResult,
+    read_upload_lines,
+    run_upload,
+    upload_steps,
+)
+from .robot_state import KinematicsState
 
 logger = logging.getLogger(__name__)
 
@@ -33,56 +43,31 @@ class MotionType(Enum):
     Platform = "Platform"
 
 
-async def wait_event_with_timeout(event: asyncio.Event, timeout: float):
-    t_start = time()
-    while not event.is_set():
-        await asyncio.sleep(0.001)
-        if time() - t_start > timeout:
-            raise TimeoutError
-    return
-
-
-class CRIClient:
+class CRIClient(CRIClientBase):
     """Client with implementations for read-only communication."""
 
-    ALIVE_JOG_INTERVAL_SEC = 0.2
     RECEIVE_TIMEOUT_SEC = 5
-    DEFAULT_ANSWER_TIMEOUT = 10.0
 
     def __init__(self) -> None:
         """Create a ``CRIClient`` without connecting it yet.
 
         Call ``connect`` to connect and start receiving data.
         """
-        self.robot_state: RobotState = RobotState()
-        self.robot_state_lock = threading.Lock()
-
-        self.file_list: list = []
-        self.file_list_lock: threading.Lock = threading.Lock()
+        super().__init__()
 
-        self.parser = CRIProtocolParser(self.robot_state, self.robot_state_lock)
+        self._list_files_lock = threading.Lock()
+        """only one `CMD ListFiles` at a time, as all share the `info_filelist` answer"""
 
-        self.connected = False
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.socket_write_lock = threading.Lock()
 
-        self.can_mode: bool = False
         self.can_queue: Queue = Queue()
 
         self.jog_thread = threading.Thread(target=self._bg_alivejog_thread, daemon=True)
-        self.jog_intervall = self.ALIVE_JOG_INTERVAL_SEC
         self.receive_thread = threading.Thread(
             target=self._bg_receive_thread, daemon=True
         )
 
-        self.sent_command_counter_lock = threading.Lock()
-        self.sent_command_counter = 0
-        self.answer_events_lock = threading.Lock()
-        self.answer_events: dict[str, asyncio.Event] = {}
-        self.error_messages: dict[str, str] = {}
-
-        self.status_callback: Callable | None = None
-
     def connect(
         self,
         host: str,
@@ -130,9 +115,9 @@ class CRIClient:
             # Start sending ALIVEJOG message
             self.jog_thread.start()
 
-            # Send hello message, this lets the robot control know who we are and what our time is (for logging / troubleshooting)
-            hello_msg = f'INFO Hello "{application_name}" {application_version} {datetime.now(timezone.utc).strftime(format="%Y-%m-%dT%H:%M:%S")}'
-            self._send_command(hello_msg)
+            self._send_command(
+                self._hello_command(application_name, application_version)
+            )
 
             # Request the axis count, this is needed for interpreting some messages
             self._send_command("CONFIG GetAxes")
@@ -166,86 +151,26 @@ class CRIClient:
             self.receive_thread.join()
 
         self.sock.close()
+        self._disconnected(CRIConnectionError("Connection closed."))
+        self.stop_recording()
 
-    def _register_answer(self, answer_id: str) -> None:
-        with self.answer_events_lock:
-            self.answer_events[answer_id] = asyncio.Event()
-
-    def _send_command(
-        self,
-        command: str,
-        register_answer: bool = False,
-        fixed_answer_name: str | None = None,
-    ) -> int:
-        """Sends the given command to iRC.
-
-        The method is marked private because technically it can be used to send control commands as well.
-
-        Parameters
-        ----------
-        command : str
-            Command to be sent without `CRISTART`, counter and `CRIEND`
-
-        Returns
-        -------
-        int
-            The sent message_id.
-
-        Raises
-        ------
-        CRIConnectionError
-            When not connected or connection was lost.
-        """
-        if not self.connected or self.sock is None:
-            logger.error("Not connected. Use connect() to establish a connection.")
-            raise CRIConnectionError(
-                "Not connected. Use connect() to establish a connection."
-            )
-
-        with self.sent_command_counter_lock:
-            command_counter = self.sent_command_counter
-
-            if self.sent_command_counter >= 9999:
-                self.sent_command_counter = 1
-            else:
-                self.sent_command_counter += 1
-
-        message = f"CRISTART {command_counter} {command} CRIEND"
-
-        if register_answer:
-            with self.answer_events_lock:
-                if fixed_answer_name is not None:
-                    self.answer_events[fixed_answer_name] = asyncio.Event()
-                else:
-                    self.answer_events[str(command_counter)] = asyncio.Event()
-
-        try:
-            with self.socket_write_lock:
-                self.sock.sendall(message.encode())
-            logger.debug("Sent command: %s", message)
-
-            return command_counter
-
-        except Exception as e:
-            logger.exception("Failed to send command.")
-            if register_answer:
-                with self.answer_events_lock:
-                    if fixed_answer_name is not None:
-                        del self.answer_events[fixed_answer_name]
-                    else:
-                        del self.answer_events[str(command_counter)]
-            self.connected = False
-            raise CRIConnectionError("ConnectionLost")
+    def _write(self, data: bytes) -> None:
+        with self.socket_write_lock:
+            self.sock.sendall(data)
+            self._record_sent(data)
 
     def _bg_alivejog_thread(self) -> None:
         """
         Background Thread sending alivejog messages to keep connection alive.
         """
         while self.connected:
-            if self._send_command("ALIVEJOG 0 0 0 0 0 0 0 0 0") is None:
+            try:
+                self._send_command(self._alivejog_command())
+            except CRIConnectionError:
                 logger.error("AliveJog Thread: Connection lost.")
-                self.connected = False
                 return
+            if (stats := self.stats) is not None:
+                stats.record_alivejog(self.jog_intervall)
 
             sleep(self.jog_intervall)
 
@@ -257,56 +182,74 @@ class CRIClient:
             logger.error("Receive Thread: Not connected.")
             return
 
-        message_buffer = bytearray()
+        scanner = CRIFrameScanner()
 
         while self.connected:
             try:
-                recv_buffer = self.sock.recv(4096)
+                received = scanner.recv_into(self.sock)
             except TimeoutError:
                 continue
 
-            if recv_buffer == b"":
+            if received == 0:
                 self.connected = False
                 logger.error("Receive Thread: Connection lost.")
+                self._disconnected(CRIConnectionError("ConnectionLost"))
                 return
 
-            message_buffer.extend(recv_buffer)
-
-            continue_parsing = True
-            while continue_parsing:
-                # check for an end of message
-                end_idx = message_buffer.find(b"CRIEND")
-                if end_idx != -1:
-                    start_idx = message_buffer.find(b"CRISTART")
-
-                    # check if there is a complete message
-                    if start_idx != -1:
-                        message = message_buffer[start_idx : end_idx + 6].decode()
-                        self._parse_message(message)
-
-                    # check if there is data left in the buffer
-                    if len(message_buffer) > end_idx + 7:
-                        message_buffer = message_buffer[end_idx + 7 :]
-                    else:
-                        message_buffer.clear()
-                else:
-                    continue_parsing = False
+            if (stats := self.stats) is not None:
+                stats.record_received(received, scanner.pending_bytes)
+            recorder = self.recorder
+            for frame in scanner.frames():
+                if recorder is not None:
+                    recorder.record(frame)
+                try:
+                    self._parse_message(frame)
+                except Exception:
+                    # a malformed message must not end the receive thread
+                    logger.exception("Failed to parse message.")
 
     def _wait_for_answer(
         self,
         message_id: str | int,
         timeout: float | None = DEFAULT,  # type: ignore
     ) -> None | str:
-        loop = asyncio.get_event_loop()
-        return loop.run_until_complete(self._wait_for_answer_async(message_id, timeout))
+        """Waits for an answer to a message, blocking the calling thread.
+        The answer will be removed after the call, even if there was a timeout. Choose timeout accordingly.
+        Can be called from any thread, also while an event loop is running in it.
+
+        Parameters
+        ----------
+        message_id : int or str
+            message id of sent message of which an answer is expected
+
+        timeout : float | DEFAULT | None
+            timeout for wait in seconds.
+            - `DEFAULT` and `None` use `self.DEFAULT_ANSWER_TIMEOUT`
+
+        Returns
+        -------
+        None | str
+            returns `None` if an answer was received with no error
+            returns an error message if an `CMDERROR` was received
+
+        Raises
+        ------
+        CRICommandTimeOutError
+            raised if no answer was received in given timeout
+        CRIConnectionError
+            raised if the connection was lost while waiting
+        """
+        if timeout is DEFAULT or timeout is None:
+            timeout = self.DEFAULT_ANSWER_TIMEOUT
+        return self.answers.wait(str(message_id), timeout)
 
     async def _wait_for_answer_async(
         self,
         message_id: str | int,
         timeout: float | None = DEFAULT,  # type: ignore
     ) -> None | str:
-        """Waits for an answer to a message.
-        The answer event will be removed after the call, even if there was a timeout. Choose timeout accordingly.
+        """Waits for an answer to a message without blocking the running event loop.
+        The answer will be removed after the call, even if there was a timeout. Choose timeout accordingly.
 
         Parameters
         ----------
@@ -315,8 +258,7 @@ class CRIClient:
 
         timeout : float | DEFAULT | None
             timeout for wait in seconds.
-            - `DEFAULT` uses `self.DEFAULT_ANSWER_TIMEOUT`
-            - `None` will wait indefinetly
+            - `DEFAULT` and `None` use `self.DEFAULT_ANSWER_TIMEOUT`
 
         Returns
         -------
@@ -326,57 +268,14 @@ class CRIClient:
 
         Raises
         ------
-        CRITimeoutError
+        CRICommandTimeOutError
             raised if no answer was received in given timeout
-
+        CRIConnectionError
+            raised if the connection was lost while waiting
         """
-        message_id = str(message_id)
-        with self.answer_events_lock:
-            if message_id not in self.answer_events:
-                return None
-            wait_event = self.answer_events[message_id]
-
         if timeout is DEFAULT or timeout is None:
             timeout = self.DEFAULT_ANSWER_TIMEOUT
-        success = await wait_event_with_timeout(wait_event, timeout=timeout)
-
-        if not success:
-            raise CRICommandTimeOutError()
-
-        # prevent deadlock through answer_events_lock
-        with self.answer_events_lock:
-            del self.answer_events[message_id]
-
-            if message_id in self.error_messages:
-                error_msg = self.error_messages[message_id]
-                del self.error_messages[message_id]
-                return error_msg
-            else:
-                return None
-
-    def _parse_message(self, message: str) -> None:
-        """Internal function to parse a message. If an answer event is registered for a certain msg_id it is triggered."""
-        if "STATUS" not in message:
-            logger.debug("Received: %s", message)
-
-        if (notification := self.parser.parse_message(message)) is not None:
-            if notification["answer"] == "status" and self.status_callback is not None:
-                self.status_callback(self.robot_state)
-
-            if notification["answer"] == "CAN":
-                self.can_queue.put_nowait(notification["can"])
-
-            if notification["answer"] == "info_filelist":
-                self.file_list = self.parser.file_list
-
-            with self.answer_events_lock:
-                msg_id = notification["answer"]
-
-                if msg_id in self.answer_events:
-                    if (error_msg := notification.get("error", None)) is not None:
-                        self.error_messages[msg_id] = error_msg
-
-                    self.answer_events[msg_id].set()
+        return await self.answers.wait_async(str(message_id), timeout)
 
     def wait_for_status_update(self, timeout: float | None = None) -> None:
         """Wait for next STATUS message.
@@ -394,20 +293,6 @@ class CRIClient:
         self._register_answer("status")
         self._wait_for_answer("status", timeout)
 
-    def register_status_callback(self, callback: Callable | None) -> None:
-        """Register a callback which is called every time a STATUS message was parsed to the state.
-        The callback must have the following definition:
-        def callback(state: RobotState)
-        Keep the callback as fast as possible as it will be excute by the receive thread and no messages will be processed, while is runs.
-        Also keep thread safety in mind, as the callback will be excuted by the receive thread.
-
-        Parameters
-        ----------
-        callback : Callable
-            callback function to be called, pass `None` to deregister a callback
-        """
-        self.status_callback = callback
-
     def wait_for_kinematics_ready(self, timeout: float = 30) -> bool:
         """Wait until drive state is indicated as ready.
 
@@ -425,8 +310,9 @@ class CRIClient:
         new_timeout = timeout
         while new_timeout > 0.0:
             self.wait_for_status_update(timeout=new_timeout)
-            if (self.robot_state.kinematics_state == KinematicsState.NO_ERROR) and (
-                self.robot_state.combined_axes_error == "NoError"
+            robot_state = self.robot_state
+            if (robot_state.kinematics_state == KinematicsState.NO_ERROR) and (
+                robot_state.combined_axes_error == "NoError"
             ):
                 return True
 
@@ -482,48 +368,73 @@ class CRIClient:
         else:
             return True
 
-    def list_files(self, target_directory: str = "Programs") -> bool:
+    def list_files(
+        self, target_directory: str = "Programs", max_age: float | None = None
+    ) -> list[str] | None:
         """Request a list of all files in the directory, which is relative to the /Data/ directory.
 
+        Listings are cached per directory for `file_lists.ttl` seconds and invalidated
+        by ``upload_file`` into the directory. Concurrent calls for the same directory
+        share one request.
+
         Parameters
         ----------
-        directory : str
+        target_directory : str
             directory on iRC `/Data/<target_directory>` in which files are located, e.g. `Programs` for normal robot programs
+        max_age : float | None
+            maximum age in seconds of a cached listing, `0` always requests a new one,
+            `file_lists.ttl` if `None`
 
         Returns
         -------
-        a list of files
+        list[str] | None
+            the files in the directory or `None` if the request failed, also if it
+            timed out or the connection was lost
         """
+        if (files := self.file_lists.get(target_directory, max_age)) is not None:
+            return files
 
-        command = f"CMD ListFiles {target_directory}"
+        future, owner = self.file_lists.begin(target_directory)
+        if not owner:
+            # the owner resolves the future before its deadline has passed
+            return None if (files := future.result()) is None else list(files)
 
-        if (
-            self._send_command(
-                command=command, register_answer=True, fixed_answer_name="info_filelist"
-            )
-            is not None
-        ):
-            if (
-                error_msg := self._wait_for_answer(
-                    "info_filelist", timeout=self.DEFAULT_ANSWER_TIMEOUT
-                )
-            ) is not None:
-                logger.debug("Error in ListFiles command: %s", error_msg)
-                return False
-            else:
-                return True
-        else:
-            return False
+        # a single deadline for waiting on other directories and on the answer
+        deadline = monotonic() + self.DEFAULT_ANSWER_TIMEOUT
+        error_msg: str | None = "Timeout waiting for other ListFiles requests"
+        try:
+            if self._list_files_lock.acquire(timeout=self.DEFAULT_ANSWER_TIMEOUT):
+                try:
+                    self.file_lists.expect(target_directory)
+                    self._send_command(
+                        f"CMD ListFiles {target_directory}",
+                        register_answer=True,
+                        fixed_answer_name="info_filelist",
+                    )
+                    error_msg = self._wait_for_answer(
+                        "info_filelist", timeout=max(0.0, deadline - monotonic())
+                    )
+                except CRIError as e:
+                    # not connected, connection lost or no answer in time
+                    error_msg = str(e)
+                finally:
+                    self._list_files_lock.release()
+        finally:
+            files = self.file_lists.finish(target_directory, future, error_msg is None)
+
+        if error_msg is not None:
+            logger.debug("Error in ListFiles command: %s", error_msg)
+        return files
 
 
 class CRIController(CRIClient):
     """A connected ``CRIClient`` with control capabilities."""
 
     ACTIVE_JOG_INTERVAL_SEC = 0.02
+    UPLOAD_WINDOW = 64
 
     def __init__(self) -> None:
         self.live_jog_active: bool = False
-        self.jog_intervall = self.ALIVE_JOG_INTERVAL_SEC
         self.jog_speeds: dict[str, float] = {
             "A1": 0.0,
             "A2": 0.0,
@@ -536,29 +447,50 @@ class CRIController(CRIClient):
             "E3": 0.0,
         }
         self.jog_speeds_lock = threading.Lock()
-        self.file_list: list = []
         super().__init__()
 
-    def _bg_alivejog_thread(self) -> None:
-        """Overrides the ``CRIClient._bg_alivejog_thread`` to send alivejog messages with possibly nonzero jog speeds."""
-        while self.connected:
-            if self.live_jog_active:
-                with self.jog_speeds_lock:
-                    command = f"ALIVEJOG {self.jog_speeds['A1']} {self.jog_speeds['A2']} {self.jog_speeds['A3']} {self.jog_speeds['A4']} {self.jog_speeds['A5']} {self.jog_speeds['A6']} {self.jog_speeds['E1']} {self.jog_speeds['E2']} {self.jog_speeds['E3']}"
-            else:
-                command = "ALIVEJOG 0 0 0 0 0 0 0 0 0"
-
-            if self._send_command(command) is None:
-                logger.error("AliveJog Thread: Connection lost.")
-                self.connected = False
-                return
-
-            sleep(self.jog_intervall)
+    def _alivejog_command(self) -> str:
+        """Overrides ``CRIClient._alivejog_command`` to send possibly nonzero jog speeds."""
+        if self.live_jog_active:
+            with self.jog_speeds_lock:
+                return "ALIVEJOG " + " ".join(
+                    str(speed) for speed in self.jog_speeds.values()
+                )
+        else:
+            return "ALIVEJOG 0 0 0 0 0 0 0 0 0"
 
     def send_command(self, command, register_answer=False, fixed_answer_name=None):
         """Wraps the superclass method to make it public."""
         return super()._send_command(command, register_answer, fixed_answer_name)
 
+    def pipeline(
+        self,
+        window: int = CommandPipeline.DEFAULT_WINDOW,
+        timeout: float | None = DEFAULT,  # type: ignore
+    ) -> CommandPipeline:
+        """Create a pipeline sending commands without waiting for each answer.
+
+        A sequence of commands then costs about one network round trip instead of one
+        per command, see ``CommandPipeline``.
+
+        Parameters
+        ----------
+        window : int
+            maximum number of commands waiting for their answer
+        timeout : float | DEFAULT | None
+            maximum time in seconds to wait for space in the window and for all
+            answers, `DEFAULT` uses `self.DEFAULT_ANSWER_TIMEOUT`, `None` waits
+            indefinitely
+
+        Returns
+        -------
+        CommandPipeline
+            the pipeline, use ``submit`` to send commands
+        """
+        if timeout is DEFAULT:
+            timeout = self.DEFAULT_ANSWER_TIMEOUT
+        return CommandPipeline(self, window, timeout)
+
     def reset(self) -> bool:
         """Reset robot clears errors and fetches current axis positions from the modules.
 
@@ -745,22 +677,20 @@ class CRIController(CRIClient):
             optional acceleration of move in percent of maximum acceleration of robot. Controller defaults to 40%
             requires igus Robot Control version >= V14-004-1 on robot controller
         """
-        command = (
-            f"CMD Move Joint {A1} {A2} {A3} {A4} {A5} {A6} {E1} {E2} {E3} {velocity}"
+        command = move_command(
+            "Joint",
+            (A1, A2, A3, A4, A5, A6, E1, E2, E3),
+            velocity,
+            acceleration=acceleration,
         )
 
-        if (
-            (acceleration is not None)
-            and (acceleration >= 0.0)
-            and (acceleration <= 100.0)
-        ):
-            command = f"{command} {acceleration}"
-
         if wait_move_finished:
             self._register_answer("EXECEND")
 
         msg_id = self._send_command(command, True)
-        if (error_msg := self._wait_for_answer(msg_id, timeout=30.0)) is not None:
+        if (
+            error_msg := self._wait_for_answer(msg_id, timeout=self.MOVE_ANSWER_TIMEOUT)
+        ) is not None:
             logger.debug("Error in Move Joints command: %s", error_msg)
             return False
 
@@ -811,20 +741,20 @@ class CRIController(CRIClient):
             optional acceleration of move in percent of maximum acceleration of robot. Controller defaults to 40%
             requires igus Robot Control version >= V14-004-1 on robot controller
         """
-        command = f"CMD Move RelativeJoint {A1} {A2} {A3} {A4} {A5} {A6} {E1} {E2} {E3} {velocity}"
-
-        if (
-            (acceleration is not None)
-            and (acceleration >= 0.0)
-            and (acceleration <= 100.0)
-        ):
-            command = f"{command} {acceleration}"
+        command = move_command(
+            "RelativeJoint",
+            (A1, A2, A3, A4, A5, A6, E1, E2, E3),
+            velocity,
+            acceleration=acceleration,
+        )
 
         if wait_move_finished:
             self._register_answer("EXECEND")
 
         msg_id = self._send_command(command, True)
-        if (error_msg := self._wait_for_answer(msg_id, timeout=30.0)) is not None:
+        if (
+            error_msg := self._wait_for_answer(msg_id, timeout=self.MOVE_ANSWER_TIMEOUT)
+        ) is not None:
             logger.debug("Error in Move Joints command: %s", error_msg)
             return False
 
@@ -881,22 +811,17 @@ class CRIController(CRIClient):
             optional acceleration of move in percent of maximum acceleration of robot. Controller defaults to 40%
             requires igus Robot Control version >= V14-004-1 on robot controller
         """
-        command = (
-            f"CMD Move Cart {X} {Y} {Z} {A} {B} {C} {E1} {E2} {E3} {velocity} {frame}"
+        command = move_command(
+            "Cart", (X, Y, Z, A, B, C, E1, E2, E3), velocity, frame, acceleration
         )
 
-        if (
-            (acceleration is not None)
-            and (acceleration >= 0.0)
-            and (acceleration <= 100.0)
-        ):
-            command = f"{command} {acceleration}"
-
         if wait_move_finished:
             self._register_answer("EXECEND")
 
         msg_id = self._send_command(command, True)
-        if (error_msg := self._wait_for_answer(msg_id, timeout=30.0)) is not None:
+        if (
+            error_msg := self._wait_for_answer(msg_id, timeout=self.MOVE_ANSWER_TIMEOUT)
+        ) is not None:
             logger.debug("Error in Move Joints command: %s", error_msg)
             return False
 
@@ -952,22 +877,21 @@ class CRIController(CRIClient):
             optional acceleration of move in percent of maximum acceleration of robot. Controller defaults to 40%
             requires igus Robot Control version >= V14-004-1 on robot controller
         """
-        command = (
-            f"CMD Move RelativeBase {X} {Y} {Z} {A} {B} {C} {E1} {E2} {E3} {velocity} {frame}"
+        command = move_command(
+            "RelativeBase",
+            (X, Y, Z, A, B, C, E1, E2, E3),
+            velocity,
+            frame,
+            acceleration,
         )
 
-        if (
-            (acceleration is not None)
-            and (acceleration >= 0.0)
-            and (acceleration <= 100.0)
-        ):
-            command = f"{command} {acceleration}"
-
         if wait_move_finished:
             self._register_answer("EXECEND")
 
         msg_id = self._send_command(command, True)
-        if (error_msg := self._wait_for_answer(msg_id, timeout=30.0)) is not None:
+        if (
+            error_msg := self._wait_for_answer(msg_id, timeout=self.MOVE_ANSWER_TIMEOUT)
+        ) is not None:
             logger.debug("Error in Move Joints command: %s", error_msg)
             return False
 
@@ -1023,22 +947,21 @@ class CRIController(CRIClient):
             optional acceleration of move in percent of maximum acceleration of robot. Controller defaults to 40%
             requires igus Robot Control version >= V14-004-1 on robot controller
         """
-        command = (
-            f"CMD Move RelativeTool {X} {Y} {Z} {A} {B} {C} {E1} {E2} {E3} {velocity} {frame}"
+        command = move_command(
+            "RelativeTool",
+            (X, Y, Z, A, B, C, E1, E2, E3),
+            velocity,
+            frame,
+            acceleration,
         )
 
-        if (
-            (acceleration is not None)
-            and (acceleration >= 0.0)
-            and (acceleration <= 100.0)
-        ):
-            command = f"{command} {acceleration}"
-
         if wait_move_finished:
             self._register_answer("EXECEND")
 
         msg_id = self._send_command(command, True)
-        if (error_msg := self._wait_for_answer(msg_id, timeout=30.0)) is not None:
+        if (
+            error_msg := self._wait_for_answer(msg_id, timeout=self.MOVE_ANSWER_TIMEOUT)
+        ) is not None:
             logger.debug("Error in Move Joints command: %s", error_msg)
             return False
 
@@ -1053,6 +976,43 @@ class CRIController(CRIClient):
 
         return True
 
+    def execute_path(
+        self,
+        waypoints: Iterable[Waypoint],
+        lookahead: int = 4,
+        move_finished_timeout: float | None = 300.0,
+    ) -> PathResult:
+        """Execute a sequence of moves without stopping between them.
+
+        Up to `lookahead` moves are queued in the robot controller, the next move is
+        sent whenever an `EXECEND` signals the end of a queued one. If a move is
+        rejected or fails, no further moves are sent and the queued ones are stopped.
+        No other moves must be sent while the path is executed, as the `EXECEND`
+        messages are counted.
+
+        Parameters
+        ----------
+        waypoints : Iterable[Waypoint]
+            moves of the path, consumed lazily, so a generator can produce them
+        lookahead : int
+            maximum number of moves queued in the robot controller
+        move_finished_timeout : float | None
+            timeout in seconds for waiting for the next move to finish, `None` will
+            wait indefinetly
+
+        Returns
+        -------
+        PathResult
+            number of completed moves, error message and timing of every move
+
+        Raises
+        ------
+        CRICommandTimeOutError
+            raised if a move was not acknowledged or did not finish in time, the
+            queued moves are stopped
+        """
+        return execute_path(self, waypoints, lookahead, move_finished_timeout)
+
     def stop_move(self) -> bool:
         """Stop movement
 
@@ -1357,9 +1317,21 @@ class CRIController(CRIClient):
         else:
             return True
 
-    def upload_file(self, path: str | Path, target_directory: str) -> bool:
+    def upload_file(
+        self,
+        path: str | Path,
+        target_directory: str,
+        window: int = UPLOAD_WINDOW,
+        progress: ProgressCallback | None = None,
+    ) -> UploadResult:
         """Uploads file to iRC into `/Data/<target_directory>`
 
+        The lines are streamed with up to `window` lines waiting for their
+        acknowledgement. Every acknowledgement is verified, the upload stops at the
+        first rejected line. CRI has no command to abort an upload, so a failed
+        upload is not finished and may leave an incomplete file on the robot
+        controller, which is replaced when the file is uploaded again.
+
         Parameters
         ----------
         path : str | Path
@@ -1368,44 +1340,71 @@ class CRIController(CRIClient):
         target_directory : str
             directory on iRC `/Data/<target_directory>` into which file will be uploaded, e.g. `Programs` for normal robot programs
 
+        window : int
+            maximum number of lines waiting for their acknowledgement
+
+        progress : Callable[[int, int], None] | None
+            called with the number of acknowledged lines and the number of lines
+
         Returns
         -------
-        bool
-            `True` file was uploaded successfully
-            `False` there was an error during upload
+        UploadResult
+            evaluates to `True` if the file was uploaded successfully, otherwise
+            contains the error message and the number of the failing line
         """
-
-        if isinstance(path, Path):
-            file_path = path
-        elif isinstance(path, str):
-            file_path = Path(path)
-        else:
-            return False
-
+        file_path = Path(path)
+        result = UploadResult(f"{target_directory}/{file_path.name}")
+        if (lines := read_upload_lines(file_path)) is None:
+            return result.fail(0, f"Error reading {file_path}")
+        steps = upload_steps(result, lines, self._send_watched, window, progress)
         try:
-            with open(file_path, "r") as fp:
-                lines = []
-                while line := fp.readline():
-                    logger.debug(line)
-                    lines.append(line)
-
-        except OSError as e:
-            logger.error("Error reading %s: %s", str(Path), str(e))
-            return False
-
-        command = f"CMD UploadFileInit {target_directory + '/' + str(file_path.name)} {len(lines)} 0"
-
-        self._send_command(command, True)
+            run_upload(steps, self.DEFAULT_ANSWER_TIMEOUT)
+        finally:
+            # listings requested before or during the upload are outdated
+            self.file_lists.invalidate(target_directory)
+        return result
 
-        for line in lines:
-            command = f"CMD UploadFileLine {line.rstrip()}"
+    def deploy_programs(
+        self,
+        local_dir: str | Path,
+        target_directory: str = "Programs",
+        manifest_path: str | Path | None = None,
+        force: bool = False,
+    ) -> DeployResult:
+        """Upload the new or modified files of a directory.
+
+        A manifest stores the content hash of every uploaded file per robot
+        controller, identified by its robot control version and project file. Files
+        whose hash matches the manifest and which are present on the robot controller
+        according to ``list_files`` are skipped. Subdirectories and hidden files are
+        not deployed.
 
-            self._send_command(command, True)
+        Parameters
+        ----------
+        local_dir : str | Path
+            local directory containing the files
+        target_directory : str
+            directory on iRC `/Data/<target_directory>` into which the files will be
+            uploaded
+        manifest_path : str | Path | None
+            path of the manifest, `<local_dir>/.cri_deploy.json` if `None`
+        force : bool
+            upload all files even if unchanged
 
-        command = "CMD UploadFileFinish"
+        Returns
+        -------
+        DeployResult
+            names of the uploaded and skipped files and the results of failed uploads,
+            evaluates to `True` if no upload failed
 
-        self._send_command(command, True)
-        return True
+        Raises
+        ------
+        CRICommandTimeOutError
+            raised if the robot control version or project file, which are sent by
+            the robot controller after connecting, was not received within
+            `DEFAULT_ANSWER_TIMEOUT`
+        """
+        return deploy_programs(self, local_dir, target_directory, manifest_path, force)
 
     def enable_can_bridge(self, enabled: bool) -> None:
         """Enables or diables CAN bridge mode. All other functions are disabled in CAN bridge mode.
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from .cri_errors import CRICommandTimeOutError
+from .cri_upload import UploadResult
+
+if TYPE_CHECKING:
+    from .cri_controller import CRIController
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".cri_deploy.json"
+
+
+@dataclass(slots=True)
+class DeployResult:
+    """
+    Result of ``CRIController.deploy_programs``.
+
+    Evaluates to `True` if all new or modified files were uploaded.
+    """
+
+    uploaded: list[str] = field(default_factory=list)
+    """names of the uploaded files"""
+    skipped: list[str] = field(default_factory=list)
+    """names of the files which are unchanged on the robot controller"""
+    failed: dict[str, UploadResult] = field(default_factory=dict)
+    """upload result of every file which could not be uploaded"""
+    duration: float = 0.0
+    """time of the deployment in seconds"""
+
+    def __bool__(self) -> bool:
+        return not self.failed
+
+
+class DeployManifest:
+    """
+    Content hashes of the files deployed to robot controllers.
+
+    The hashes are stored in a JSON file per controller, identified by its robot
+    control version and project file, and per target directory.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        Load a manifest, a missing or unreadable file gives an empty manifest.
+
+        Parameters
+        ----------
+        path : str | Path
+            path of the JSON file
+        """
+        self.path = Path(path)
+        self.entries: dict[str, dict[str, dict[str, str]]] = {}
+        """content hash per controller, target directory and file name"""
+        try:
+            with open(self.path, "r") as fp:
+                self.entries = json.load(fp)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring deploy manifest %s: %s", str(self.path), str(e))
+
+    @staticmethod
+    def controller_key(robot_control_version: str, project_file: str) -> str:
+        return f"{robot_control_version}|{project_file}"
+
+    def hashes(self, controller: str, target_directory: str) -> dict[str, str]:
+        """Returns the mutable hashes of the files of a target directory."""
+        return self.entries.setdefault(controller, {}).setdefault(target_directory, {})
+
+    def save(self) -> None:
+        """Writes the manifest, replacing the file only once it is complete."""
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "w") as fp:
+            json.dump(self.entries, fp, indent=2, sort_keys=True)
+        temp_path.replace(self.path)
+
+
+def file_hash(path: Path) -> str:
+    """Returns the SHA-256 hex digest of the content of a file."""
+    with open(path, "rb") as fp:
+        return hashlib.sha256(fp.read()).hexdigest()
+
+
+def controller_identity(controller: "CRIController", timeout: float) -> str:
+    """
+    Waits for the robot control version and project file, which the robot controller
+    sends after connecting, and returns the manifest key of the controller.
+
+    Parameters
+    ----------
+    controller : CRIController
+        connected controller
+    timeout : float
+        maximum wait time in seconds
+
+    Returns
+    -------
+    str
+        key of the controller in the manifest, see ``DeployManifest.controller_key``
+
+    Raises
+    ------
+    CRICommandTimeOutError
+        raised if the version or the project file was not received in time
+    """
+    deadline = monotonic() + timeout
+    while True:
+        state = controller.robot_state
+        if state.robot_control_version and state.project_file:
+            return DeployManifest.controller_key(
+                state.robot_control_version, state.project_file
+            )
+        if (remaining := deadline - monotonic()) <= 0.0:
+            raise CRICommandTimeOutError(
+                "Robot controller did not report its robot control version and "
+                "project file, which identify it in the deploy manifest."
+            )
+        try:
+            controller.wait_for_status_update(timeout=remaining)
+        except CRICommandTimeOutError:
+            pass
+
+
+def deploy_programs(
+    controller: "CRIController",
+    local_dir: str | Path,
+    target_directory: str,
+    manifest_path: str | Path | None,
+    force: bool,
+) -> DeployResult:
+    """Uploads new or modified files, see ``deploy_programs`` of
+    ``CRIController``."""
+    local_dir = Path(local_dir)
+    key = controller_identity(controller, controller.DEFAULT_ANSWER_TIMEOUT)
+    manifest = DeployManifest(manifest_path or local_dir / MANIFEST_NAME)
+    hashes = manifest.hashes(key, target_directory)
+
+    # a fresh listing, files may have been deleted on the robot controller
+    if (files := controller.list_files(target_directory, max_age=0)) is not None:
+        present = set(files)
+    else:
+        logger.warning("Could not list %s, uploading all files", target_directory)
+        present = set()
+
+    result = DeployResult()
+    t_start = monotonic()
+    try:
+        for path in sorted(local_dir.iterdir()):
+            if not path.is_file() or path.name.startswith("."):
+                continue
+
+            content_hash = file_hash(path)
+            if (
+                not force
+                and path.name in present
+                and hashes.get(path.name) == content_hash
+            ):
+                result.skipped.append(path.name)
+                continue
+
+            # forget the old hash first, a failed upload may leave a partial file
+            hashes.pop(path.name, None)
+            if upload := controller.upload_file(path, target_directory):
+                hashes[path.name] = content_hash
+                result.uploaded.append(path.name)
+            else:
+                result.failed[path.name] = upload
+    finally:
+        manifest.save()
+
+    result.duration = monotonic() - t_start
+    logger.info(
+        "Deployed %s to %s: %d uploaded, %d unchanged, %d failed",
+        str(local_dir),
+        target_directory,
+        len(result.uploaded),
+        len(result.skipped),
+        len(result.failed),
+    )
+    return result
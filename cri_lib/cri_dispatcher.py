@@ -0,0 +1,271 @@
+import logging
+import threading
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor
+from typing import Any, Literal
+
+logger = logging.getLogger(__name__)
+
+OverflowPolicy = Literal["block", "drop_oldest", "conflate"]
+
+
+class _Event:
+    """Pending call of a callback."""
+
+    __slots__ = ("key", "callback", "args")
+
+    def __init__(
+        self, key: Callable[..., Any], callback: Callable[..., Any], args: tuple
+    ) -> None:
+        self.key = key
+        self.callback = callback
+        self.args = args
+
+
+class CallbackDispatcher:
+    """
+    Executes callbacks off the receive path through a bounded queue.
+
+    Callbacks wrapped with ``wrap`` only enqueue their arguments when called, e.g. by
+    the receive thread of a client, and are executed in order by a worker thread of the
+    dispatcher or, if given, by an executor. A slow callback therefore never delays the
+    processing of answers or the ALIVEJOG messages of a client.
+
+    If the queue is full when an event is added, the `overflow` policy decides:
+
+    - `"block"`: the caller waits until there is space in the queue
+    - `"drop_oldest"`: the oldest pending event is dropped
+    - `"conflate"`: a pending event of the same wrapped callback is replaced by the new
+      one, so a callback only receives the latest state; if there is none, the oldest
+      pending event is dropped
+
+    Conflation also applies if the queue is not full, so with `"conflate"` at most one
+    event per wrapped callback is pending.
+    """
+
+    DEFAULT_MAXSIZE = 100
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        overflow: OverflowPolicy = "drop_oldest",
+        executor: Executor | None = None,
+    ) -> None:
+        """
+        Create a dispatcher. Its worker thread is started on the first event.
+
+        Parameters
+        ----------
+        maxsize : int
+            maximum number of pending events
+        overflow : "block" | "drop_oldest" | "conflate"
+            policy if the queue is full, see ``CallbackDispatcher``
+        executor : Executor | None
+            executor running the callbacks instead of a worker thread of the
+            dispatcher, the callbacks are still executed one at a time in order
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        if overflow not in ("block", "drop_oldest", "conflate"):
+            raise ValueError(f"Unknown overflow policy {overflow!r}")
+
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.executor = executor
+
+        self._condition = threading.Condition()
+        self._queue: deque[_Event] = deque()
+        self._pending: dict[Callable[..., Any], _Event] = {}
+        """pending event per wrapped callback in conflate mode"""
+        self._running = False
+        """whether an executor task is processing the queue"""
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+        self.dispatched_count = 0
+        """number of events passed to their callback"""
+        self.dropped_count = 0
+        """number of events dropped because the queue was full or closed"""
+        self.conflated_count = 0
+        """number of events replaced by a newer event"""
+        self.blocked_count = 0
+        """number of events for which the caller had to wait for space in the queue"""
+        self.error_count = 0
+        """number of callbacks which raised an exception"""
+
+    def __enter__(self) -> "CallbackDispatcher":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def counters(self) -> dict[str, int]:
+        """
+        Returns a snapshot of the counters.
+
+        Returns
+        -------
+        dict[str, int]
+            pending, dispatched, dropped, conflated, blocked and error counts
+        """
+        with self._condition:
+            return {
+                "pending": len(self._queue),
+                "dispatched": self.dispatched_count,
+                "dropped": self.dropped_count,
+                "conflated": self.conflated_count,
+                "blocked": self.blocked_count,
+                "errors": self.error_count,
+            }
+
+    def wrap(self, callback: Callable[..., Any]) -> Callable[..., None]:
+        """
+        Returns a function which dispatches its calls to `callback`.
+
+        Parameters
+        ----------
+        callback : Callable[..., Any]
+            function to execute off the calling thread
+
+        Returns
+        -------
+        Callable[..., None]
+            function adding an event with its arguments to the queue
+        """
+
+        def dispatch(*args: Any) -> None:
+            self.put(dispatch, callback, args)
+
+        return dispatch
+
+    def put(
+        self, key: Callable[..., Any], callback: Callable[..., Any], args: tuple
+    ) -> None:
+        """
+        Adds an event to the queue, applying the overflow policy.
+
+        Parameters
+        ----------
+        key : Callable[..., Any]
+            identity of the event source for conflation, e.g. the wrapped callback
+        callback : Callable[..., Any]
+            function to call
+        args : tuple
+            arguments of the call
+        """
+        with self._condition:
+            if self._closed:
+                self.dropped_count += 1
+                return
+
+            if self.overflow == "conflate":
+                if (event := self._pending.get(key)) is not None:
+                    event.args = args
+                    self.conflated_count += 1
+                    return
+            elif self.overflow == "block" and len(self._queue) >= self.maxsize:
+                self.blocked_count += 1
+                while len(self._queue) >= self.maxsize and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    self.dropped_count += 1
+                    return
+
+            if len(self._queue) >= self.maxsize:
+                self._drop_oldest()
+
+            event = _Event(key, callback, args)
+            self._queue.append(event)
+            if self.overflow == "conflate":
+                self._pending[key] = event
+            self._schedule()
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stops accepting events, events added afterwards are dropped.
+
+        Parameters
+        ----------
+        wait : bool
+            whether to wait until the pending events are processed, otherwise they are
+            dropped
+        """
+        with self._condition:
+            self._closed = True
+            if not wait:
+                self.dropped_count += len(self._queue)
+                self._queue.clear()
+                self._pending.clear()
+            self._condition.notify_all()
+            while wait and self._running and self.executor is not None:
+                self._condition.wait()
+            thread = self._thread
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _drop_oldest(self) -> None:
+        """Drops the oldest pending event, must be called with the lock held."""
+        self._forget(self._queue.popleft())
+        self.dropped_count += 1
+
+    def _forget(self, event: _Event) -> _Event:
+        """Removes an event from the conflation table, requires the lock."""
+        if self._pending.get(event.key) is event:
+            del self._pending[event.key]
+        return event
+
+    def _schedule(self) -> None:
+        """Starts processing the queue, must be called with the lock held."""
+        if self.executor is not None:
+            if not self._running:
+                self._running = True
+                self.executor.submit(self._drain)
+        elif self._thread is None:
+            self._thread = threading.Thread(target=self._bg_worker_thread, daemon=True)
+            self._thread.start()
+        else:
+            self._condition.notify_all()
+
+    def _next_event(self) -> _Event:
+        """Removes the next event, must be called with the lock held."""
+        event = self._forget(self._queue.popleft())
+        # wake callers waiting for space
+        self._condition.notify_all()
+        return event
+
+    def _call(self, event: _Event) -> None:
+        try:
+            event.callback(*event.args)
+        except Exception:
+            logger.exception("Exception in dispatched callback %r", event.callback)
+            with self._condition:
+                self.error_count += 1
+        with self._condition:
+            self.dispatched_count += 1
+
+    def _drain(self) -> None:
+        """Executor task processing the queue until it is empty."""
+        while True:
+            with self._condition:
+                if not self._queue:
+                    self._running = False
+                    self._condition.notify_all()
+                    return
+                event = self._next_event()
+            self._call(event)
+
+    def _bg_worker_thread(self) -> None:
+        """Background thread processing the queue until the dispatcher is closed."""
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                event = self._next_event()
+            self._call(event)
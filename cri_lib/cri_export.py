@@ -0,0 +1,495 @@
+import argparse
+import csv
+import logging
+import os
+import tempfile
+import threading
+import zipfile
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Literal
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency
+    np = None  # type: ignore[assignment]
+
+from .cri_protocol_parser import CRIProtocolParser
+from .cri_recorder import CRIRecordReader, RecordingBlock
+from .robot_state import PosVariable, RobotState
+from .robot_state_arrays import _get_cartesian, _get_joints
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["npz", "csv"]
+
+CATEGORIES = ("STATUS", "RUNSTATE", "CYCLESTAT", "VARIABLES")
+"""message categories which can be exported"""
+
+_BITS_64 = (1 << 64) - 1
+
+_get_platform = attrgetter("X", "Y", "RZ")
+_get_pos_variable = attrgetter(*PosVariable.__dataclass_fields__)
+_NO_VALUES = (float("nan"),) * (len(PosVariable.__dataclass_fields__) - 1)
+
+_COLUMNS: dict[str, dict[str, tuple[str, int]]] = {
+    "STATUS": {
+        "time_ns": ("<i8", 1),
+        "mode": ("U", 1),
+        "joints_current": ("<f8", 16),
+        "joints_set_point": ("<f8", 16),
+        "position_robot": ("<f8", 6),
+        "position_platform": ("<f8", 3),
+        "cart_speed_mm_per_s": ("<f8", 1),
+        "override": ("<f8", 1),
+        "din": ("<u8", 1),
+        "dout": ("<u8", 1),
+        "global_signals": ("<u8", 2),
+        "emergency_stop_ok": ("?", 1),
+        "main_relay": ("?", 1),
+        "supply_voltage": ("<f8", 1),
+        "current_total": ("<f8", 1),
+        "current_joints": ("<f8", 16),
+        "kinematics_state": ("<i2", 1),
+        "operation_mode": ("<i2", 1),
+        "combined_axes_error": ("U", 1),
+    },
+    "RUNSTATE": {
+        "time_ns": ("<i8", 1),
+        "interpreter": ("U", 1),
+        "main_program": ("U", 1),
+        "current_program": ("U", 1),
+        "commands_count": ("<i8", 1),
+        "current_command": ("<i8", 1),
+        "runstate": ("<i2", 1),
+        "replay_mode": ("<i2", 1),
+    },
+    "CYCLESTAT": {
+        "time_ns": ("<i8", 1),
+        "cycle_time": ("<f8", 1),
+        "workload": ("<f8", 1),
+    },
+    "VARIABLES": {
+        "time_ns": ("<i8", 1),
+        "name": ("U", 1),
+        "type": ("U", 1),
+        "values": ("<f8", len(PosVariable.__dataclass_fields__)),
+    },
+}
+"""dtype (`U`: string of any length) and number of items per row of every column"""
+
+
+def _status_rows(robot_state: RobotState, message: str) -> list[tuple]:
+    global_signals = robot_state.global_signals_bits
+    return [
+        (
+            robot_state.mode.value,
+            _get_joints(robot_state.joints_current),
+            _get_joints(robot_state.joints_set_point),
+            _get_cartesian(robot_state.position_robot),
+            _get_platform(robot_state.position_platform),
+            robot_state.cart_speed_mm_per_s,
+            robot_state.override,
+            robot_state.din_bits,
+            robot_state.dout_bits,
+            (global_signals & _BITS_64, global_signals >> 64),
+            robot_state.emergency_stop_ok,
+            robot_state.main_relay,
+            robot_state.supply_voltage,
+            robot_state.current_total,
+            tuple(robot_state.current_joints),
+            robot_state.kinematics_state.value,
+            robot_state.operation_mode.value,
+            robot_state.combined_axes_error,
+        )
+    ]
+
+
+def _runstate_rows(robot_state: RobotState, message: str) -> list[tuple]:
+    interpreter = message.split(maxsplit=4)[3]
+    if interpreter not in ("MAIN", "LOGIC"):
+        return []
+    prefix = interpreter.lower()
+    return [
+        (
+            interpreter,
+            getattr(robot_state, f"{prefix}_main_program"),
+            getattr(robot_state, f"{prefix}_current_program"),
+            getattr(robot_state, f"{prefix}_commands_count"),
+            getattr(robot_state, f"{prefix}_current_command"),
+            getattr(robot_state, f"{prefix}_runstate").value,
+            getattr(robot_state, f"{prefix}_replay_mode").value,
+        )
+    ]
+
+
+def _cyclestat_rows(robot_state: RobotState, message: str) -> list[tuple]:
+    return [(robot_state.cycle_time, robot_state.workload)]
+
+
+def _variables_rows(robot_state: RobotState, message: str) -> list[tuple]:
+    rows = []
+    for name, value in robot_state.variabels.items():
+        if isinstance(value, PosVariable):
+            rows.append((name, "ValuePosVariable", _get_pos_variable(value)))
+        else:
+            # number variables only use the first value
+            rows.append((name, "ValueNrVariable", (value, *_NO_VALUES)))
+    return rows
+
+
+_ROWS: dict[str, Callable[[RobotState, str], list[tuple]]] = {
+    "STATUS": _status_rows,
+    "RUNSTATE": _runstate_rows,
+    "CYCLESTAT": _cyclestat_rows,
+    "VARIABLES": _variables_rows,
+}
+"""functions returning the rows (without `time_ns`) of a parsed message"""
+
+_worker_reader: CRIRecordReader | None = None
+"""recording opened once per worker process"""
+
+
+def _init_worker(path: str) -> None:
+    global _worker_reader
+    _worker_reader = CRIRecordReader(path)
+
+
+def _scan_axes(blocks: Sequence[RecordingBlock]) -> str | None:
+    """Returns the last `CONFIG Axes` message received in the blocks."""
+    assert _worker_reader is not None
+    message = None
+    for block in blocks:
+        for frame in _worker_reader.block_frames(block):
+            if not frame.sent and b" CONFIG Axes " in frame.data:
+                message = frame.data
+    return None if message is None else str(message, "utf-8")
+
+
+def _parse_chunk(
+    blocks: Sequence[RecordingBlock],
+    axes_message: str | None,
+    categories: Sequence[str],
+) -> dict[str, dict[str, list]]:
+    """
+    Parses the received frames of consecutive blocks to columns per category.
+
+    `axes_message` is the last `CONFIG Axes` message received before the first block,
+    it is required to map the axes of STATUS messages.
+    """
+    assert _worker_reader is not None
+    parser = CRIProtocolParser(RobotState(), threading.Lock())
+    if axes_message is not None:
+        parser.parse_message(axes_message)
+
+    columns: dict[str, dict[str, list[Any]]] = {
+        category: {name: [] for name in _COLUMNS[category]} for category in categories
+    }
+    appenders = {
+        category.encode(): (
+            _ROWS[category],
+            [column.append for column in columns[category].values()],
+        )
+        for category in categories
+    }
+    time_offset_ns = _worker_reader.to_wall_time_ns(0)
+
+    for block in blocks:
+        for frame in _worker_reader.block_frames(block):
+            if frame.sent:
+                continue
+            parts = frame.data.split(maxsplit=3)
+            if len(parts) < 4:
+                logger.warning(
+                    "Skipped recorded message without category: %s", frame.data
+                )
+                continue
+            target = appenders.get(category := parts[2])
+            if target is None and category != b"CONFIG":
+                # other categories do not change the exported fields
+                continue
+
+            message = str(frame.data, "utf-8")
+            try:
+                parser.parse_message(message)
+                if target is None:
+                    continue
+                rows = target[0](parser.robot_state, message)
+            except Exception:
+                logger.warning("Failed to parse recorded message: %s", message)
+                continue
+
+            time_ns = frame.timestamp_ns + time_offset_ns
+            time_append, *value_appends = target[1]
+            for row in rows:
+                time_append(time_ns)
+                for append, value in zip(value_appends, row):
+                    append(value)
+
+    return columns
+
+
+class _CSVWriter:
+    """Writes one CSV file per category, columns with several items are flattened."""
+
+    def __init__(self, output_dir: Path, categories: Sequence[str]) -> None:
+        self.paths = {
+            category: output_dir / f"{category.lower()}.csv" for category in categories
+        }
+        self._files = {}
+        self._writers = {}
+        for category, path in self.paths.items():
+            file = open(path, "w", newline="", encoding="utf-8")
+            self._files[category] = file
+            self._writers[category] = csv.writer(file)
+            header = []
+            for name, (_, items) in _COLUMNS[category].items():
+                if items == 1:
+                    header.append(name)
+                else:
+                    header.extend(f"{name}_{i}" for i in range(items))
+            self._writers[category].writerow(header)
+
+    def write(self, category: str, columns: dict[str, list]) -> None:
+        flat_columns: list[Iterable] = []
+        for name, values in columns.items():
+            if _COLUMNS[category][name][1] == 1:
+                flat_columns.append(values)
+            else:
+                flat_columns.extend(zip(*values))
+        self._writers[category].writerows(zip(*flat_columns))
+
+    def close(self) -> None:
+        for file in self._files.values():
+            file.close()
+
+
+class _NPZWriter:
+    """
+    Writes one `.npz` archive per category.
+
+    Chunks are spooled to temporary `.npy` files per column and streamed into the
+    archives on `close`, so only one chunk has to fit into memory.
+    """
+
+    def __init__(self, output_dir: Path, categories: Sequence[str]) -> None:
+        if np is None:
+            raise ImportError(
+                "NumPy is required for the npz export, "
+                "install it with `pip install cri_lib[numpy]` or export to csv."
+            )
+        self.paths = {
+            category: output_dir / f"{category.lower()}.npz" for category in categories
+        }
+        self._spool = tempfile.TemporaryDirectory(dir=output_dir)
+        self._chunks: dict[str, int] = {category: 0 for category in categories}
+        self._rows: dict[str, int] = {category: 0 for category in categories}
+        self._string_sizes: dict[tuple[str, str], int] = {}
+        """maximum length of every string column"""
+
+    def _spool_path(self, category: str, name: str) -> str:
+        return os.path.join(self._spool.name, f"{category}.{name}.npy")
+
+    def write(self, category: str, columns: dict[str, list]) -> None:
+        for name, values in columns.items():
+            dtype, items = _COLUMNS[category][name]
+            if dtype == "U":
+                array = np.asarray(values, dtype=str)
+                key = (category, name)
+                self._string_sizes[key] = max(
+                    self._string_sizes.get(key, 1), array.dtype.itemsize // 4
+                )
+            else:
+                array = np.asarray(values, dtype=dtype)
+            if items > 1:
+                array = array.reshape(-1, items)
+            with open(self._spool_path(category, name), "ab") as spool:
+                np.save(spool, array)
+        self._chunks[category] += 1
+        self._rows[category] += len(columns["time_ns"])
+
+    def close(self) -> None:
+        try:
+            for category, path in self.paths.items():
+                with zipfile.ZipFile(path, "w", allowZip64=True) as archive:
+                    for name, (dtype, items) in _COLUMNS[category].items():
+                        self._write_column(archive, category, name, dtype, items)
+        finally:
+            self._spool.cleanup()
+
+    def _write_column(
+        self,
+        archive: zipfile.ZipFile,
+        category: str,
+        name: str,
+        dtype: str,
+        items: int,
+    ) -> None:
+        if dtype == "U":
+            dtype = f"<U{self._string_sizes.get((category, name), 1)}"
+        shape = (self._rows[category],) if items == 1 else (self._rows[category], items)
+        header = {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+            "fortran_order": False,
+            "shape": shape,
+        }
+        with archive.open(f"{name}.npy", "w", force_zip64=True) as entry:
+            np.lib.format.write_array_header_2_0(entry, header)
+            if not self._chunks[category]:
+                return
+            with open(self._spool_path(category, name), "rb") as spool:
+                for _ in range(self._chunks[category]):
+                    entry.write(np.load(spool).astype(dtype, copy=False).tobytes())
+
+
+def _ordered_results(
+    executor: ProcessPoolExecutor,
+    function: Callable[..., Any],
+    tasks: Iterable[tuple],
+    window: int,
+) -> Iterator[Any]:
+    """
+    Yields the results of the tasks in order, with at most `window` tasks submitted.
+
+    Unlike ``Executor.map`` this bounds the memory used by results which were computed
+    before they are consumed.
+    """
+    pending: deque[Future] = deque()
+    for task in tasks:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(function, *task))
+    while pending:
+        yield pending.popleft().result()
+
+
+def export_recording(
+    path: str | os.PathLike,
+    output_dir: str | os.PathLike,
+    format: ExportFormat = "npz",
+    categories: Sequence[str] = CATEGORIES,
+    max_workers: int | None = None,
+    chunk_blocks: int = 16,
+) -> dict[str, Path]:
+    """
+    Parses a recording of ``CRIRecorder`` to columnar files per message category.
+
+    The recorded blocks are split into chunks of `chunk_blocks` blocks, which are parsed
+    by a pool of processes with a ``CRIProtocolParser`` each. Every received message
+    of an exported category becomes a row (VARIABLES messages one row per variable)
+    with the fields of the robot state after the message, `time_ns` is the receive
+    time in ns since epoch.
+
+    Since the axis mapping of STATUS messages depends on the last `CONFIG Axes`
+    message, the chunks are scanned for these messages before parsing. All other
+    fields start from their defaults in every chunk, which only matters for STATUS
+    messages not containing all segments.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        path of the recording
+    output_dir : str | os.PathLike
+        directory of the output files `<category>.npz` or `<category>.csv`, created if
+        it does not exist
+    format : ExportFormat
+        `npz` for NumPy archives with one array per column (requires NumPy) or `csv`,
+        where columns with several items (e.g. `joints_current`) are flattened to
+        `<name>_<index>`
+    categories : Sequence[str]
+        categories to export, see `CATEGORIES`
+    max_workers : int | None
+        number of processes, number of CPUs if `None`
+    chunk_blocks : int
+        number of blocks parsed per task
+
+    Returns
+    -------
+    dict[str, Path]
+        path of the output file per category
+
+    Raises
+    ------
+    ValueError
+        raised if a category or format is not supported
+    ImportError
+        raised if `format` is `npz` and NumPy is not installed
+    """
+    if unknown := set(categories) - set(CATEGORIES):
+        raise ValueError(f"Categories {sorted(unknown)} can not be exported.")
+    if chunk_blocks < 1:
+        raise ValueError("chunk_blocks must be positive")
+
+    path = os.fspath(path)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    writer: _CSVWriter | _NPZWriter
+    match format:
+        case "npz":
+            writer = _NPZWriter(output_dir, categories)
+        case "csv":
+            writer = _CSVWriter(output_dir, categories)
+        case _:
+            raise ValueError(f"Unsupported export format {format}.")
+
+    with CRIRecordReader(path) as reader:
+        blocks = reader.blocks
+    chunks = [
+        blocks[start : start + chunk_blocks]
+        for start in range(0, len(blocks), chunk_blocks)
+    ]
+    max_workers = max_workers or os.cpu_count() or 1
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers, initializer=_init_worker, initargs=(path,)
+        ) as executor:
+            axes_messages: list[str | None] = [None]
+            if "STATUS" in categories and len(chunks) > 1:
+                for message in executor.map(_scan_axes, chunks[:-1]):
+                    axes_messages.append(message or axes_messages[-1])
+
+            tasks = (
+                (chunk, axes_messages[min(i, len(axes_messages) - 1)], categories)
+                for i, chunk in enumerate(chunks)
+            )
+            for columns in _ordered_results(
+                executor, _parse_chunk, tasks, window=2 * max_workers
+            ):
+                for category, category_columns in columns.items():
+                    writer.write(category, category_columns)
+    finally:
+        writer.close()
+
+    logger.info("Exported %d blocks of %s to %s.", len(blocks), path, output_dir)
+    return writer.paths
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Export a CRI recording to columnar files per message category."
+    )
+    parser.add_argument("recording", help="path of the recording")
+    parser.add_argument("output_dir", help="directory of the output files")
+    parser.add_argument("--format", choices=("npz", "csv"), default="npz")
+    parser.add_argument(
+        "--categories", nargs="+", choices=CATEGORIES, default=list(CATEGORIES)
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-blocks", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    paths = export_recording(
+        args.recording,
+        args.output_dir,
+        args.format,
+        args.categories,
+        args.workers,
+        args.chunk_blocks,
+    )
+    for path in paths.values():
+        print(path)
@@ -0,0 +1,162 @@
+import concurrent.futures
+import threading
+from dataclasses import dataclass
+from time import monotonic
+
+
+@dataclass(slots=True)
+class _Listing:
+    files: tuple[str, ...]
+    received: float
+
+
+class FileListCache:
+    """
+    Per-directory cache of the file listings of a robot controller.
+
+    Listings are reused for `ttl` seconds. Concurrent requests for the same directory
+    are deduplicated: the first caller becomes the owner of the request (see
+    ``begin``), the others wait for its future. ``invalidate`` drops a listing, e.g.
+    when a file is uploaded into the directory; a request which is in flight at that
+    time still resolves its waiters, but its listing is not cached.
+    """
+
+    DEFAULT_TTL = 10.0
+
+    def __init__(self, ttl: float = DEFAULT_TTL) -> None:
+        """
+        Create an empty cache.
+
+        Parameters
+        ----------
+        ttl : float
+            time in seconds a listing is reused
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._listings: dict[str, _Listing] = {}
+        self._in_flight: dict[str, concurrent.futures.Future] = {}
+        self._generations: dict[str, int] = {}
+        """number of invalidations per directory, to discard outdated listings"""
+        self._requested: tuple[str, int] | None = None
+        """directory and generation of the request waiting for a `FileList` message"""
+        self._received: list[str] | None = None
+
+    def get(self, directory: str, max_age: float | None = None) -> list[str] | None:
+        """
+        Returns a cached listing.
+
+        Parameters
+        ----------
+        directory : str
+            directory relative to `/Data`
+        max_age : float | None
+            maximum age of the listing in seconds, `ttl` if `None`
+
+        Returns
+        -------
+        list[str] | None
+            copy of the listing or `None` if there is no listing young enough
+        """
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            listing = self._listings.get(directory)
+            if listing is None or monotonic() - listing.received > max_age:
+                return None
+            return list(listing.files)
+
+    def begin(self, directory: str) -> tuple[concurrent.futures.Future, bool]:
+        """
+        Joins the request in flight for a directory or starts a new one.
+
+        Parameters
+        ----------
+        directory : str
+            directory relative to `/Data`
+
+        Returns
+        -------
+        tuple[concurrent.futures.Future, bool]
+            future resolved with a tuple of the files or `None` if the request failed,
+            and whether the caller owns the request and has to ``finish`` it
+        """
+        with self._lock:
+            if (future := self._in_flight.get(directory)) is not None:
+                return future, False
+            future = self._in_flight[directory] = concurrent.futures.Future()
+            return future, True
+
+    def expect(self, directory: str) -> None:
+        """Marks the `FileList` message received next as listing of `directory`."""
+        with self._lock:
+            self._requested = (directory, self._generations.get(directory, 0))
+            self._received = None
+
+    def receive(self, directory: str, files: list[str]) -> None:
+        """
+        Stores a received listing, called by the receive path of a client.
+
+        Parameters
+        ----------
+        directory : str
+            directory of the `FileList` message, used if no request is expected
+        files : list[str]
+            names of the files
+        """
+        with self._lock:
+            generation = self._generations.get(directory, 0)
+            if self._requested is not None:
+                directory, generation = self._requested
+                self._requested = None
+                self._received = files
+            if generation == self._generations.get(directory, 0):
+                self._listings[directory] = _Listing(tuple(files), monotonic())
+
+    def finish(
+        self, directory: str, future: concurrent.futures.Future, success: bool
+    ) -> list[str] | None:
+        """
+        Ends a request started with ``begin`` and resolves its waiters.
+
+        Parameters
+        ----------
+        directory : str
+            directory relative to `/Data`
+        future : concurrent.futures.Future
+            future returned by ``begin``
+        success : bool
+            whether the request was answered without error
+
+        Returns
+        -------
+        list[str] | None
+            the received listing or `None` if the request failed
+        """
+        with self._lock:
+            files = self._received if success else None
+            self._requested = None
+            self._received = None
+            if self._in_flight.get(directory) is future:
+                del self._in_flight[directory]
+        if files is None:
+            future.set_result(None)
+            return None
+        future.set_result(tuple(files))
+        return list(files)
+
+    def invalidate(self, directory: str | None = None) -> None:
+        """
+        Drops the listing of a directory or of all directories.
+
+        Parameters
+        ----------
+        directory : str | None
+            directory relative to `/Data`, all directories if `None`
+        """
+        with self._lock:
+            directories = list(self._listings) if directory is None else [directory]
+            if self._requested is not None and directory is None:
+                directories.append(self._requested[0])
+            for name in directories:
+                self._listings.pop(name, None)
+                self._generations[name] = self._generations.get(name, 0) + 1
@@ -0,0 +1,196 @@
+from typing import Protocol
+
+FRAME_START = b"CRISTART"
+"""Marker at the beginning of every CRI message."""
+FRAME_END = b"CRIEND"
+"""Marker at the end of every CRI message."""
+_FRAME_END_LEN = len(FRAME_END)
+
+
+class SupportsRecvInto(Protocol):
+    """Source of received data like ``socket.socket``."""
+
+    def recv_into(self, buffer: memoryview, /) -> int: ...
+
+
+class CRIFrameScanner:
+    """Incremental scanner splitting the received byte stream into CRI frames.
+
+    Data is received directly into a preallocated buffer via ``recv_into`` (or
+    ``get_buffer``/``buffer_updated``, which matches ``asyncio.BufferedProtocol``).
+    A scan cursor remembers up to where the buffer was already searched for
+    `CRIEND`, so a read without a complete frame costs only a search of the new
+    bytes, independent of how many reads a frame spans. All frames completed by a
+    read are split off in one ``bytearray.split`` instead of one search per frame.
+
+    Each frame is handed out as a ``bytearray`` which stays valid after the next
+    read and can be decoded with ``bytearray.decode``, which is faster than
+    decoding a ``memoryview`` slice. Unconsumed bytes are moved to the front of the
+    buffer only if the free space at its end is too small for
+    the next read.
+    """
+
+    DEFAULT_CAPACITY = 65536
+    MIN_READ_SIZE = 4096
+
+    def __init__(
+        self, capacity: int = DEFAULT_CAPACITY, min_read_size: int = MIN_READ_SIZE
+    ) -> None:
+        """Create a scanner with an empty receive buffer.
+
+        Parameters
+        ----------
+        capacity : int
+            initial size of the receive buffer in bytes, grows if a single frame does not fit
+        min_read_size : int
+            minimum number of free bytes offered for a single read
+        """
+        self.min_read_size = min_read_size
+        self._buffer = bytearray(max(capacity, min_read_size))
+        self._view = memoryview(self._buffer)
+        self._read_pos = 0
+        """Start of bytes not yet consumed as frame."""
+        self._write_pos = 0
+        """End of received bytes."""
+        self._scan_pos = 0
+        """Position up to which the buffer was searched for `CRIEND`."""
+
+    @property
+    def capacity(self) -> int:
+        """Current size of the receive buffer in bytes."""
+        return len(self._buffer)
+
+    @property
+    def pending_bytes(self) -> int:
+        """Number of received bytes not yet handed out as frame."""
+        return self._write_pos - self._read_pos
+
+    def get_buffer(self, sizehint: int = -1) -> memoryview:
+        """Returns a writable view of the free space at the end of the buffer.
+
+        Parameters
+        ----------
+        sizehint : int
+            minimum number of free bytes requested, values below `min_read_size` are ignored
+
+        Returns
+        -------
+        memoryview
+            view into which received data has to be written,
+            call ``buffer_updated`` afterwards with the number of bytes written
+        """
+        if self._read_pos == self._write_pos:
+            # everything consumed, restart at the front for free
+            self._read_pos = self._write_pos = self._scan_pos = 0
+
+        min_size = max(sizehint, self.min_read_size)
+        if len(self._buffer) - self._write_pos < min_size:
+            self._compact(min_size)
+
+        return self._view[self._write_pos :]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        """Marks `nbytes` bytes in the view returned by ``get_buffer`` as received.
+
+        Parameters
+        ----------
+        nbytes : int
+            number of bytes written into the buffer
+        """
+        self._write_pos += nbytes
+
+    def recv_into(self, sock: SupportsRecvInto) -> int:
+        """Receives data from the socket directly into the buffer.
+
+        Parameters
+        ----------
+        sock : SupportsRecvInto
+            connected socket to receive from, e.g. ``socket.socket``
+
+        Returns
+        -------
+        int
+            number of received bytes, 0 if the connection was closed by the peer
+        """
+        # ``get_buffer`` and ``buffer_updated`` inlined, this runs once per read
+        if self._read_pos == self._write_pos:
+            # everything consumed, the whole buffer is offered without slicing a view
+            self._read_pos = self._scan_pos = 0
+            self._write_pos = nbytes = sock.recv_into(self._view)
+            return nbytes
+
+        if len(self._buffer) - self._write_pos < self.min_read_size:
+            self._compact(self.min_read_size)
+        nbytes = sock.recv_into(self._view[self._write_pos :])
+        self._write_pos += nbytes
+        return nbytes
+
+    def feed(self, data: bytes | bytearray | memoryview) -> None:
+        """Copies already received data into the buffer.
+
+        Parameters
+        ----------
+        data : bytes-like
+            received data
+        """
+        nbytes = len(data)
+        self.get_buffer(nbytes)[:nbytes] = data
+        self.buffer_updated(nbytes)
+
+    def frames(self) -> list[bytearray]:
+        """Takes all complete frames received so far out of the buffer.
+
+        Returns
+        -------
+        list[bytearray]
+            frames from `CRISTART` to `CRIEND` (both included) in order of reception
+        """
+        write_pos = self._write_pos
+        # only the bytes received since the last call can complete a frame
+        end_idx = self._buffer.rfind(FRAME_END, self._scan_pos, write_pos)
+        if end_idx == -1:
+            # the end marker might be split between two reads,
+            # so its possible beginning is searched again next time
+            self._scan_pos = max(self._scan_pos, write_pos - _FRAME_END_LEN + 1)
+            return []
+
+        end_idx += _FRAME_END_LEN
+        # all complete frames are split in one pass instead of searching frame by
+        # frame, the piece after the last end marker is empty
+        pieces = self._buffer[self._read_pos : end_idx].split(FRAME_END)
+        del pieces[-1]
+        self._read_pos = self._scan_pos = end_idx
+
+        frames = []
+        for piece in pieces:
+            start_idx = piece.find(FRAME_START)
+            # bytes without a start marker are dropped
+            if start_idx == -1:
+                continue
+            if start_idx:
+                del piece[:start_idx]
+            piece += FRAME_END
+            frames.append(piece)
+        return frames
+
+    def _compact(self, min_size: int) -> None:
+        """Moves unconsumed bytes to the front of the buffer, grows it if necessary.
+
+        Parameters
+        ----------
+        min_size : int
+            number of bytes which must be free after compaction
+        """
+        pending = self._write_pos - self._read_pos
+        if len(self._buffer) - pending < min_size:
+            new_buffer = bytearray(max(2 * len(self._buffer), pending + min_size))
+            new_buffer[:pending] = self._view[self._read_pos : self._write_pos]
+            self._buffer = new_buffer
+            self._view = memoryview(new_buffer)
+        elif pending:
+            # source and destination might overlap
+            self._buffer[:pending] = bytes(self._view[self._read_pos : self._write_pos])
+
+        self._scan_pos -= self._read_pos
+        self._read_pos = 0
+        self._write_pos = pending
@@ -0,0 +1,221 @@
+import logging
+import threading
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import TYPE_CHECKING, Literal
+
+from .cri_errors import CRICommandTimeOutError
+
+if TYPE_CHECKING:
+    from .cri_controller import CRIController
+
+logger = logging.getLogger(__name__)
+
+MoveKind = Literal["Joint", "RelativeJoint", "Cart", "RelativeBase", "RelativeTool"]
+
+
+def move_command(
+    kind: MoveKind,
+    target: Sequence[float],
+    velocity: float,
+    frame: str = "#base",
+    acceleration: float | None = None,
+) -> str:
+    """
+    Builds a `CMD Move` command, used by the move methods of the controllers and by
+    ``Waypoint``.
+
+    Parameters
+    ----------
+    kind : MoveKind
+        type of the move
+    target : Sequence[float]
+        6 to 9 target values, missing external axes E1-E3 are `0.0`
+    velocity : float
+        percent of maximum velocity for joint moves, mm/s for cartesian moves
+    frame : str
+        frame of cartesian coordinates, ignored for joint moves
+    acceleration : float | None
+        optional acceleration in percent of the maximum acceleration, ignored if
+        outside of 0-100
+
+    Returns
+    -------
+    str
+        the command without `CRISTART`, counter and `CRIEND`
+
+    Raises
+    ------
+    ValueError
+        if there are less than 6 or more than 9 target values
+    """
+    if not 6 <= len(target) <= 9:
+        raise ValueError("A move needs 6 to 9 target values")
+    values = " ".join(str(value) for value in target)
+    values += " 0.0" * (9 - len(target))
+
+    command = f"CMD Move {kind} {values} {velocity}"
+    if kind not in ("Joint", "RelativeJoint"):
+        command = f"{command} {frame}"
+    if acceleration is not None and 0.0 <= acceleration <= 100.0:
+        command = f"{command} {acceleration}"
+    return command
+
+
+@dataclass(slots=True)
+class Waypoint:
+    """Target of one move of a path, see ``CRIController.execute_path``."""
+
+    target: Sequence[float]
+    """6 to 9 values: axes A1-A6 for joint moves or X, Y, Z, A, B, C for cartesian
+    moves, followed by the external axes E1-E3 (default `0.0`)"""
+    velocity: float
+    """percent of maximum velocity for joint moves, mm/s for cartesian moves"""
+    kind: MoveKind = "Cart"
+    """type of the move as in the `CMD Move` command"""
+    frame: str = "#base"
+    """frame of cartesian coordinates"""
+    acceleration: float | None = None
+    """optional acceleration in percent of the maximum acceleration"""
+
+    def command(self) -> str:
+        """Returns the `CMD Move` command of the waypoint."""
+        return move_command(
+            self.kind, self.target, self.velocity, self.frame, self.acceleration
+        )
+
+
+@dataclass(slots=True)
+class PathSegment:
+    """Timing of one move of a path, times are ``time.monotonic`` seconds."""
+
+    waypoint: Waypoint
+    sent: float
+    """time the move command was sent"""
+    acknowledged: float
+    """time the move command was acknowledged"""
+    finished: float | None = None
+    """time the `EXECEND` of the move was received"""
+    duration: float | None = None
+    """execution time, from the end of the previous move (or sending the command if
+    later) until the end of the move"""
+
+
+@dataclass(slots=True)
+class PathResult:
+    """Result of ``CRIController.execute_path``."""
+
+    segments: list[PathSegment] = field(default_factory=list)
+    """all moves sent to the robot controller in path order"""
+    completed: int = 0
+    """number of moves finished without error"""
+    error: str | None = None
+    """error message of a rejected (`CMDERROR`) or failed (`EXECERROR`) move"""
+    total_time: float = 0.0
+    """time in seconds from sending the first move until the end of the last"""
+
+    @property
+    def success(self) -> bool:
+        """`True` if all moves finished without error."""
+        return self.error is None and self.completed == len(self.segments)
+
+
+def execute_path(
+    controller: "CRIController",
+    waypoints: Iterable[Waypoint],
+    lookahead: int,
+    move_finished_timeout: float | None,
+) -> PathResult:
+    """Executes moves keeping `lookahead` moves queued, see ``execute_path`` of
+    ``CRIController``."""
+    if lookahead < 1:
+        raise ValueError("lookahead must be positive")
+
+    condition = threading.Condition()
+    finished: list[tuple[float, str | None]] = []
+
+    def on_execend(error: str | None) -> None:
+        with condition:
+            finished.append((monotonic(), error))
+            condition.notify_all()
+
+    with controller._execend_listener_lock:
+        if controller._execend_listener is not None:
+            raise RuntimeError("Another path is already executed.")
+        controller._execend_listener = on_execend
+
+    result = PathResult()
+    segments = result.segments
+    remaining = iter(waypoints)
+    exhausted = False
+    # end of the last finished move, a move starts executing after it
+    previous_finished = 0.0
+    t_start = monotonic()
+    try:
+        while True:
+            # keep the queue of the robot controller filled
+            while (
+                not exhausted
+                and result.error is None
+                and len(segments) - result.completed < lookahead
+            ):
+                if (waypoint := next(remaining, None)) is None:
+                    exhausted = True
+                    break
+                sent = monotonic()
+                msg_id = controller._send_command(waypoint.command(), True)
+                if (
+                    error := controller._wait_for_answer(
+                        msg_id, controller.MOVE_ANSWER_TIMEOUT
+                    )
+                ) is not None:
+                    logger.debug("Error in move %d of path: %s", len(segments), error)
+                    result.error = error
+                    break
+                segments.append(PathSegment(waypoint, sent, monotonic()))
+
+            if result.error is not None or result.completed == len(segments):
+                break
+
+            with condition:
+                if not condition.wait_for(
+                    lambda: len(finished) > result.completed, move_finished_timeout
+                ):
+                    raise CRICommandTimeOutError(
+                        f"Move {result.completed} of path did not finish."
+                    )
+                new = finished[result.completed : len(segments)]
+
+            for finish_time, error in new:
+                segment = segments[result.completed]
+                segment.finished = finish_time
+                segment.duration = finish_time - max(segment.sent, previous_finished)
+                previous_finished = finish_time
+                if error is not None:
+                    logger.debug(
+                        "Exec error in move %d of path: %s", result.completed, error
+                    )
+                    result.error = error
+                    break
+                result.completed += 1
+    except BaseException:
+        if result.completed < len(segments):
+            _stop(controller)
+        raise
+    finally:
+        controller._execend_listener = None
+
+    if result.error is not None and result.completed < len(segments):
+        _stop(controller)
+    if result.completed and (end := segments[result.completed - 1].finished):
+        result.total_time = end - t_start
+    return result
+
+
+def _stop(controller: "CRIController") -> None:
+    """Stops queued moves after an error, errors of the stop command are logged."""
+    try:
+        controller.stop_move()
+    except Exception:
+        logger.exception("Failed to stop the moves of the path.")
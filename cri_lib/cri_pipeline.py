@@ -0,0 +1,149 @@
+import concurrent.futures
+import threading
+from typing import TYPE_CHECKING
+
+from .cri_errors import CRICommandTimeOutError
+
+if TYPE_CHECKING:
+    from .cri_controller import CRIClient
+
+
+class CommandPipeline:
+    """
+    Sends commands back-to-back without waiting for the answer of the previous one.
+
+    Every submitted command gets a future which is resolved when its `CMDACK`
+    (`None`) or `CMDERROR` (error message) arrives. At most `window` commands are
+    in flight, ``submit`` blocks until an answer arrives if the window is full. Command
+    ids whose answer is still outstanding are never reused by the client, even after
+    its counter wrapped around.
+
+    Usage:
+    ```python
+    with controller.pipeline(window=16) as pipeline:
+        for i in range(50):
+            pipeline.submit(f"CMD DOUT {i} true")
+    errors = [error for error in pipeline.results() if error is not None]
+    ```
+    """
+
+    DEFAULT_WINDOW = 32
+
+    def __init__(
+        self,
+        client: "CRIClient",
+        window: int = DEFAULT_WINDOW,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Create a pipeline sending commands through a client.
+
+        Parameters
+        ----------
+        client : CRIClient
+            connected client
+        window : int
+            maximum number of commands waiting for their answer
+        timeout : float | None
+            maximum time in seconds to wait for space in the window and for all
+            answers in ``wait``, infinite if `None`
+        """
+        if not 0 < window <= client.answers.max_entries:
+            raise ValueError(
+                f"window must be between 1 and {client.answers.max_entries}"
+            )
+
+        self.client = client
+        self.window = window
+        self.timeout = timeout
+        self.futures: list[concurrent.futures.Future] = []
+        """futures of the submitted commands in submission order"""
+        self._slots = threading.BoundedSemaphore(window)
+
+    def __enter__(self) -> "CommandPipeline":
+        return self
+
+    def __exit__(self, exc_type: type | None, *exc_info: object) -> None:
+        if exc_type is None:
+            self.wait()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of submitted commands waiting for their answer."""
+        return sum(not future.done() for future in self.futures)
+
+    def submit(self, command: str) -> concurrent.futures.Future:
+        """
+        Sends a command, blocking only while the in-flight window is full.
+
+        Parameters
+        ----------
+        command : str
+            command without `CRISTART`, counter and `CRIEND`, e.g. `CMD DOUT 3 true`
+
+        Returns
+        -------
+        concurrent.futures.Future
+            future resolved with `None` if the command was acknowledged or the error
+            message of a `CMDERROR`
+
+        Raises
+        ------
+        CRICommandTimeOutError
+            if the window stayed full for `timeout` seconds
+        CRIConnectionError
+            if not connected or the connection was lost
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise CRICommandTimeOutError(
+                f"No answer to any of {self.window} commands in flight."
+            )
+
+        try:
+            msg_id = self.client._send_command(command, True)
+            # registered before sending, so it is in the table even if already answered
+            future = self.client.answers.watch(str(msg_id))
+            if future is None:
+                raise CRICommandTimeOutError(f"Answer {msg_id} expired.")
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        self.futures.append(future)
+        return future
+
+    def wait(self) -> None:
+        """
+        Waits until all submitted commands were answered.
+
+        Raises
+        ------
+        CRICommandTimeOutError
+            if not all answers were received within `timeout` seconds
+        """
+        _, not_done = concurrent.futures.wait(self.futures, self.timeout)
+        if not_done:
+            raise CRICommandTimeOutError(
+                f"{len(not_done)} of {len(self.futures)} commands were not answered."
+            )
+
+    def results(self) -> list[str | None]:
+        """
+        Waits for all answers and returns them.
+
+        Returns
+        -------
+        list[str | None]
+            `None` or the error message for every submitted command in submission
+            order
+
+        Raises
+        ------
+        CRICommandTimeOutError
+            if not all answers were received within `timeout` seconds
+        CRIConnectionError
+            if the connection was lost before all answers were received
+        """
+        self.wait()
+        return [future.result() for future in self.futures]
@@ -1,5 +1,5 @@
+import functools
 import logging
-import threading
 import time
 from threading import Lock
 from typing import Any, Sequence
@@ -23,20 +23,226 @@ from .robot_state import (
 
 logger = logging.getLogger(__name__)
 
+_NO_ERROR_STATES = ErrorStates()
+_BITS_64 = (1 << 64) - 1
+_BITS_128 = (1 << 128) - 1
+
+
+@functools.cache
+def _error_states(value: int) -> ErrorStates:
+    """
+    Returns the (shared, immutable) error states of an axis error bit field.
+
+    Parameters
+    ----------
+    value: int
+        error bits of an axis, only the lower 8 bits are used
+    """
+    return ErrorStates(*[value & (1 << j) != 0 for j in range(8)])
+
+
+def _reorder_axes(
+    parameters: Sequence[str], start_idx: int, axis_targets: tuple[int, ...]
+) -> list[float]:
+    """
+    Decodes the 16 axis values of a STATUS segment into `JointsState` order.
+
+    Parameters
+    ----------
+    parameters: list[str]
+        List of splitted strings between `STATUS` and `CRIEND`
+    start_idx: int
+        index of the first axis value
+    axis_targets: tuple[int, ...]
+        compiled axis map, see ``CRIProtocolParser._compile_axis_map``
+
+    Returns
+    -------
+    list[float]
+        16 values in `JointsState` order, missing axes are 0.0
+    """
+    values = [0.0] * 16
+    for target_idx, value in zip(axis_targets, parameters[start_idx : start_idx + 16]):
+        values[target_idx] = float(value)
+    return values
+
+
+_STATUS_SEGMENTS: dict[str, tuple[int, tuple[str, ...]]] = {
+    "MODE": (2, ("mode",)),
+    "POSJOINTSETPOINT": (17, ("joints_set_point",)),
+    "POSJOINTCURRENT": (17, ("joints_current",)),
+    "POSCARTROBOT": (7, ("position_robot",)),
+    "POSCARTPLATFORM": (4, ("position_platform",)),
+    "POSCARTPLATTFORM": (4, ("position_platform",)),
+    "OVERRIDE": (2, ("override",)),
+    "DIN": (2, ("din_bits",)),
+    "DOUT": (2, ("dout_bits",)),
+    "ESTOP": (2, ("emergency_stop_ok", "main_relay")),
+    "SUPPLY": (2, ("supply_voltage",)),
+    "CURRENTALL": (2, ("current_total",)),
+    "CURRENTJOINTS": (17, ("current_joints",)),
+    "ERROR": (18, ("combined_axes_error", "error_states")),
+    "KINSTATE": (2, ("kinematics_state",)),
+    "OPMODE": (2, ("operation_mode",)),
+    "CARTSPEED": (2, ("cart_speed_mm_per_s",)),
+    "GSIG": (2, ("global_signals_bits",)),
+    "FRAMEROBOT": (8, ("frame_name", "frame_position_current")),
+}
+"""number of entries (including the name) and robot state fields of STATUS segments"""
+
+
+def _decode_status_segment(
+    segment: str,
+    parameters: Sequence[str],
+    idx: int,
+    axis_targets: tuple[int, ...],
+    changes: dict[str, Any],
+) -> None:
+    """
+    Decodes a single segment of a STATUS message.
+
+    Parameters
+    ----------
+    segment: str
+        name of the segment, must be a key of `_STATUS_SEGMENTS`
+    parameters: list[str]
+        List of splitted strings between `STATUS` and `CRIEND`
+    idx: int
+        index of the segment name in `parameters`
+    axis_targets: tuple[int, ...]
+        compiled axis map, see ``CRIProtocolParser._compile_axis_map``
+    changes: dict[str, Any]
+        changes of the robot state, the decoded fields are added
+    """
+    match segment:
+        case "MODE":
+            changes["mode"] = RobotMode(parameters[idx + 1])
+
+        case "POSJOINTSETPOINT":
+            joints = _reorder_axes(parameters, idx + 1, axis_targets)
+            changes["joints_set_point"] = JointsState(*joints)
+
+        case "POSJOINTCURRENT":
+            joints = _reorder_axes(parameters, idx + 1, axis_targets)
+            changes["joints_current"] = JointsState(*joints)
+
+        case "POSCARTROBOT":
+            coords = []
+            for i in range(6):
+                coords.append(float(parameters[idx + 1 + i]))
+
+            changes["position_robot"] = RobotCartesianPosition(*coords)
+
+        case "POSCARTPLATFORM" | "POSCARTPLATTFORM":
+            coords = []
+            for i in range(3):
+                coords.append(float(parameters[idx + 1 + i]))
+
+            changes["position_platform"] = PlatformCartesianPosition(*coords)
+
+        case "OVERRIDE":
+            changes["override"] = float(parameters[idx + 1])
+
+        case "DIN":
+            changes["din_bits"] = int(parameters[idx + 1], base=16) & _BITS_64
+
+        case "DOUT":
+            changes["dout_bits"] = int(parameters[idx + 1], base=16) & _BITS_64
+
+        case "ESTOP":
+            val = int(parameters[idx + 1])
+            changes["emergency_stop_ok"] = val == 1 or val == 3
+            changes["main_relay"] = val == 2 or val == 3
+
+        case "SUPPLY":
+            changes["supply_voltage"] = float(int(parameters[idx + 1])) / 1000.0
+
+        case "CURRENTALL":
+            changes["current_total"] = float(int(parameters[idx + 1])) / 1000.0
+
+        case "CURRENTJOINTS":
+            changes["current_joints"] = [
+                current / 1000
+                for current in _reorder_axes(parameters, idx + 1, axis_targets)
+            ]
+
+        case "ERROR":
+            errors = [_NO_ERROR_STATES] * 16
+            changes["combined_axes_error"] = parameters[idx + 1]
+            for target_idx, value in zip(axis_targets, parameters[idx + 2 : idx + 18]):
+                errors[target_idx] = _error_states(int(value, base=10) & 0xFF)
+
+            changes["error_states"] = errors
+
+        case "KINSTATE":
+            changes["kinematics_state"] = KinematicsState(int(parameters[idx + 1]))
+
+        case "OPMODE":
+            changes["operation_mode"] = OperationMode(int(parameters[idx + 1]))
+
+        case "CARTSPEED":
+            changes["cart_speed_mm_per_s"] = float(parameters[idx + 1])
+
+        case "GSIG":
+            changes["global_signals_bits"] = (
+                int(parameters[idx + 1], base=16) & _BITS_128
+            )
+
+        case "FRAMEROBOT":
+            changes["frame_name"] = parameters[idx + 1]
+            coords = []
+            for i in range(6):
+                coords.append(float(parameters[idx + 2 + i]))
+            changes["frame_position_current"] = RobotCartesianPosition(*coords)
+
+
+class _LazyStatus:
+    """Undecoded STATUS message, see `CRIProtocolParser.lazy_status`."""
+
+    __slots__ = ("parameters", "axis_targets", "offsets")
+
+    def __init__(self, parameters: Sequence[str], axis_targets: tuple[int, ...]):
+        self.parameters = parameters
+        self.axis_targets = axis_targets
+        self.offsets: dict[str, int] = {}
+        """index of the segment in `parameters` per robot state field"""
+
+    def decode(self, name: str) -> dict[str, Any]:
+        """Decodes the segment of a field, returns the values of all its fields."""
+        idx = self.offsets[name]
+        changes: dict[str, Any] = {}
+        _decode_status_segment(
+            self.parameters[idx], self.parameters, idx, self.axis_targets, changes
+        )
+        return changes
+
 
 class CRIProtocolParser:
     """Class handling the parsing of CRI messages to the robot state."""
 
-    def __init__(self, robot_state: RobotState, robot_state_lock: Lock):
+    def __init__(
+        self,
+        robot_state: RobotState,
+        robot_state_lock: Lock,
+        lazy_status: bool = False,
+    ):
         self.robot_state = robot_state
         self.robot_state_lock = robot_state_lock
-        self.file_list: list = []
-        self.file_list_lock: Lock = threading.Lock()
+        self.lazy_status = lazy_status
+        """
+        If `True`, segments of STATUS messages are only decoded when the corresponding
+        field of a robot state is first read. This saves CPU time of the receive thread
+        if only few fields are read, but errors in the message are only detected when
+        reading the affected fields.
+        """
         self.robot_joint_count = 0
 
-    def parse_message(
-        self, message: str
-    ) -> dict[str, str] | dict[str, str | None] | None:
+        self._axis_counts: tuple[int, int, int, int] = (0, 0, 0, 0)
+        """axis counts (robot, external, tool, platform) the axis map was compiled for"""
+        self._axis_targets: tuple[int, ...] = ()
+        """index in `JointsState` order for every axis in order of the STATUS message"""
+
+    def parse_message(self, message: str) -> dict[str, Any] | None:
         """Parses a message to the RobotState of the class.
 
         Parameters
@@ -46,41 +252,44 @@ class CRIProtocolParser:
 
         Returns
         -------
-        None | dict[str, str]
+        None | dict[str, Any]
             None if no Notification in necessary or
             a dict indicating which answer event to notify (key: "answer") and optionally an error message (key: "error")
+            and the content of the message, e.g. the files of a `FileList` message (keys: "directory", "files")
         """
         parts = message.split()
-        cmd_category = parts[2]
-        result: dict[str, str] | dict[str, str | None] | None = None
+        # truncated frames like `CRISTART 1 CRIEND` have no category
+        cmd_category = parts[2] if len(parts) > 3 else "UNKNOWN"
+        result: dict[str, Any] | None = None
+        changes: dict[str, Any] = {}
         match cmd_category:
             case "STATUS":
-                self._parse_status(parts[3:-1])
+                self._parse_status(parts[3:-1], changes)
                 result = {"answer": "status"}
 
             case "RUNSTATE":
-                self._parse_runstate(parts[3:-1])
+                self._parse_runstate(parts[3:-1], changes)
 
             case "CYCLESTAT":
-                self._parse_cyclestat(parts[3:-1])
+                self._parse_cyclestat(parts[3:-1], changes)
 
             case "GRIPPERSTATE":
-                self._parse_gripperstate(parts[3:-1])
+                self._parse_gripperstate(parts[3:-1], changes)
 
             case "VARIABLES":
-                self._parse_variables(parts[3:-1])
+                self._parse_variables(parts[3:-1], changes)
 
             case "OPINFO":
-                self._parse_opinfo(parts[3:-1])
+                self._parse_opinfo(parts[3:-1], changes)
 
             case "CMD":
-                result = {"answer": self._parse_cmd(parts[3:-1])}
+                result = {"answer": self._parse_cmd(parts[3:-1], changes)}
 
             case "MESSAGE":
-                self._parse_message_message(parts[3:-1])
+                self._parse_message_message(parts[3:-1], changes)
 
             case "CONFIG":
-                self._parse_config(parts[3:-1])
+                self._parse_config(parts[3:-1], changes)
 
             case "CANBridge":
                 result = self._parse_can_bridge(parts[3:-1])
@@ -92,7 +301,9 @@ class CRIProtocolParser:
                 result = self._parse_cmderror(parts[3:-1])
 
             case "INFO":
-                if (answer := self._parse_info(parts[3:-1])) is not None:
+                if parts[3] == "FileList":
+                    result = self._parse_file_list(parts[4:-1])
+                elif (answer := self._parse_info(parts[3:-1], changes)) is not None:
                     result = {"answer": answer}
 
             case "EXECEND":
@@ -107,249 +318,177 @@ class CRIProtocolParser:
                     cmd_category,
                     " ".join(parts),
                 )
+        self._publish(cmd_category, changes)
+        return result
+
+    def _publish(self, cmd_category: str, changes: dict[str, Any]) -> None:
+        """
+        Publishes the changes of a message as a new robot state snapshot.
+
+        The changes are applied to a shallow copy of the current robot state, which then
+        replaces it in a single swap. Readers holding a reference to a robot state
+        therefore always see a consistent snapshot, they never observe a partially
+        applied message. Fields which are not changed are shared between snapshots.
+
+        Messages which change no field, e.g. `CMDACK` or a repeated `CYCLESTAT`, are not
+        copied. Only their entry in `category_time_ns` of the current snapshot is
+        updated in place, which is a single store into a dict owned by that snapshot.
+        `STATUS` messages always publish a new snapshot, status updates and the
+        history rely on one snapshot per `STATUS` message.
+
+        Parameters
+        ----------
+        cmd_category: str
+            category of the parsed message
+        changes: dict[str, Any]
+            new values of the changed fields of the robot state
+        """
+        lazy_segments = changes.pop("_pending", None)
+        current = self.robot_state
+        timestamp = time.time_ns()
+
+        # a new category is never added in place, readers might iterate the dict
+        if (
+            cmd_category != "STATUS"
+            and cmd_category in current.category_time_ns
+            and (not changes or self._unchanged(current, changes))
+        ):
+            current.category_time_ns[cmd_category] = timestamp
+            return
+
+        # called directly, the dispatch of copy.copy costs as much as the copy
+        robot_state = current.__copy__()
+        for name, value in changes.items():
+            setattr(robot_state, name, value)
+
+        pending = robot_state._pending
+        if pending:
+            for name in changes:
+                pending.pop(name, None)
+        if lazy_segments is not None:
+            # fields of lazy segments are unset until first read
+            if pending is None:
+                pending = robot_state._pending = {}
+            for name in lazy_segments:
+                if name not in pending:
+                    delattr(robot_state, name)
+            pending.update(lazy_segments)
+
         # Remember per-category timestamps to facilitate age-checks
+        robot_state.category_time_ns = current.category_time_ns | {
+            cmd_category: timestamp
+        }
+
         with self.robot_state_lock:
-            self.robot_state.category_time_ns[cmd_category] = time.time_ns()
-        return result
+            self.robot_state = robot_state
+
+    @staticmethod
+    def _unchanged(robot_state: RobotState, changes: dict[str, Any]) -> bool:
+        """
+        Checks whether all changes equal the current values of the robot state.
 
-    def _parse_status(self, parameters: list[str]) -> None:
+        Parameters
+        ----------
+        robot_state: RobotState
+            current robot state
+        changes: dict[str, Any]
+            new values of the changed fields of the robot state
+
+        Returns
+        -------
+        bool
+            `True` if publishing the changes would not change any field
+        """
+        pending = robot_state._pending
+        for name, value in changes.items():
+            # fields of undecoded STATUS segments are not compared, reading decodes them
+            if pending and name in pending:
+                return False
+            if object.__getattribute__(robot_state, name) != value:
+                return False
+        return True
+
+    def _parse_status(self, parameters: list[str], changes: dict[str, Any]) -> None:
         """
         Parses a state message to the robot state.
 
+        In lazy mode (see `lazy_status`) only the segment offsets are determined, the
+        segments are decoded when their fields are first read.
+
         Parameters
         ----------
         parameters: list[str]
             List of splitted strings between `STATUS` and `CRIEND`
+        changes: dict[str, Any]
+            changes of the robot state to be published
         """
         segment_start_idx = 0
-
-        r_cnt = self.robot_state.robot_axes_count
-        e_cnt = self.robot_state.external_axes_count
-        t_cnt = self.robot_state.tool_axes_count
-        p_cnt = self.robot_state.platform_axes_count
+        axis_targets = self._get_axis_targets()
+        lazy_status = None
+        if self.lazy_status:
+            lazy_status = _LazyStatus(parameters, axis_targets)
 
         while segment_start_idx < len(parameters):
-            match parameters[segment_start_idx]:
-                case "MODE":
-                    with self.robot_state_lock:
-                        self.robot_state.mode = RobotMode(
-                            parameters[segment_start_idx + 1]
-                        )
-                    segment_start_idx += 2
-
-                case "POSJOINTSETPOINT":
-                    joints = [0.0] * 16  # array of 16 elements
-                    for i in range(16):
-                        # external axes follow immediately after the last robot axis
-                        # therefore we need to reorder the entries
-                        if i < self.robot_state.robot_axes_count:  # robot axes
-                            joints[i] = float(parameters[segment_start_idx + 1 + i])
-                        elif i < r_cnt + e_cnt:  # external axes
-                            joints[6 + i - r_cnt] = float(
-                                parameters[segment_start_idx + 1 + i]
-                            )
-                        elif i < r_cnt + e_cnt + t_cnt:  # tool axes
-                            joints[9 + i - r_cnt - e_cnt] = float(
-                                parameters[segment_start_idx + 1 + i]
-                            )
-                        elif i < r_cnt + e_cnt + t_cnt + p_cnt:  # platform axes
-                            joints[12 + i - r_cnt - e_cnt - t_cnt] = float(
-                                parameters[segment_start_idx + 1 + i]
-                            )
-
-                    with self.robot_state_lock:
-                        self.robot_state.joints_set_point = JointsState(*joints)
-                    segment_start_idx += 17
-
-                case "POSJOINTCURRENT":
-                    joints = [0.0] * 16  # array of 16 elements
-                    for i in range(16):
-                        # external axes follow immediately after the last robot axis
-                        # therefore we need to reorder the entries
-                        if i < self.robot_state.robot_axes_count:  # robot axes
-                            joints[i] = float(parameters[segment_start_idx + 1 + i])
-                        elif i < r_cnt + e_cnt:  # external axes
-                            joints[6 + i - r_cnt] = float(
-                                parameters[segment_start_idx + 1 + i]
-                            )
-                        elif i < r_cnt + e_cnt + t_cnt:  # tool axes
-                            joints[9 + i - r_cnt - e_cnt] = float(
-                                parameters[segment_start_idx + 1 + i]
-                            )
-                        elif i < r_cnt + e_cnt + t_cnt + p_cnt:  # platform axes
-                            joints[12 + i - r_cnt - e_cnt - t_cnt] = float(
-                                parameters[segment_start_idx + 1 + i]
-                            )
-
-                    with self.robot_state_lock:
-                        self.robot_state.joints_current = JointsState(*joints)
-                    segment_start_idx += 17
-
-                case "POSCARTROBOT":
-                    coords = []
-                    for i in range(6):
-                        coords.append(float(parameters[segment_start_idx + 1 + i]))
-
-                    with self.robot_state_lock:
-                        self.robot_state.position_robot = RobotCartesianPosition(
-                            *coords
-                        )
-                    segment_start_idx += 7
-
-                case "POSCARTPLATFORM" | "POSCARTPLATTFORM":
-                    coords = []
-                    for i in range(3):
-                        coords.append(float(parameters[segment_start_idx + 1 + i]))
-
-                    with self.robot_state_lock:
-                        self.robot_state.position_platform = PlatformCartesianPosition(
-                            *coords
-                        )
-                    segment_start_idx += 4
-
-                case "OVERRIDE":
-                    with self.robot_state_lock:
-                        self.robot_state.override = float(
-                            parameters[segment_start_idx + 1]
-                        )
-                    segment_start_idx += 2
-
-                case "DIN":
-                    value_int = int(parameters[segment_start_idx + 1], base=16)
-                    with self.robot_state_lock:
-                        for i in range(64):
-                            self.robot_state.din[i] = value_int & (1 << i) != 0
-                    segment_start_idx += 2
-
-                case "DOUT":
-                    value_int = int(parameters[segment_start_idx + 1], base=16)
-                    with self.robot_state_lock:
-                        for i in range(64):
-                            self.robot_state.dout[i] = value_int & (1 << i) != 0
-                    segment_start_idx += 2
-
-                case "ESTOP":
-                    val = int(parameters[segment_start_idx + 1])
-                    with self.robot_state_lock:
-                        self.robot_state.emergency_stop_ok = val == 1 or val == 3
-                        self.robot_state.main_relay = val == 2 or val == 3
-                    segment_start_idx += 2
-
-                case "SUPPLY":
-                    val = int(parameters[segment_start_idx + 1])
-                    with self.robot_state_lock:
-                        self.robot_state.supply_voltage = float(val) / 1000.0
-                    segment_start_idx += 2
-
-                case "CURRENTALL":
-                    val = int(parameters[segment_start_idx + 1])
-                    with self.robot_state_lock:
-                        self.robot_state.current_total = float(val) / 1000.0
-                    segment_start_idx += 2
-
-                case "CURRENTJOINTS":
-                    currents = [0.0] * 16  # array of 16 elements
-                    for i in range(16):
-                        # external axes follow immediately after the last robot axis
-                        # therefore we need to reorder the entries
-                        if i < self.robot_state.robot_axes_count:  # robot axes
-                            currents[i] = (
-                                float(parameters[segment_start_idx + 1 + i]) / 1000
-                            )
-                        elif i < r_cnt + e_cnt:  # external axes
-                            currents[6 + i - r_cnt] = (
-                                float(parameters[segment_start_idx + 1 + i]) / 1000
-                            )
-                        elif i < r_cnt + e_cnt + t_cnt:  # tool axes
-                            currents[9 + i - r_cnt - e_cnt] = (
-                                float(parameters[segment_start_idx + 1 + i]) / 1000
-                            )
-                        elif i < r_cnt + e_cnt + t_cnt + p_cnt:  # platform axes
-                            currents[12 + i - r_cnt - e_cnt - t_cnt] = (
-                                float(parameters[segment_start_idx + 1 + i]) / 1000
-                            )
-
-                    with self.robot_state_lock:
-                        self.robot_state.current_joints = currents
-                    segment_start_idx += 17
-
-                case "ERROR":
-                    errors = [ErrorStates()] * 16
-                    self.robot_state.combined_axes_error = parameters[
-                        segment_start_idx + 1
-                    ]
-                    for i in range(16):
-                        value_int = int(parameters[segment_start_idx + 2 + i], base=10)
-                        error_bits = []
-                        for j in range(8):
-                            error_bits.append(value_int & (1 << j) != 0)
-
-                        # external axes follow immediately after the last robot axis
-                        # therefore we need to reorder the entries
-                        if i < self.robot_state.robot_axes_count:  # robot axes
-                            errors[i] = ErrorStates(*error_bits)
-                        elif i < r_cnt + e_cnt:  # external axes
-                            errors[6 + i - r_cnt] = ErrorStates(*error_bits)
-                        elif i < r_cnt + e_cnt + t_cnt:  # tool axes
-                            errors[9 + i - r_cnt - e_cnt] = ErrorStates(*error_bits)
-                        elif i < r_cnt + e_cnt + t_cnt + p_cnt:  # platform axes
-                            errors[12 + i - r_cnt - e_cnt - t_cnt] = ErrorStates(
-                                *error_bits
-                            )
-
-                    with self.robot_state_lock:
-                        self.robot_state.error_states = errors
-                    segment_start_idx += 18
-
-                case "KINSTATE":
-                    with self.robot_state_lock:
-                        self.robot_state.kinematics_state = KinematicsState(
-                            int(parameters[segment_start_idx + 1])
-                        )
-                    segment_start_idx += 2
-
-                case "OPMODE":
-                    with self.robot_state_lock:
-                        self.robot_state.operation_mode = OperationMode(
-                            int(parameters[segment_start_idx + 1])
-                        )
-                    segment_start_idx += 2
-
-                case "CARTSPEED":
-                    with self.robot_state_lock:
-                        self.robot_state.cart_speed_mm_per_s = float(
-                            parameters[segment_start_idx + 1]
-                        )
-                    segment_start_idx += 2
-
-                case "GSIG":
-                    value_int = int(parameters[segment_start_idx + 1], base=16)
-                    with self.robot_state_lock:
-                        for i in range(128):
-                            self.robot_state.global_signals[i] = (
-                                value_int & (1 << i) != 0
-                            )
-                    segment_start_idx += 2
-
-                case "FRAMEROBOT":
-                    with self.robot_state_lock:
-                        self.robot_state.frame_name = parameters[segment_start_idx + 1]
-                        coords = []
-                        for i in range(6):
-                            coords.append(float(parameters[segment_start_idx + 2 + i]))
-                        self.robot_state.frame_position_current = (
-                            RobotCartesianPosition(*coords)
-                        )
-                    segment_start_idx += 8
-
-                case _:
-                    logger.debug(
-                        "Unknown segment in status message: %s",
-                        parameters[segment_start_idx],
-                    )
-                    segment_start_idx += 1
-
-    def _parse_runstate(self, parameters: list[str]) -> None:
+            segment = parameters[segment_start_idx]
+            if (layout := _STATUS_SEGMENTS.get(segment)) is None:
+                logger.debug("Unknown segment in status message: %s", segment)
+                segment_start_idx += 1
+                continue
+
+            length, fields = layout
+            if lazy_status is not None:
+                for name in fields:
+                    lazy_status.offsets[name] = segment_start_idx
+            else:
+                _decode_status_segment(
+                    segment, parameters, segment_start_idx, axis_targets, changes
+                )
+            segment_start_idx += length
+
+        if lazy_status is not None and lazy_status.offsets:
+            changes["_pending"] = dict.fromkeys(lazy_status.offsets, lazy_status)
+
+    def _compile_axis_map(self, counts: tuple[int, int, int, int]) -> None:
+        """
+        Compiles the mapping of axis values in STATUS messages to their index in `JointsState` order.
+
+        External, tool and platform axes follow immediately after the last robot axis
+        in STATUS messages, therefore the entries have to be reordered. The mapping only
+        changes with the axis configuration, so it is compiled once per `CONFIG Axes`.
+
+        Parameters
+        ----------
+        counts: tuple[int, int, int, int]
+            number of robot, external, tool and platform axes
+        """
+        r_cnt, e_cnt, t_cnt, p_cnt = counts
+
+        targets = (
+            list(range(r_cnt))  # robot axes
+            + [6 + i for i in range(e_cnt)]  # external axes
+            + [9 + i for i in range(t_cnt)]  # tool axes
+            + [12 + i for i in range(p_cnt)]  # platform axes
+        )
+
+        self._axis_counts = counts
+        self._axis_targets = tuple(targets[:16])
+
+    def _get_axis_targets(self) -> tuple[int, ...]:
+        """
+        Returns the compiled axis mapping, recompiling it if the axis counts were changed
+        without a `CONFIG Axes` message.
+        """
+        counts = (
+            self.robot_state.robot_axes_count,
+            self.robot_state.external_axes_count,
+            self.robot_state.tool_axes_count,
+            self.robot_state.platform_axes_count,
+        )
+        if self._axis_counts != counts:
+            self._compile_axis_map(counts)
+        return self._axis_targets
+
+    def _parse_runstate(self, parameters: list[str], changes: dict[str, Any]) -> None:
         """
         Parses a runstate message to the robot state.
 
@@ -357,24 +496,25 @@ class CRIProtocolParser:
         ----------
         parameters: list[str]
             List of splitted strings between `RUNSTATE` and `CRIEND`
+        changes: dict[str, Any]
+            changes of the robot state to be published
         """
-        with self.robot_state_lock:
-            if parameters[0] == "MAIN":
-                self.robot_state.main_main_program = parameters[1]
-                self.robot_state.main_current_program = parameters[2]
-                self.robot_state.main_commands_count = int(parameters[3])
-                self.robot_state.main_current_command = int(parameters[4])
-                self.robot_state.main_runstate = RunState(int(parameters[5]))
-                self.robot_state.main_replay_mode = ReplayMode(int(parameters[6]))
-            elif parameters[0] == "LOGIC":
-                self.robot_state.logic_main_program = parameters[1]
-                self.robot_state.logic_current_program = parameters[2]
-                self.robot_state.logic_commands_count = int(parameters[3])
-                self.robot_state.logic_current_command = int(parameters[4])
-                self.robot_state.logic_runstate = RunState(int(parameters[5]))
-                self.robot_state.logic_replay_mode = ReplayMode(int(parameters[6]))
-
-    def _parse_cyclestat(self, parameters: list[str]) -> None:
+        if parameters[0] == "MAIN":
+            changes["main_main_program"] = parameters[1]
+            changes["main_current_program"] = parameters[2]
+            changes["main_commands_count"] = int(parameters[3])
+            changes["main_current_command"] = int(parameters[4])
+            changes["main_runstate"] = RunState(int(parameters[5]))
+            changes["main_replay_mode"] = ReplayMode(int(parameters[6]))
+        elif parameters[0] == "LOGIC":
+            changes["logic_main_program"] = parameters[1]
+            changes["logic_current_program"] = parameters[2]
+            changes["logic_commands_count"] = int(parameters[3])
+            changes["logic_current_command"] = int(parameters[4])
+            changes["logic_runstate"] = RunState(int(parameters[5]))
+            changes["logic_replay_mode"] = ReplayMode(int(parameters[6]))
+
+    def _parse_cyclestat(self, parameters: list[str], changes: dict[str, Any]) -> None:
         """
         Parses a cyclestat message to the robot state.
 
@@ -382,12 +522,15 @@ class CRIProtocolParser:
         ----------
         parameters: list[str]
             List of splitted strings between `CYCLESTAT` and `CRIEND`
+        changes: dict[str, Any]
+            changes of the robot state to be published
         """
-        with self.robot_state_lock:
-            self.robot_state.cycle_time = float(parameters[0])
-            self.robot_state.workload = float(parameters[1])
+        changes["cycle_time"] = float(parameters[0])
+        changes["workload"] = float(parameters[1])
 
-    def _parse_gripperstate(self, parameters: list[str]) -> None:
+    def _parse_gripperstate(
+        self, parameters: list[str], changes: dict[str, Any]
+    ) -> None:
         """
         Parses a gripperstate message to the robot state.
 
@@ -395,11 +538,14 @@ class CRIProtocolParser:
         ----------
         parameters: list[str]
             List of splitted strings between `GRIPPERSTATE` and `CRIEND`
+        changes: dict[str, Any]
+            changes of the robot state to be published
         """
-        with self.robot_state_lock:
-            self.robot_state.gripper_state = float(parameters[0])
+        changes["gripper_state"] = float(parameters[0])
 
-    def _parse_variables(self, parameters: Sequence[str]) -> None:
+    def _parse_variables(
+        self, parameters: Sequence[str], changes: dict[str, Any]
+    ) -> None:
         """
         Parses a variables message to the robot state.
 
@@ -407,6 +553,8 @@ class CRIProtocolParser:
         ----------
         parameters: list[str]
             List of splitted strings between `VARIABLES` and `CRIEND`
+        changes: dict[str, Any]
+            changes of the robot state to be published
         """
         variables: dict[str, float | PosVariable] = {}
         idx = 0
@@ -427,10 +575,9 @@ class CRIProtocolParser:
                 )
                 idx += 1
 
-        with self.robot_state_lock:
-            self.robot_state.variabels = variables
+        changes["variabels"] = variables
 
-    def _parse_opinfo(self, parameters: Sequence[str]) -> None:
+    def _parse_opinfo(self, parameters: Sequence[str], changes: dict[str, Any]) -> None:
         """
         Parses a opinfo message to the robot state.
 
@@ -438,15 +585,18 @@ class CRIProtocolParser:
         ----------
         parameters: list[str]
             List of splitted strings between `OPINFO` and `CRIEND`
+        changes: dict[str, Any]
+            changes of the robot state to be published
         """
         values = []
         for i in range(7):
             values.append(int(parameters[i]))
 
-        with self.robot_state_lock:
-            self.robot_state.operation_info = OperationInfo(*values)
+        changes["operation_info"] = OperationInfo(*values)
 
-    def _parse_cmd(self, parameters: Sequence[str]) -> str | None:
+    def _parse_cmd(
+        self, parameters: Sequence[str], changes: dict[str, Any]
+    ) -> str | None:
         """
         Parses a cmd message to the robot state.
 
@@ -454,6 +604,8 @@ class CRIProtocolParser:
         ----------
         parameters: list[str]
             List of splitted strings between `CMD` and `CRIEND`
+        changes: dict[str, Any]
+            changes of the robot state to be published
 
         Returns
         -------
@@ -462,19 +614,19 @@ class CRIProtocolParser:
         """
         if parameters[0] == "Active":
             if parameters[1].lower() == "true":
-                with self.robot_state_lock:
-                    self.robot_state.active_control = True
+                changes["active_control"] = True
                 return "Active_true"
             elif parameters[1].lower() == "false":
-                with self.robot_state_lock:
-                    self.robot_state.active_control = False
+                changes["active_control"] = False
                 return "Active_false"
             else:
                 logger.debug("Unknown Active state: %s", parameters[1])
 
         return None
 
-    def _parse_message_message(self, parameters: Sequence[str]) -> None:
+    def _parse_message_message(
+        self, parameters: Sequence[str], changes: dict[str, Any]
+    ) -> None:
         """
         Parses a message message to the robot state.
 
@@ -482,11 +634,12 @@ class CRIProtocolParser:
         ----------
         parameters: list[str]
             List of splitted strings between `MESSAGE` and `CRIEND`
+        changes: dict[str, Any]
+            changes of the robot state to be published
         """
         if parameters[0] == "RobotControl":
             if parameters[1] == "Version":
-                with self.robot_state_lock:
-                    self.robot_state.robot_control_version = parameters[2]
+                changes["robot_control_version"] = parameters[2]
 
         elif (
             parameters[0] == "Configuration:"
@@ -513,13 +666,12 @@ class CRIProtocolParser:
                 else:
                     idx += 1
 
-            with self.robot_state_lock:
-                if config is not None:
-                    self.robot_state.robot_configuration = config
-                if r_type is not None:
-                    self.robot_state.robot_type = r_type
-                if gripper is not None:
-                    self.robot_state.gripper_type = gripper
+            if config is not None:
+                changes["robot_configuration"] = config
+            if r_type is not None:
+                changes["robot_type"] = r_type
+            if gripper is not None:
+                changes["gripper_type"] = gripper
 
         else:
             logger.debug("MESSAGE: %s", " ".join(parameters))
@@ -581,7 +733,7 @@ class CRIProtocolParser:
             },
         }
 
-    def _parse_config(self, parameters: Sequence[str]) -> None:
+    def _parse_config(self, parameters: Sequence[str], changes: dict[str, Any]) -> None:
         """
         Parses a config message to the robot state.
 
@@ -589,46 +741,44 @@ class CRIProtocolParser:
         ----------
         parameters: list[str]
             List of splitted strings between `CONFIG` and `CRIEND`
+        changes: dict[str, Any]
+            changes of the robot state to be published
         """
         if parameters[0] == "ProjectFile":
-            with self.robot_state_lock:
-                self.robot_state.project_file = parameters[1]
+            changes["project_file"] = parameters[1]
 
         if parameters[0] == "Axes":
-            with self.robot_state_lock:
-                self.robot_state.robot_axes_count = 0
-                self.robot_state.external_axes_count = 0
-                self.robot_state.tool_axes_count = 0
-                self.robot_state.platform_axes_count = 0
-
-                # Count axes of each type
-                # Each axis description follows this format: A1 canid posmin posmax velmax
-                # Where A is the axis type and 1 is the index within that type
-                for param in parameters[1:]:
-                    if (
-                        param.startswith("A")
-                        and len(param) == 2
-                        and param[1].isnumeric()
-                    ):
-                        self.robot_state.robot_axes_count += 1
-                    if (
-                        param.startswith("E")
-                        and len(param) == 2
-                        and param[1].isnumeric()
-                    ):
-                        self.robot_state.external_axes_count += 1
-                    if (
-                        param.startswith("T")
-                        and len(param) == 2
-                        and param[1].isnumeric()
-                    ):
-                        self.robot_state.tool_axes_count += 1
-                    if (
-                        param.startswith("P")
-                        and len(param) == 2
-                        and param[1].isnumeric()
-                    ):
-                        self.robot_state.platform_axes_count += 1
+            robot_axes_count = 0
+            external_axes_count = 0
+            tool_axes_count = 0
+            platform_axes_count = 0
+
+            # Count axes of each type
+            # Each axis description follows this format: A1 canid posmin posmax velmax
+            # Where A is the axis type and 1 is the index within that type
+            for param in parameters[1:]:
+                if param.startswith("A") and len(param) == 2 and param[1].isnumeric():
+                    robot_axes_count += 1
+                if param.startswith("E") and len(param) == 2 and param[1].isnumeric():
+                    external_axes_count += 1
+                if param.startswith("T") and len(param) == 2 and param[1].isnumeric():
+                    tool_axes_count += 1
+                if param.startswith("P") and len(param) == 2 and param[1].isnumeric():
+                    platform_axes_count += 1
+
+            changes["robot_axes_count"] = robot_axes_count
+            changes["external_axes_count"] = external_axes_count
+            changes["tool_axes_count"] = tool_axes_count
+            changes["platform_axes_count"] = platform_axes_count
+
+            self._compile_axis_map(
+                (
+                    robot_axes_count,
+                    external_axes_count,
+                    tool_axes_count,
+                    platform_axes_count,
+                )
+            )
 
     def _parse_cmderror(self, parameters: Sequence[str]) -> dict[str, str]:
         """Parses a CMDERROR message to notify calling function
@@ -646,7 +796,7 @@ class CRIProtocolParser:
 
         return {"answer": parameters[0], "error": " ".join(parameters[1:])}
 
-    def _parse_info(self, parameters: list[str]) -> str | None:
+    def _parse_info(self, parameters: list[str], changes: dict[str, Any]) -> str | None:
         """
         Parses a info message to the robot state.
 
@@ -654,6 +804,8 @@ class CRIProtocolParser:
         ----------
         parameters: list[str]
             List of splitted strings between `INFO` and `CRIEND`
+        changes: dict[str, Any]
+            changes of the robot state to be published
         """
         if parameters[0] == "ReferencingInfo":
             # handle bug in RobotControl with missing space before 'Mandatory'
@@ -679,39 +831,49 @@ class CRIProtocolParser:
                 ref_prog_running=bool(parameters[19] == "1"),
             )
 
-            with self.robot_state_lock:
-                self.robot_state.referencing_state = ref_state
+            changes["referencing_state"] = ref_state
 
             return "info_referencing"
 
         elif parameters[0] == "BoardTemp":
             temperatures = [float(param) for param in parameters[1:]]
 
-            with self.robot_state_lock:
-                self.robot_state.board_temps = temperatures
+            changes["board_temps"] = temperatures
 
             return "info_boardtemp"
 
         elif parameters[0] == "MotorTemp":
             temperatures = [float(param) for param in parameters[1:]]
 
-            with self.robot_state_lock:
-                self.robot_state.motor_temps = temperatures
+            changes["motor_temps"] = temperatures
 
             return "info_motortemp"
 
-        elif parameters[0] == "FileList":
-            with self.file_list_lock:
-                self.file_list.clear()  # direct point to parameters[] will break the shared reference
-                self.file_list.extend(
-                    parameters[2:]
-                )  # first element is the target_folder
-                print(self.file_list)
-            return "info_filelist"
-
         else:
             return None
 
+    def _parse_file_list(self, parameters: Sequence[str]) -> dict[str, Any]:
+        """Parses a file list message.
+
+        Parameters
+        ----------
+        parameters: list[str]
+            List of splitted strings between `FileList` and `CRIEND`
+
+        Returns
+        -------
+        dict[str, any]
+            dict with the following keys:
+            - answer: `info_filelist`
+            - directory: directory of the listing
+            - files: list of file names
+        """
+        return {
+            "answer": "info_filelist",
+            "directory": parameters[0] if parameters else "",
+            "files": list(parameters[1:]),
+        }
+
     def _parse_execerror(self, parameters: Sequence[str]) -> dict[str, str]:
         """Parses a EXECERROR message to notify calling function
 
@@ -0,0 +1,444 @@
+import logging
+import lzma
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from bisect import bisect_left
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import BinaryIO, Literal
+
+logger = logging.getLogger(__name__)
+
+Compression = Literal["zlib", "lzma"] | None
+
+_CODECS: dict[Compression, int] = {None: 0, "zlib": 1, "lzma": 2}
+
+_FILE_HEADER = struct.Struct("<8sB7xqq")
+"""magic, codec, wall clock and monotonic start time in ns"""
+_FILE_MAGIC = b"CRIREC01"
+_BLOCK_HEADER = struct.Struct("<4sIIqqI")
+"""marker, raw size, stored size, first and last timestamp, number of frames"""
+_BLOCK_MARKER = b"CRIB"
+_FRAME_HEADER = struct.Struct("<qBI")
+"""monotonic timestamp in ns, direction, size"""
+_INDEX_HEADER = struct.Struct("<8s")
+_INDEX_MAGIC = b"CRIIDX01"
+_INDEX_ENTRY = struct.Struct("<qqQI")
+"""first and last timestamp, file offset of the block, number of frames"""
+
+
+@dataclass(slots=True)
+class RecordedFrame:
+    """A CRI frame read from a recording."""
+
+    timestamp_ns: int
+    """monotonic time in ns when the frame was received or sent"""
+    sent: bool
+    """`True` if the frame was sent to the robot controller, `False` if received"""
+    data: bytes
+    """the frame including `CRISTART` and `CRIEND`"""
+
+
+@dataclass(slots=True)
+class RecordingBlock:
+    """Index entry of a block of frames in a recording."""
+
+    first_timestamp_ns: int
+    last_timestamp_ns: int
+    offset: int
+    """file offset of the block header"""
+    frame_count: int
+
+
+class CRIRecorder:
+    """
+    Records received and sent CRI frames to an append-only segment file.
+
+    Frames are collected in blocks, which are optionally compressed with zlib or lzma
+    and written by a background thread, so recording does not block the receive
+    thread. For every block an entry with its time range and file offset is appended
+    to a sidecar index file (`<path>.idx`), which allows ``CRIRecordReader`` to seek
+    to any point in time without scanning the recording.
+
+    Timestamps are taken from ``time.monotonic_ns``, the file header contains the
+    corresponding wall clock time of the start of the recording.
+    """
+
+    DEFAULT_BLOCK_SIZE = 256 * 1024
+    DEFAULT_FLUSH_INTERVAL_SEC = 1.0
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        compression: Compression = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SEC,
+    ) -> None:
+        """
+        Create a new recording, the file must not exist yet.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            path of the recording, the index is written to `<path>.idx`
+        compression : "zlib" | "lzma" | None
+            compression of the blocks
+        block_size : int
+            uncompressed size in bytes after which a block is written
+        flush_interval : float
+            age in seconds of the first frame of a block after which the block is
+            written, checked whenever a frame is recorded
+        """
+        if compression not in _CODECS:
+            raise ValueError(f"Unknown compression: {compression}")
+
+        self.path = os.fspath(path)
+        self.index_path = self.path + ".idx"
+        self.compression = compression
+        self.block_size = block_size
+        self.flush_interval = flush_interval
+
+        self._file: BinaryIO = open(self.path, "xb")
+        self._index: BinaryIO = open(self.index_path, "wb")
+        self._file.write(
+            _FILE_HEADER.pack(
+                _FILE_MAGIC, _CODECS[compression], time.time_ns(), time.monotonic_ns()
+            )
+        )
+        self._index.write(_INDEX_HEADER.pack(_INDEX_MAGIC))
+
+        self._lock = threading.Lock()
+        self._block = bytearray()
+        self._block_count = 0
+        self._block_first_ns = 0
+        self._block_last_ns = 0
+        self._block_started = 0.0
+
+        self.frame_count = 0
+        """number of recorded frames"""
+        self.closed = False
+
+        self._queue: queue.Queue[tuple[bytes, int, int, int] | None] = queue.Queue()
+        self._writer = threading.Thread(target=self._bg_writer_thread, daemon=True)
+        self._writer.start()
+
+    def __enter__(self) -> "CRIRecorder":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def record(
+        self,
+        frame: bytes | bytearray | memoryview,
+        sent: bool = False,
+        timestamp_ns: int | None = None,
+    ) -> None:
+        """
+        Records a frame.
+
+        Parameters
+        ----------
+        frame : bytes-like
+            the frame including `CRISTART` and `CRIEND`
+        sent : bool
+            `True` if the frame was sent to the robot controller
+        timestamp_ns : int | None
+            monotonic timestamp in ns, current time if `None`
+        """
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+
+        with self._lock:
+            if self.closed:
+                return
+
+            if self._block_count == 0:
+                self._block_first_ns = timestamp_ns
+                self._block_started = time.monotonic()
+            self._block += _FRAME_HEADER.pack(timestamp_ns, sent, len(frame))
+            self._block += frame
+            self._block_count += 1
+            self._block_last_ns = timestamp_ns
+            self.frame_count += 1
+
+            if (
+                len(self._block) >= self.block_size
+                or time.monotonic() - self._block_started >= self.flush_interval
+            ):
+                self._submit_block()
+
+    def flush(self) -> None:
+        """Writes all recorded frames to the file and waits until they are written."""
+        with self._lock:
+            if self.closed:
+                return
+            self._submit_block()
+        self._queue.join()
+        self._file.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        """Writes all recorded frames and closes the files."""
+        with self._lock:
+            if self.closed:
+                return
+            self._submit_block()
+            self.closed = True
+            self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+        self._index.close()
+
+    def _submit_block(self) -> None:
+        """Hands the current block to the writer thread, must be called with the lock."""
+        if self._block_count == 0:
+            return
+        self._queue.put(
+            (
+                bytes(self._block),
+                self._block_count,
+                self._block_first_ns,
+                self._block_last_ns,
+            )
+        )
+        self._block.clear()
+        self._block_count = 0
+
+    def _bg_writer_thread(self) -> None:
+        """Background thread compressing and writing blocks."""
+        while (block := self._queue.get()) is not None:
+            try:
+                self._write_block(*block)
+            except Exception:
+                logger.exception("Failed to write block of recording %s.", self.path)
+            finally:
+                self._queue.task_done()
+        self._queue.task_done()
+
+    def _write_block(self, raw: bytes, count: int, first_ns: int, last_ns: int) -> None:
+        match self.compression:
+            case "zlib":
+                stored = zlib.compress(raw)
+            case "lzma":
+                stored = lzma.compress(raw)
+            case _:
+                stored = raw
+
+        offset = self._file.tell()
+        self._file.write(
+            _BLOCK_HEADER.pack(
+                _BLOCK_MARKER, len(raw), len(stored), first_ns, last_ns, count
+            )
+        )
+        self._file.write(stored)
+        # the index entry is written after the block, so it never points to missing data
+        self._file.flush()
+        self._index.write(_INDEX_ENTRY.pack(first_ns, last_ns, offset, count))
+        self._index.flush()
+
+
+class CRIRecordReader:
+    """
+    Reads recordings written by ``CRIRecorder``.
+
+    The block index is loaded from the sidecar index file. Blocks not contained in the
+    index (e.g. if the recording process was killed) or a missing index file are
+    recovered by scanning the block headers of the recording.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        """
+        Open a recording.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            path of the recording
+
+        Raises
+        ------
+        ValueError
+            raised if the file is not a CRI recording
+        """
+        self.path = os.fspath(path)
+        self._file: BinaryIO = open(self.path, "rb")
+
+        header = self._file.read(_FILE_HEADER.size)
+        if len(header) < _FILE_HEADER.size:
+            raise ValueError(f"{self.path} is not a CRI recording.")
+        magic, codec, start_time_ns, start_monotonic_ns = _FILE_HEADER.unpack(header)
+        if magic != _FILE_MAGIC:
+            raise ValueError(f"{self.path} is not a CRI recording.")
+
+        codecs = {value: name for name, value in _CODECS.items()}
+        self.compression: Compression = codecs[codec]
+        self.start_time_ns: int = start_time_ns
+        """wall clock time in ns since epoch when the recording was started"""
+        self.start_monotonic_ns: int = start_monotonic_ns
+        """monotonic time in ns when the recording was started"""
+
+        self.blocks: list[RecordingBlock] = self._load_index()
+        self._last_timestamps = [block.last_timestamp_ns for block in self.blocks]
+
+    def __enter__(self) -> "CRIRecordReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+    @property
+    def frame_count(self) -> int:
+        """Number of frames in the recording."""
+        return sum(block.frame_count for block in self.blocks)
+
+    def to_monotonic_ns(self, wall_time_ns: int) -> int:
+        """
+        Converts a wall clock time to the monotonic timestamps of the recording.
+
+        Parameters
+        ----------
+        wall_time_ns : int
+            wall clock time in ns since epoch
+
+        Returns
+        -------
+        int
+            corresponding monotonic timestamp in ns
+        """
+        return wall_time_ns - self.start_time_ns + self.start_monotonic_ns
+
+    def to_wall_time_ns(self, timestamp_ns: int) -> int:
+        """
+        Converts a monotonic timestamp of the recording to wall clock time.
+
+        Parameters
+        ----------
+        timestamp_ns : int
+            monotonic timestamp in ns
+
+        Returns
+        -------
+        int
+            corresponding wall clock time in ns since epoch
+        """
+        return timestamp_ns - self.start_monotonic_ns + self.start_time_ns
+
+    def frames(
+        self, start_ns: int | None = None, end_ns: int | None = None
+    ) -> Iterator[RecordedFrame]:
+        """
+        Yields the recorded frames in a time range.
+
+        Only the blocks overlapping the time range are read.
+
+        Parameters
+        ----------
+        start_ns : int | None
+            first monotonic timestamp included, from the beginning if `None`
+        end_ns : int | None
+            first monotonic timestamp excluded, until the end if `None`
+
+        Yields
+        ------
+        RecordedFrame
+            frames in recording order
+        """
+        first_block = 0
+        if start_ns is not None:
+            first_block = bisect_left(self._last_timestamps, start_ns)
+
+        for block in self.blocks[first_block:]:
+            if end_ns is not None and block.first_timestamp_ns >= end_ns:
+                return
+
+            for frame in self.block_frames(block):
+                if end_ns is not None and frame.timestamp_ns >= end_ns:
+                    return
+                if start_ns is None or frame.timestamp_ns >= start_ns:
+                    yield frame
+
+    def block_frames(self, block: RecordingBlock) -> Iterator[RecordedFrame]:
+        """
+        Yields the frames of a single block.
+
+        Parameters
+        ----------
+        block : RecordingBlock
+            block of this recording, see `blocks`
+
+        Yields
+        ------
+        RecordedFrame
+            frames of the block in recording order
+        """
+        raw = self._read_block(block.offset)
+        offset = 0
+        while offset < len(raw):
+            timestamp_ns, sent, size = _FRAME_HEADER.unpack_from(raw, offset)
+            offset += _FRAME_HEADER.size
+            yield RecordedFrame(timestamp_ns, bool(sent), raw[offset : offset + size])
+            offset += size
+
+    def _read_block(self, offset: int) -> bytes:
+        self._file.seek(offset)
+        _, raw_size, stored_size, _, _, _ = _BLOCK_HEADER.unpack(
+            self._file.read(_BLOCK_HEADER.size)
+        )
+        stored = self._file.read(stored_size)
+
+        match self.compression:
+            case "zlib":
+                return zlib.decompress(stored)
+            case "lzma":
+                return lzma.decompress(stored)
+            case _:
+                return stored
+
+    def _load_index(self) -> list[RecordingBlock]:
+        """Loads the index file and scans the recording for blocks missing in it."""
+        blocks = []
+        try:
+            with open(self.path + ".idx", "rb") as index:
+                if index.read(_INDEX_HEADER.size) == _INDEX_HEADER.pack(_INDEX_MAGIC):
+                    data = index.read()
+                    usable = len(data) - len(data) % _INDEX_ENTRY.size
+                    blocks = [
+                        RecordingBlock(*entry)
+                        for entry in _INDEX_ENTRY.iter_unpack(data[:usable])
+                    ]
+        except FileNotFoundError:
+            logger.warning("Index of %s missing, scanning the recording.", self.path)
+
+        # continue after the last indexed block
+        offset = _FILE_HEADER.size
+        if blocks:
+            self._file.seek(blocks[-1].offset)
+            _, _, stored_size, _, _, _ = _BLOCK_HEADER.unpack(
+                self._file.read(_BLOCK_HEADER.size)
+            )
+            offset = blocks[-1].offset + _BLOCK_HEADER.size + stored_size
+
+        file_size = os.fstat(self._file.fileno()).st_size
+        while offset + _BLOCK_HEADER.size <= file_size:
+            self._file.seek(offset)
+            marker, _, stored_size, first_ns, last_ns, count = _BLOCK_HEADER.unpack(
+                self._file.read(_BLOCK_HEADER.size)
+            )
+            if (
+                marker != _BLOCK_MARKER
+                or offset + _BLOCK_HEADER.size + stored_size > file_size
+            ):
+                logger.warning("Truncated block at offset %d of %s.", offset, self.path)
+                break
+            blocks.append(RecordingBlock(first_ns, last_ns, offset, count))
+            offset += _BLOCK_HEADER.size + stored_size
+
+        return blocks
@@ -0,0 +1,579 @@
+import asyncio
+import logging
+import math
+import threading
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from time import monotonic
+
+from .cri_framing import CRIFrameScanner
+from .robot_state import KinematicsState, OperationMode, RunState
+
+logger = logging.getLogger(__name__)
+
+_AXIS_COUNT = 9
+"""number of axes in move and jog commands (A1-A6, E1-E3)"""
+_MOVES = ("Joint", "RelativeJoint", "Cart", "RelativeBase", "RelativeTool")
+
+
+@dataclass(slots=True)
+class _Move:
+    """A queued or running move of the simulated robot."""
+
+    connection: "_SimulatorProtocol"
+    """connection which commanded the move and receives its EXECEND"""
+    cartesian: bool
+    relative: bool
+    target: list[float]
+    """target position, offsets for relative moves until the move is started"""
+    velocity: float
+    """joint velocity in percent or cartesian velocity in mm/s"""
+    start: list[float] = field(default_factory=list)
+    start_time: float = 0.0
+    duration: float = 0.0
+
+
+class _SimulatorProtocol(asyncio.BufferedProtocol):
+    """Connection of a client to a ``CRISimulator``."""
+
+    def __init__(self, simulator: "CRISimulator") -> None:
+        self.simulator = simulator
+        self.scanner = CRIFrameScanner()
+        self.transport: asyncio.Transport | None = None
+        self.message_counter = 0
+        self.can_mode = False
+        self.writing_paused = False
+        self.tasks: list[asyncio.Task] = []
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore
+        self.simulator._connection_made(self)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        for task in self.tasks:
+            task.cancel()
+        self.simulator._connections.discard(self)
+
+    def pause_writing(self) -> None:
+        # cyclic messages are dropped while the client does not keep up
+        self.writing_paused = True
+
+    def resume_writing(self) -> None:
+        self.writing_paused = False
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        return self.scanner.get_buffer(sizehint)
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self.scanner.buffer_updated(nbytes)
+        for frame in self.scanner.frames():
+            message = frame.decode()
+            try:
+                self.simulator._handle_message(self, message)
+            except Exception:
+                logger.exception("Failed to handle message: %s", message)
+
+    def send(self, message: str) -> None:
+        """Sends a message without `CRISTART`, counter and `CRIEND`."""
+        if self.transport is None or self.transport.is_closing():
+            return
+        self.message_counter = self.message_counter % 9999 + 1
+        self.transport.write(
+            f"CRISTART {self.message_counter} {message} CRIEND".encode()
+        )
+
+
+class CRISimulator:
+    """
+    Local stand-in for the CRI interface of an igus Robot Control.
+
+    The simulator is a pure Python asyncio TCP server. Every connected client receives
+    STATUS, RUNSTATE and CYCLESTAT messages at the configured rates. `CMD` messages are
+    answered with `CMDACK` (or `CMDERROR` for unknown commands and errors configured
+    in `command_errors`), moves are interpolated and finished with `EXECEND` after
+    their simulated duration, `CONFIG GetAxes` is answered with the configured axes,
+    the hello message with the version and project file and CAN bridge messages are
+    echoed. This allows testing and benchmarking clients end
+    to end without hardware, it does not simulate kinematics: joint and cartesian
+    moves only interpolate the joint and cartesian position respectively.
+
+    The server can run in an existing event loop (``start``/``stop`` or
+    ``async with``) or in a background thread (``start_in_thread``/``stop_in_thread``)
+    for synchronous clients.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        status_rate: float = 100.0,
+        runstate_rate: float = 10.0,
+        cyclestat_rate: float = 1.0,
+        axes: tuple[str, ...] = ("A1", "A2", "A3", "A4", "A5", "A6"),
+        joint_speed: float = 90.0,
+        time_scale: float = 1.0,
+        can_echo: bool = True,
+        project_file: str = "Simulator.prj",
+    ) -> None:
+        """
+        Create a simulator without starting it yet.
+
+        Parameters
+        ----------
+        host : str
+            address to listen on
+        port : int
+            port to listen on, `0` selects a free port (see `port` after starting)
+        status_rate : float
+            STATUS messages per second and client, `0` disables them
+        runstate_rate : float
+            RUNSTATE messages (MAIN and LOGIC) per second and client, `0` disables them
+        cyclestat_rate : float
+            CYCLESTAT messages per second and client, `0` disables them
+        axes : tuple[str, ...]
+            configured axes reported by `CONFIG Axes`, e.g. `("A1", ..., "A6", "E1")`
+        joint_speed : float
+            joint speed at 100% velocity and override in degree per second, also the
+            jog speed at 100%
+        time_scale : float
+            factor applied to the duration of moves, `0` finishes moves immediately
+        can_echo : bool
+            if `True` CAN messages received in CAN bridge mode are sent back
+        project_file : str
+            project file reported with `CONFIG ProjectFile` after the hello message
+        """
+        self.host = host
+        self.port = port
+        self.status_rate = status_rate
+        self.runstate_rate = runstate_rate
+        self.cyclestat_rate = cyclestat_rate
+        self.axes = axes
+        self.joint_speed = joint_speed
+        self.time_scale = time_scale
+        self.can_echo = can_echo
+        self.project_file = project_file
+
+        self.command_errors: dict[str, str] = {}
+        """
+        error messages of commands answered with `CMDERROR` by command name, e.g.
+        `{"Enable": "Emergency stop"}`
+        """
+        self.files: dict[str, list[str]] = {}
+        """uploaded files by path, e.g. `Programs/test.xml`"""
+
+        self.joints = [0.0] * _AXIS_COUNT
+        self.position = [300.0, 0.0, 400.0, 0.0, 90.0, 0.0]
+        self.enabled = False
+        self.override = 100.0
+        self.din_bits = 0
+        self.dout_bits = 0
+        self.global_signals_bits = 0
+        self.main_program = ""
+        self.logic_program = ""
+        self.main_runstate = RunState.STOPPED
+        self.logic_runstate = RunState.STOPPED
+
+        self._moves: deque[_Move] = deque()
+        self._move_task: asyncio.Task | None = None
+        self._jog_speeds = [0.0] * _AXIS_COUNT
+        self._jog_time = monotonic()
+        self._upload: tuple[str, list[str]] | None = None
+
+        self._server: asyncio.Server | None = None
+        self._connections: set[_SimulatorProtocol] = set()
+        self._thread: threading.Thread | None = None
+        self._thread_loop: asyncio.AbstractEventLoop | None = None
+        self._thread_stop: asyncio.Event | None = None
+
+    async def __aenter__(self) -> "CRISimulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
+
+    async def start(self) -> int:
+        """
+        Starts listening in the running event loop.
+
+        Returns
+        -------
+        int
+            port the simulator listens on
+        """
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(
+            lambda: _SimulatorProtocol(self), self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.debug("Simulator listening on %s:%d", self.host, self.port)
+        return self.port
+
+    async def stop(self) -> None:
+        """Closes all connections and stops listening."""
+        if self._move_task is not None:
+            self._move_task.cancel()
+        for connection in list(self._connections):
+            if connection.transport is not None:
+                connection.transport.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def start_in_thread(self) -> int:
+        """
+        Starts the simulator in an event loop of a background thread.
+
+        Returns
+        -------
+        int
+            port the simulator listens on
+        """
+        started = threading.Event()
+        self._thread = threading.Thread(
+            target=asyncio.run,
+            args=(self._bg_serve(started),),
+            daemon=True,
+            name="CRISimulator",
+        )
+        self._thread.start()
+        started.wait()
+        return self.port
+
+    def stop_in_thread(self) -> None:
+        """Stops a simulator started with ``start_in_thread``."""
+        if self._thread is None or self._thread_loop is None:
+            return
+        self._thread_loop.call_soon_threadsafe(self._thread_stop.set)  # type: ignore
+        self._thread.join()
+        self._thread = None
+
+    async def _bg_serve(self, started: threading.Event) -> None:
+        self._thread_loop = asyncio.get_running_loop()
+        self._thread_stop = asyncio.Event()
+        try:
+            await self.start()
+        finally:
+            started.set()
+        await self._thread_stop.wait()
+        await self.stop()
+
+    def _connection_made(self, connection: _SimulatorProtocol) -> None:
+        self._connections.add(connection)
+        loop = asyncio.get_running_loop()
+        for rate, message in (
+            (self.status_rate, self._status_message),
+            (self.runstate_rate, self._runstate_messages),
+            (self.cyclestat_rate, self._cyclestat_message),
+        ):
+            if rate > 0:
+                connection.tasks.append(
+                    loop.create_task(self._bg_cyclic(connection, rate, message))
+                )
+
+    async def _bg_cyclic(
+        self,
+        connection: _SimulatorProtocol,
+        rate: float,
+        message: Callable[[], list[str]],
+    ) -> None:
+        """Sends messages at a fixed rate, catching up if the event loop was late."""
+        start = monotonic()
+        sent = 0
+        while True:
+            due = int((monotonic() - start) * rate) + 1
+            for _ in range(due - sent):
+                if not connection.writing_paused:
+                    for text in message():
+                        connection.send(text)
+            sent = due
+            await asyncio.sleep(max(0.0, start + sent / rate - monotonic()))
+
+    def _status_message(self) -> list[str]:
+        now = monotonic()
+        self._apply_jog(now)
+        joints = self._current(now, cartesian=False)
+        position = self._current(now, cartesian=True)
+        set_point = self._moves[0].target if self._moves else joints
+        if self._moves and self._moves[0].cartesian:
+            set_point = joints
+        # values of unconfigured axes are sent as zeros
+        padding = " 0" * (16 - _AXIS_COUNT)
+        if self.enabled:
+            kinematics = KinematicsState.NO_ERROR
+            operation_mode = OperationMode.NORMAL
+            error = "NoError"
+        else:
+            kinematics = KinematicsState.MOTION_NOT_ALLOWED
+            operation_mode = OperationMode.NOT_ENABLED
+            error = "NotEnabled"
+        return [
+            f"STATUS MODE joint POSJOINTSETPOINT {_format(set_point)}{padding}"
+            f" POSJOINTCURRENT {_format(joints)}{padding}"
+            f" POSCARTROBOT {_format(position)} POSCARTPLATFORM 0.00 0.00 0.00"
+            f" OVERRIDE {self.override:.1f} DIN {self.din_bits:016X}"
+            f" DOUT {self.dout_bits:016X} ESTOP 3 SUPPLY 24000 CURRENTALL 1500"
+            f" CURRENTJOINTS{' 100' * 16} ERROR {error}{' 0' * 16}"
+            f" KINSTATE {kinematics.value} OPMODE {operation_mode.value}"
+            f" CARTSPEED 0.0 GSIG {self.global_signals_bits:032X}"
+        ]
+
+    def _runstate_messages(self) -> list[str]:
+        return [
+            f"RUNSTATE MAIN {self.main_program or 'None'} {self.main_program or 'None'}"
+            f" 0 0 {self.main_runstate.value} 0",
+            f"RUNSTATE LOGIC {self.logic_program or 'None'}"
+            f" {self.logic_program or 'None'} 0 0 {self.logic_runstate.value} 0",
+        ]
+
+    def _cyclestat_message(self) -> list[str]:
+        return ["CYCLESTAT 10.0 20.0"]
+
+    def _current(self, now: float, cartesian: bool) -> list[float]:
+        """Returns the interpolated joint or cartesian position."""
+        current = self.position if cartesian else self.joints
+        if not self._moves or self._moves[0].cartesian != cartesian:
+            return current
+        move = self._moves[0]
+        if move.duration <= 0.0:
+            return current
+        progress = min(1.0, max(0.0, (now - move.start_time) / move.duration))
+        return [a + (b - a) * progress for a, b in zip(move.start, move.target)]
+
+    def _apply_jog(self, now: float) -> None:
+        elapsed = now - self._jog_time
+        self._jog_time = now
+        if self._moves or not self.enabled or not any(self._jog_speeds):
+            return
+        for i, speed in enumerate(self._jog_speeds):
+            self.joints[i] += speed / 100 * self.joint_speed * elapsed
+
+    def _handle_message(self, connection: _SimulatorProtocol, message: str) -> None:
+        parts = message.split()
+        message_id = parts[1]
+        parameters = parts[3:-1]
+        match parts[2]:
+            case "ALIVEJOG":
+                self._apply_jog(monotonic())
+                self._jog_speeds = [float(value) for value in parameters[:_AXIS_COUNT]]
+
+            case "CMD":
+                self._handle_command(connection, message_id, parameters, message)
+
+            case "CONFIG":
+                if parameters[:1] == ["GetAxes"]:
+                    connection.send(
+                        "CONFIG Axes "
+                        + " ".join(f"{axis} 1 -180 180 100" for axis in self.axes)
+                    )
+
+            case "INFO":
+                if parameters[:1] == ["Hello"]:
+                    connection.send("MESSAGE RobotControl Version Simulator")
+                    connection.send(f"CONFIG ProjectFile {self.project_file}")
+
+            case "SYSTEM":
+                if parameters[:1] == ["GetBoardTemp"]:
+                    connection.send("INFO BoardTemp" + " 30.0" * 16)
+                elif parameters[:1] == ["GetMotorTemp"]:
+                    connection.send("INFO MotorTemp" + " 35.0" * 16)
+
+            case "CANBridge":
+                self._handle_can_bridge(connection, parameters)
+
+            case "QUIT":
+                if connection.transport is not None:
+                    connection.transport.close()
+
+            case category:
+                logger.debug("Simulator ignores message category %s", category)
+
+    def _handle_command(
+        self,
+        connection: _SimulatorProtocol,
+        message_id: str,
+        parameters: list[str],
+        message: str,
+    ) -> None:
+        """Executes a `CMD` message and answers with `CMDACK` or `CMDERROR`."""
+        if not parameters:
+            connection.send(f"CMDERROR {message_id} Empty command")
+            return
+        if (error := self.command_errors.get(parameters[0])) is not None:
+            connection.send(f"CMDERROR {message_id} {error}")
+            return
+
+        error = None
+        match parameters:
+            case ["Reset"] | ["ReferenceAllJoints"] | ["ReferenceSingleJoint", _]:
+                pass
+            case ["Enable"]:
+                self.enabled = True
+            case ["Disable"]:
+                self.enabled = False
+            case ["SetActive", active]:
+                connection.send(f"CMD Active {active}")
+            case ["SetJointsToZero"]:
+                self.joints = [0.0] * _AXIS_COUNT
+            case ["GetReferencingInfo"]:
+                connection.send(
+                    "INFO ReferencingInfo 2 Joints"
+                    + " 2" * 12
+                    + " Mandatory 0 RefWithProg 0 0"
+                )
+            case ["Move", "Stop"]:
+                self._stop_moves()
+            case ["Move", kind, *values]:
+                error = self._queue_move(connection, kind, values)
+            case [motion_type] if motion_type.startswith("MotionType"):
+                pass
+            case ["Override", value]:
+                self.override = float(value)
+            case ["DIN" | "DOUT" | "GSIG" as signal, index, value]:
+                self._set_signal(signal, int(index), value == "true")
+            case ["LoadProgram", name]:
+                self.main_program = name
+            case ["LoadLogicProgram", name]:
+                self.logic_program = name
+            case ["StartProgram"]:
+                self.main_runstate = RunState.RUNNING
+            case ["StopProgram"]:
+                self.main_runstate = RunState.STOPPED
+            case ["PauseProgram"]:
+                self.main_runstate = RunState.PAUSED
+            case ["ListFiles", directory]:
+                prefix = directory.rstrip("/") + "/"
+                names = [
+                    path[len(prefix) :]
+                    for path in self.files
+                    if path.startswith(prefix) and "/" not in path[len(prefix) :]
+                ]
+                connection.send(" ".join(["INFO FileList", directory, *names]))
+            case ["UploadFileInit", path, *_]:
+                self._upload = (path, [])
+            case ["UploadFileLine", *_]:
+                if self._upload is None:
+                    error = "No upload initialized"
+                else:
+                    line = message.split("UploadFileLine", 1)[1]
+                    self._upload[1].append(line[1:].rsplit(" CRIEND", 1)[0])
+            case ["UploadFileFinish"]:
+                if self._upload is None:
+                    error = "No upload initialized"
+                else:
+                    path, lines = self._upload
+                    self.files[path] = lines
+                    self._upload = None
+            case _:
+                error = f"Unknown command {parameters[0]}"
+
+        if error is None:
+            connection.send(f"CMDACK {message_id}")
+        else:
+            connection.send(f"CMDERROR {message_id} {error}")
+
+    def _set_signal(self, signal: str, index: int, value: bool) -> None:
+        attribute = {
+            "DIN": "din_bits",
+            "DOUT": "dout_bits",
+            "GSIG": "global_signals_bits",
+        }[signal]
+        bits = getattr(self, attribute)
+        bits = bits | (1 << index) if value else bits & ~(1 << index)
+        setattr(self, attribute, bits)
+
+    def _handle_can_bridge(
+        self, connection: _SimulatorProtocol, parameters: list[str]
+    ) -> None:
+        match parameters:
+            case ["SwitchOn"]:
+                connection.can_mode = True
+            case ["SwitchOff"]:
+                connection.can_mode = False
+            case ["Msg", "ID", can_id, "Len", length, "Data", *data]:
+                if connection.can_mode and self.can_echo:
+                    connection.send(
+                        f"CANBridge Msg ID {can_id} Len {length} Data {' '.join(data)}"
+                        f" Time 0 SystemTime {int(monotonic() * 1e6)}"
+                    )
+
+    def _queue_move(
+        self, connection: _SimulatorProtocol, kind: str, values: list[str]
+    ) -> str | None:
+        """Queues a move command, returns an error message if it is rejected."""
+        if not self.enabled:
+            return "Robot not enabled"
+        if kind not in _MOVES:
+            return f"Unknown move {kind}"
+        try:
+            numbers = [float(value) for value in values[:10]]
+        except ValueError:
+            return "Invalid move parameters"
+        if len(numbers) < 10:
+            return "Invalid move parameters"
+
+        cartesian = kind not in ("Joint", "RelativeJoint")
+        # tool moves are treated as base moves since kinematics are not simulated
+        self._moves.append(
+            _Move(
+                connection,
+                cartesian,
+                kind not in ("Joint", "Cart"),
+                numbers[:6] if cartesian else numbers[:_AXIS_COUNT],
+                numbers[_AXIS_COUNT],
+            )
+        )
+        if self._move_task is None or self._move_task.done():
+            self._move_task = asyncio.get_running_loop().create_task(
+                self._bg_execute_moves()
+            )
+        return None
+
+    async def _bg_execute_moves(self) -> None:
+        """Executes the queued moves one after another."""
+        while self._moves:
+            move = self._moves[0]
+            move.start = list(self.position if move.cartesian else self.joints)
+            if move.relative:
+                move.target = [a + b for a, b in zip(move.start, move.target)]
+
+            if move.cartesian:
+                distance = math.dist(move.start[:3], move.target[:3])
+                speed = move.velocity
+            else:
+                distance = max(abs(a - b) for a, b in zip(move.start, move.target))
+                speed = self.joint_speed * move.velocity / 100
+            speed *= max(self.override, 1.0) / 100
+            move.duration = distance / speed * self.time_scale if speed > 0 else 0.0
+            move.start_time = monotonic()
+
+            await asyncio.sleep(move.duration)
+
+            if move.cartesian:
+                self.position = move.target
+            else:
+                self.joints = move.target
+            self._moves.popleft()
+            move.connection.send("EXECEND")
+
+    def _stop_moves(self) -> None:
+        """Stops the running move at its current position and drops queued moves."""
+        if not self._moves:
+            return
+        move = self._moves[0]
+        now = monotonic()
+        if move.start:
+            if move.cartesian:
+                self.position = self._current(now, cartesian=True)
+            else:
+                self.joints = self._current(now, cartesian=False)
+        if self._move_task is not None:
+            self._move_task.cancel()
+        self._moves.clear()
+        move.connection.send("EXECEND")
+
+
+def _format(values: list[float]) -> str:
+    return " ".join(f"{value:.2f}" for value in values)
@@ -0,0 +1,192 @@
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .cri_answers import AnswerTable
+
+_BUCKETS = 64
+"""number of power of two buckets, enough for any duration in ns"""
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations with power of two buckets.
+
+    A duration of `d` ns is counted in the bucket `d.bit_length()`, i.e. the bucket
+    with the upper bound `2**i` ns contains durations in `[2**(i-1), 2**i)`. Recording
+    is O(1) and does not allocate, percentiles are therefore upper bounds with a
+    resolution of a factor of two.
+    """
+
+    __slots__ = ("counts", "count", "total_ns", "max_ns")
+
+    def __init__(self) -> None:
+        self.counts = [0] * _BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, duration_ns: int) -> None:
+        """
+        Counts a duration.
+
+        Parameters
+        ----------
+        duration_ns : int
+            duration in ns, negative durations are counted as `0`
+        """
+        if duration_ns < 0:
+            duration_ns = 0
+        self.counts[duration_ns.bit_length()] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Returns an upper bound of a percentile.
+
+        Parameters
+        ----------
+        fraction : float
+            percentile as fraction, e.g. `0.99`
+
+        Returns
+        -------
+        float
+            upper bound of the percentile in µs, `0.0` if nothing was recorded
+        """
+        if self.count == 0:
+            return 0.0
+        rank = fraction * self.count
+        cumulative = 0
+        for bucket, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank and count:
+                return min(1 << bucket, self.max_ns) / 1000
+        return self.max_ns / 1000
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the statistics of the recorded durations.
+
+        Returns
+        -------
+        dict[str, Any]
+            `count`, `mean_us`, `max_us`, `p50_us`, `p90_us`, `p99_us` and the
+            non-empty buckets as `buckets_us` (upper bound in µs: count)
+        """
+        return {
+            "count": self.count,
+            "mean_us": self.total_ns / self.count / 1000 if self.count else 0.0,
+            "max_us": self.max_ns / 1000,
+            "p50_us": self.percentile(0.5),
+            "p90_us": self.percentile(0.9),
+            "p99_us": self.percentile(0.99),
+            "buckets_us": {
+                (1 << bucket) / 1000: count
+                for bucket, count in enumerate(self.counts)
+                if count
+            },
+        }
+
+
+class CRIStats:
+    """
+    Counters of the hot paths of a client, see ``CRIClient.enable_stats``.
+
+    The counters are updated without locks by the receive thread (or event loop) and
+    the sending threads, so a snapshot taken while messages are processed is not
+    necessarily consistent across counters. Updating costs about a microsecond per
+    message.
+    """
+
+    def __init__(self, answers: "AnswerTable | None" = None) -> None:
+        """
+        Create empty counters.
+
+        Parameters
+        ----------
+        answers : AnswerTable | None
+            answer table of the client, its counters are included in snapshots
+        """
+        self.answers = answers
+        self.reset()
+
+    def reset(self) -> None:
+        """Resets all counters."""
+        self.start_time_ns = time.monotonic_ns()
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.frames_sent = 0
+        self.parse_time: dict[str, LatencyHistogram] = {}
+        """parse time per message category, its counts are the received frames"""
+        self.status_callback_time = LatencyHistogram()
+        self.receive_buffer_high_water = 0
+        """maximum number of received bytes waiting for framing"""
+        self.alivejog_jitter = LatencyHistogram()
+        """delay of ALIVEJOG messages relative to their interval"""
+        self._next_alivejog_ns: int | None = None
+
+    def record_received(self, nbytes: int, pending_bytes: int) -> None:
+        """Counts received bytes and the bytes waiting in the receive buffer."""
+        self.bytes_received += nbytes
+        if pending_bytes > self.receive_buffer_high_water:
+            self.receive_buffer_high_water = pending_bytes
+
+    def record_sent(self, nbytes: int) -> None:
+        """Counts a sent frame."""
+        self.bytes_sent += nbytes
+        self.frames_sent += 1
+
+    def record_parse(self, category: str, duration_ns: int) -> None:
+        """Counts a received frame of a category and its parse time."""
+        if (histogram := self.parse_time.get(category)) is None:
+            histogram = self.parse_time[category] = LatencyHistogram()
+        histogram.record(duration_ns)
+
+    def record_alivejog(self, interval: float) -> None:
+        """
+        Records the delay of an ALIVEJOG message sent now.
+
+        Parameters
+        ----------
+        interval : float
+            time in seconds until the next ALIVEJOG message is due
+        """
+        now = time.monotonic_ns()
+        if self._next_alivejog_ns is not None:
+            self.alivejog_jitter.record(now - self._next_alivejog_ns)
+        self._next_alivejog_ns = now + int(interval * 1e9)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the current values of all counters.
+
+        Returns
+        -------
+        dict[str, Any]
+            plain values and dicts, e.g. for logging or JSON serialization
+        """
+        parse_time = dict(self.parse_time)
+        snapshot = {
+            "uptime_s": (time.monotonic_ns() - self.start_time_ns) / 1e9,
+            "frames_received": {
+                category: histogram.count for category, histogram in parse_time.items()
+            },
+            "bytes_received": self.bytes_received,
+            "frames_sent": self.frames_sent,
+            "bytes_sent": self.bytes_sent,
+            "parse_time": {
+                category: histogram.snapshot()
+                for category, histogram in parse_time.items()
+            },
+            "status_callback_time": self.status_callback_time.snapshot(),
+            "receive_buffer_high_water": self.receive_buffer_high_water,
+            "alivejog_jitter": self.alivejog_jitter.snapshot(),
+        }
+        if self.answers is not None:
+            snapshot["answers"] = self.answers.counters()
+            snapshot["round_trip_time"] = self.answers.round_trip_snapshot()
+        return snapshot
@@ -0,0 +1,216 @@
+import asyncio
+import concurrent.futures
+import logging
+from collections import deque
+from collections.abc import Callable, Generator
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic
+
+from .cri_errors import CRIConnectionError, CRIError
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, int], None]
+"""called with the number of acknowledged lines and the total number of lines"""
+
+
+@dataclass(slots=True)
+class UploadResult:
+    """
+    Result of an upload, see ``CRIController.upload_file``.
+
+    Evaluates to `True` if the upload was successful, so it can be used like the
+    `bool` returned by earlier versions.
+    """
+
+    target: str
+    """path of the file on the robot controller relative to `/Data`"""
+    lines: int = 0
+    """number of lines of the file"""
+    acknowledged: int = 0
+    """number of lines acknowledged by the robot controller"""
+    error: str | None = None
+    """error message if the upload failed"""
+    error_line: int | None = None
+    """line number (1-based) of the rejected line, `0` if the upload could not be
+    started and `lines + 1` if it could not be finished"""
+    duration: float = 0.0
+    """time of the upload in seconds"""
+
+    def __bool__(self) -> bool:
+        return self.error is None
+
+    @property
+    def lines_per_s(self) -> float:
+        """Throughput of acknowledged lines."""
+        return self.acknowledged / self.duration if self.duration > 0 else 0.0
+
+    def fail(self, line: int, error: str) -> "UploadResult":
+        """Records the error of a line, see `error_line`."""
+        self.error = error
+        self.error_line = line
+        if line == 0:
+            logger.error("Upload of %s failed to start: %s", self.target, error)
+        elif line > self.lines:
+            logger.error("Upload of %s failed to finish: %s", self.target, error)
+        else:
+            logger.error("Upload of %s failed in line %d: %s", self.target, line, error)
+        return self
+
+    def log_finished(self) -> None:
+        logger.info(
+            "Uploaded %s: %d lines in %.3f s (%.0f lines/s)",
+            self.target,
+            self.lines,
+            self.duration,
+            self.lines_per_s,
+        )
+
+
+def read_upload_lines(path: str | Path) -> list[str] | None:
+    """
+    Reads the lines of a file to upload without line endings and trailing whitespace.
+
+    Parameters
+    ----------
+    path : str | Path
+        path of the file
+
+    Returns
+    -------
+    list[str] | None
+        the lines or `None` if the file could not be read
+    """
+    try:
+        with open(path, "r") as fp:
+            # iterating splits only at line endings, unlike str.splitlines which also
+            # splits at e.g. form feeds
+            return [line.rstrip() for line in fp]
+    except OSError as e:
+        logger.error("Error reading %s: %s", str(path), str(e))
+        return None
+
+
+UploadSteps = Generator[concurrent.futures.Future | None, str | None, None]
+"""yields the answers to wait for and receives their error messages, see
+``upload_steps``"""
+
+
+def upload_steps(
+    result: UploadResult,
+    lines: list[str],
+    send: Callable[[str], concurrent.futures.Future | None],
+    window: int,
+    progress: ProgressCallback | None,
+) -> UploadSteps:
+    """
+    Windowed upload of the lines of a file, independent of the transport.
+
+    The commands are sent with `send`, which returns the answer of the command as
+    returned by ``AnswerTable.watch``. Whenever an answer has to be awaited it is
+    yielded and the caller sends back its error message or `None`, see
+    ``run_upload`` and ``run_upload_async``. The outcome is stored in `result`,
+    including a connection lost while sending.
+
+    CRI has no command to abort an upload, so no `UploadFileFinish` is sent after a
+    rejected line and the robot controller may keep the incomplete upload. Uploading
+    the file again replaces it.
+
+    Parameters
+    ----------
+    result : UploadResult
+        result of the upload, `target` must be set
+    lines : list[str]
+        lines of the file, see ``read_upload_lines``
+    send : Callable[[str], concurrent.futures.Future | None]
+        sends a command and returns its answer
+    window : int
+        maximum number of lines waiting for their acknowledgement
+    progress : Callable[[int, int], None] | None
+        called with the number of acknowledged lines and the number of lines
+    """
+    result.lines = len(lines)
+    t_start = monotonic()
+    # line of the command being sent, see `UploadResult.error_line`
+    sending = 0
+
+    try:
+        answer = send(f"CMD UploadFileInit {result.target} {len(lines)} 0")
+        if (error_msg := (yield answer)) is not None:
+            result.fail(0, error_msg)
+            return
+
+        in_flight: deque[tuple[int, concurrent.futures.Future | None]] = deque()
+        for line_number, line in enumerate(lines, 1):
+            sending = line_number
+            in_flight.append((line_number, send(f"CMD UploadFileLine {line}")))
+
+            # wait for the oldest line once `window` lines are in flight and for all
+            # remaining lines after the last one was sent
+            while in_flight and (len(in_flight) >= window or line_number == len(lines)):
+                pending_line, answer = in_flight.popleft()
+                if (error_msg := (yield answer)) is not None:
+                    result.fail(pending_line, error_msg)
+                    return
+                result.acknowledged += 1
+                if progress is not None:
+                    progress(result.acknowledged, result.lines)
+
+        sending = len(lines) + 1
+        answer = send("CMD UploadFileFinish")
+        if (error_msg := (yield answer)) is not None:
+            result.fail(len(lines) + 1, error_msg)
+            return
+    except CRIConnectionError as e:
+        result.fail(sending, e.message)
+        return
+
+    result.duration = monotonic() - t_start
+    result.log_finished()
+
+
+def run_upload(steps: UploadSteps, timeout: float) -> None:
+    """Runs ``upload_steps``, blocking the calling thread while waiting for answers.
+
+    Timeouts and errors of the answers, e.g. a lost connection, are passed to the
+    steps as error message.
+    """
+    try:
+        answer = next(steps)
+        while True:
+            if answer is None:
+                error_msg: str | None = "Answer expired"
+            else:
+                try:
+                    error_msg = answer.result(timeout)
+                except concurrent.futures.TimeoutError:
+                    error_msg = "No acknowledgement received"
+                except CRIError as e:
+                    # connection lost or answer expired
+                    error_msg = str(e)
+            answer = steps.send(error_msg)
+    except StopIteration:
+        pass
+
+
+async def run_upload_async(steps: UploadSteps, timeout: float) -> None:
+    """Runs ``upload_steps`` in the running event loop, see ``run_upload``."""
+    try:
+        answer = next(steps)
+        while True:
+            if answer is None:
+                error_msg: str | None = "Answer expired"
+            else:
+                try:
+                    error_msg = await asyncio.wait_for(
+                        asyncio.shield(asyncio.wrap_future(answer)), timeout
+                    )
+                except asyncio.TimeoutError:
+                    error_msg = "No acknowledgement received"
+                except CRIError as e:
+                    # connection lost or answer expired
+                    error_msg = str(e)
+            answer = steps.send(error_msg)
+    except StopIteration:
+        pass
@@ -1,5 +1,9 @@
-from dataclasses import dataclass, field
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import InitVar, dataclass, field
 from enum import Enum
+from typing import Any, overload
+
+from .robot_state_arrays import RobotStateArrays
 
 
 class RobotMode(Enum):
@@ -66,9 +70,14 @@ class ReplayMode(Enum):
     FAST = 3
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ErrorStates:
-    """error states of axes, multiple errors can apply"""
+    """
+    error states of axes, multiple errors can apply
+
+    Instances are immutable, so equal error states can be shared between axes
+    and robot states.
+    """
 
     over_temp: bool = False
     estop_lowv: bool = False
@@ -80,7 +89,7 @@ class ErrorStates:
     driver: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class RobotCartesianPosition:
     """Represents the cartesian position of a robot"""
 
@@ -92,7 +101,7 @@ class RobotCartesianPosition:
     C: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class PlatformCartesianPosition:
     """Represents the cartesian position of a platform"""
 
@@ -101,7 +110,7 @@ class PlatformCartesianPosition:
     RZ: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class JointsState:
     """Represents the joints state of a robot"""
 
@@ -123,7 +132,7 @@ class JointsState:
     P4: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class PosVariable:
     """Represents a position variable"""
 
@@ -144,7 +153,7 @@ class PosVariable:
     E3: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class OperationInfo:
     """Operation statistics sent by the robot controler"""
 
@@ -165,7 +174,7 @@ class ReferencingAxisState(Enum):
     REFERENCING = 2
 
 
-@dataclass
+@dataclass(slots=True)
 class ReferencingState:
     """Represents the overall referencing state of the robot."""
 
@@ -188,7 +197,32 @@ class ReferencingState:
     E6: ReferencingAxisState = ReferencingAxisState.NOT_REFERENCED
 
 
-@dataclass
+class _BitField:
+    """
+    Descriptor reading a bit field of a ``RobotState`` as ``BitView`` and packing
+    assigned sequences of bools into it.
+
+    Used as default of an `InitVar`, so the constructor still accepts sequences of
+    bools, e.g. ``RobotState(din=[True, False])``.
+    """
+
+    __slots__ = ("name", "length")
+
+    def __init__(self, name: str, length: int) -> None:
+        self.name = name
+        self.length = length
+
+    def __get__(self, robot_state: Any, owner: type | None = None) -> "BitView | None":
+        if robot_state is None:
+            # default value of the constructor argument
+            return None
+        return BitView(robot_state, self.name, self.length)
+
+    def __set__(self, robot_state: Any, values: Iterable[bool]) -> None:
+        setattr(robot_state, self.name, pack_bits(values))
+
+
+@dataclass(slots=True)
 class RobotState:
     """
     Dataclass which holds the current state of the robot.
@@ -231,16 +265,16 @@ class RobotState:
     override: float = 100.0
     """global robot speed override"""
 
-    din: list[bool] = field(default_factory=lambda: [False] * 64)
-    """digital ins"""
+    din: InitVar[Iterable[bool] | None] = _BitField("din_bits", 64)
+    """digital ins, assigning a sequence of bools sets `din_bits`"""
 
-    dout: list[bool] = field(default_factory=lambda: [False] * 64)
-    """digital outs"""
+    dout: InitVar[Iterable[bool] | None] = _BitField("dout_bits", 64)
+    """digital outs, assigning a sequence of bools sets `dout_bits`"""
 
-    emergency_stop_ok = False
+    emergency_stop_ok: bool = False
     """`True` if emergency stop circuit is closed"""
 
-    main_relay = False
+    main_relay: bool = False
     """`True` if main power relay is closed"""
 
     supply_voltage: float = 0.0
@@ -249,7 +283,7 @@ class RobotState:
     battery_percent: float = 0.0
     """battery percent of mobile platform"""
 
-    current_total = 0.0
+    current_total: float = 0.0
     """total current drawn by robot"""
 
     current_joints: list[float] = field(default_factory=lambda: [0.0] * 16)
@@ -261,8 +295,10 @@ class RobotState:
     operation_mode: OperationMode = OperationMode.NOT_ENABLED
     """global operation mode"""
 
-    global_signals: list[bool] = field(default_factory=lambda: [False] * 128)
-    """global signals"""
+    global_signals: InitVar[Iterable[bool] | None] = _BitField(
+        "global_signals_bits", 128
+    )
+    """global signals, assigning a sequence of bools sets `global_signals_bits`"""
 
     frame_name: str = ""
     """name of currently active frame"""
@@ -359,4 +395,291 @@ class RobotState:
     """Temperatures of motors"""
 
     category_time_ns: dict[str, int] = field(default_factory=lambda: {})
-    """Per `CMD_CATEGORY ` nanosecond epoch timestamps when the most recent update was received."""
+    """Per `CMD_CATEGORY ` nanosecond epoch timestamps when the most recent update was received.
+    Messages not changing any other field update the latest snapshot in place."""
+
+    din_bits: int = 0
+    """digital ins as bit field, bit `i` is input `i`"""
+
+    dout_bits: int = 0
+    """digital outs as bit field, bit `i` is output `i`"""
+
+    global_signals_bits: int = 0
+    """global signals as bit field, bit `i` is signal `i`"""
+
+    _arrays: RobotStateArrays | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    _pending: dict[str, Any] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for unset fields, which belong to STATUS segments not decoded
+        # yet, see `CRIProtocolParser.lazy_status`.
+        pending = self._pending if name != "_pending" else None
+        if pending is None or (status := pending.get(name)) is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+
+        for field_name, value in status.decode(name).items():
+            if pending.get(field_name) is status:
+                # set the field before removing it from pending, see `__copy__`
+                object.__setattr__(self, field_name, value)
+                pending.pop(field_name, None)
+        return object.__getattribute__(self, name)
+
+    def __copy__(self) -> "RobotState":
+        # copy.copy would read unset fields and therefore decode pending segments
+        robot_state = object.__new__(type(self))
+        if self._pending:
+            pending = dict(self._pending)
+            for name in _COPIED_SLOTS:
+                if name not in pending:
+                    setattr(robot_state, name, object.__getattribute__(self, name))
+            robot_state._pending = pending
+        else:
+            _copy_slots(self, robot_state)
+            robot_state._pending = None
+        # array views belong to a single robot state
+        robot_state._arrays = None
+        return robot_state
+
+    def __post_init__(
+        self,
+        din: Iterable[bool] | None,
+        dout: Iterable[bool] | None,
+        global_signals: Iterable[bool] | None,
+    ) -> None:
+        if din is not None:
+            self.din_bits = pack_bits(din)
+        if dout is not None:
+            self.dout_bits = pack_bits(dout)
+        if global_signals is not None:
+            self.global_signals_bits = pack_bits(global_signals)
+
+    @property
+    def arrays(self) -> RobotStateArrays:
+        """
+        NumPy array views of the numeric fields, see ``RobotStateArrays``.
+
+        Requires the optional dependency NumPy.
+        """
+        if self._arrays is None:
+            self._arrays = RobotStateArrays(self)
+        return self._arrays
+
+
+_COPIED_SLOTS = tuple(
+    name for name in RobotState.__slots__ if name not in ("_arrays", "_pending")
+)
+"""slots of a robot state shared by its copies"""
+
+
+def _compile_copy_slots(names: Iterable[str]) -> Callable[[Any, Any], None]:
+    """
+    Generates a function assigning the slots `names` of one object to another.
+
+    Like the ``__init__`` generated by ``dataclasses``, the assignments are written out
+    instead of looping over the names, which makes ``RobotState.__copy__`` several
+    times faster.
+
+    Parameters
+    ----------
+    names : Iterable[str]
+        names of the slots to copy
+
+    Returns
+    -------
+    Callable[[Any, Any], None]
+        function copying the slots from its first to its second argument
+    """
+    source = "def copy_slots(source, target):\n" + "".join(
+        f"    target.{name} = source.{name}\n" for name in names
+    )
+    namespace: dict[str, Any] = {}
+    exec(source, namespace)
+    return namespace["copy_slots"]
+
+
+_copy_slots = _compile_copy_slots(_COPIED_SLOTS)
+
+
+class BitView(Sequence[bool]):
+    """
+    Sequence of bools decoding a bit field of a robot state on access.
+
+    Item `i` is bit `i` of the bit field. Assigning items writes the bits back into
+    the robot state. To check several bits at once use the bit field directly, e.g.
+    ``test_bits(robot_state.din_bits, din_mask(1, 2, 3))``.
+    """
+
+    __slots__ = ("_owner", "_name", "_length")
+
+    def __init__(self, owner: Any, name: str, length: int) -> None:
+        """
+        Create a view of a bit field.
+
+        Parameters
+        ----------
+        owner: Any
+            object holding the bit field, usually a ``RobotState``
+        name: str
+            name of the bit field attribute of `owner`
+        length: int
+            number of bits
+        """
+        self._owner = owner
+        self._name = name
+        self._length = length
+
+    @property
+    def bits(self) -> int:
+        """the underlying bit field"""
+        return getattr(self._owner, self._name)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> bool: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[bool]: ...
+
+    def __getitem__(self, index: int | slice) -> bool | list[bool]:
+        bits = self.bits
+        if isinstance(index, slice):
+            return [bits >> i & 1 == 1 for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("bit index out of range")
+        return bits >> index & 1 == 1
+
+    def __setitem__(self, index: int | slice, value: bool | Iterable[bool]) -> None:
+        if isinstance(index, slice):
+            indices = range(*index.indices(self._length))
+            values = list(value)  # type: ignore[arg-type]
+            if len(values) != len(indices):
+                raise ValueError("the number of bits can not be changed")
+        else:
+            if index < 0:
+                index += self._length
+            if not 0 <= index < self._length:
+                raise IndexError("bit index out of range")
+            indices = range(index, index + 1)
+            values = [bool(value)]
+
+        bits = self.bits
+        for i, bit in zip(indices, values):
+            if bit:
+                bits |= 1 << i
+            else:
+                bits &= ~(1 << i)
+        setattr(self._owner, self._name, bits)
+
+    def __iter__(self) -> Iterator[bool]:
+        bits = self.bits
+        return (bits >> i & 1 == 1 for i in range(self._length))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, BitView):
+            return self._length == other._length and self.bits == other.bits
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+def pack_bits(values: Iterable[bool]) -> int:
+    """
+    Packs a sequence of bools into a bit field, item `i` becomes bit `i`.
+
+    Parameters
+    ----------
+    values: Iterable[bool]
+        bools to pack
+
+    Returns
+    -------
+    int
+        bit field
+    """
+    bits = 0
+    for i, value in enumerate(values):
+        if value:
+            bits |= 1 << i
+    return bits
+
+
+def din_mask(*indices: int) -> int:
+    """
+    Creates a bit mask of the given signal indices.
+
+    Usable for digital ins, digital outs and global signals alike.
+
+    Parameters
+    ----------
+    indices: int
+        indices of the signals
+
+    Returns
+    -------
+    int
+        mask with the bits of all given indices set
+    """
+    mask = 0
+    for index in indices:
+        mask |= 1 << index
+    return mask
+
+
+def test_bits(bits: int, mask: int, expected: int | None = None) -> bool:
+    """
+    Checks several signals of a bit field with a single integer operation.
+
+    Parameters
+    ----------
+    bits: int
+        bit field, e.g. `RobotState.din_bits`
+    mask: int
+        bits to check, see ``din_mask``
+    expected: int | None
+        expected values of the masked bits, `None` requires all of them to be set
+
+    Returns
+    -------
+    bool
+        `True` if the masked bits have the expected values
+    """
+    return bits & mask == (mask if expected is None else expected & mask)
+
+
+# not a test, even if imported into a test module
+test_bits.__test__ = False  # type: ignore[attr-defined]
+
+
+def changed_bits(old: int, new: int, mask: int = -1) -> int:
+    """
+    Returns the bits which differ between two bit fields.
+
+    Parameters
+    ----------
+    old: int
+        previous bit field, e.g. `RobotState.din_bits` of an older snapshot
+    new: int
+        current bit field
+    mask: int
+        only bits set in the mask are compared, all by default
+
+    Returns
+    -------
+    int
+        bit field with all changed bits set
+    """
+    return (old ^ new) & mask
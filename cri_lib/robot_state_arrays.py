@@ -0,0 +1,147 @@
+from collections.abc import Callable
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from .robot_state import RobotState
+
+_JOINT_NAMES = (
+    "A1",
+    "A2",
+    "A3",
+    "A4",
+    "A5",
+    "A6",
+    "E1",
+    "E2",
+    "E3",
+    "G1",
+    "G2",
+    "G3",
+    "P1",
+    "P2",
+    "P3",
+    "P4",
+)
+_get_joints = attrgetter(*_JOINT_NAMES)
+_get_cartesian = attrgetter("X", "Y", "Z", "A", "B", "C")
+
+
+def numpy_available() -> bool:
+    """Returns `True` if the optional dependency NumPy is installed."""
+    return np is not None
+
+
+class RobotStateArrays:
+    """NumPy array views of the numeric fields of a ``RobotState``.
+
+    Every array is converted on first access and cached as read-only array. Repeated
+    accesses return the cached array as long as its field holds the same object,
+    assigning a new value to the field creates a new array. Modifying the object of
+    a field in place, e.g. an item of `board_temps`, is not detected, the parser
+    always assigns new objects. Joint arrays are ordered like
+    the fields of ``JointsState`` (A1-A6, E1-E3, G1-G3, P1-P4).
+
+    Requires the optional dependency NumPy (``pip install cri_lib[numpy]``).
+    """
+
+    __slots__ = ("_robot_state", "_cache")
+
+    def __init__(self, robot_state: "RobotState") -> None:
+        """Create array views of a robot state.
+
+        Parameters
+        ----------
+        robot_state : RobotState
+            robot state snapshot the arrays are created from
+
+        Raises
+        ------
+        ImportError
+            raised if NumPy is not installed
+        """
+        if np is None:
+            raise ImportError(
+                "NumPy is required for array views of the robot state, "
+                "install it with `pip install cri_lib[numpy]`."
+            )
+        self._robot_state = robot_state
+        self._cache: dict[str, tuple[Any, Any]] = {}
+        """field object and array per array name"""
+
+    def _array(self, name: str, source: Any, values: Callable[[Any], tuple]) -> Any:
+        """Returns the cached array of `name` if its field still holds `source`."""
+        entry = self._cache.get(name)
+        # an identity check instead of comparing the values of every field
+        if entry is None or entry[0] is not source:
+            array = np.array(values(source), dtype=np.float64)
+            array.setflags(write=False)
+            entry = self._cache[name] = (source, array)
+        return entry[1]
+
+    def _bit_array(self, name: str, bits: int, length: int) -> Any:
+        entry = self._cache.get(name)
+        if entry is None or entry[0] != bits:
+            packed = np.frombuffer(bits.to_bytes(length // 8, "little"), np.uint8)
+            array = np.unpackbits(packed, bitorder="little").view(np.bool_)
+            array.setflags(write=False)
+            entry = self._cache[name] = (bits, array)
+        return entry[1]
+
+    @property
+    def joints_current(self) -> Any:
+        """Actual positions of all 16 axes as float64 array."""
+        return self._array(
+            "joints_current", self._robot_state.joints_current, _get_joints
+        )
+
+    @property
+    def joints_set_point(self) -> Any:
+        """Target positions of all 16 axes as float64 array."""
+        return self._array(
+            "joints_set_point", self._robot_state.joints_set_point, _get_joints
+        )
+
+    @property
+    def position_robot(self) -> Any:
+        """Cartesian position of the robot (X, Y, Z, A, B, C) as float64 array."""
+        return self._array(
+            "position_robot", self._robot_state.position_robot, _get_cartesian
+        )
+
+    @property
+    def current_joints(self) -> Any:
+        """Currents of the individual axes as float64 array."""
+        return self._array("current_joints", self._robot_state.current_joints, tuple)
+
+    @property
+    def board_temps(self) -> Any:
+        """Temperatures of the motor controller PCBs as float64 array."""
+        return self._array("board_temps", self._robot_state.board_temps, tuple)
+
+    @property
+    def motor_temps(self) -> Any:
+        """Temperatures of the motors as float64 array."""
+        return self._array("motor_temps", self._robot_state.motor_temps, tuple)
+
+    @property
+    def din(self) -> Any:
+        """Digital inputs as bool array."""
+        return self._bit_array("din", self._robot_state.din_bits, 64)
+
+    @property
+    def dout(self) -> Any:
+        """Digital outputs as bool array."""
+        return self._bit_array("dout", self._robot_state.dout_bits, 64)
+
+    @property
+    def global_signals(self) -> Any:
+        """Global signals as bool array."""
+        return self._bit_array(
+            "global_signals", self._robot_state.global_signals_bits, 128
+        )
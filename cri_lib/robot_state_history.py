@@ -0,0 +1,219 @@
+import struct
+import threading
+from bisect import bisect_left
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from .robot_state import RobotState
+from .robot_state_arrays import _get_cartesian, _get_joints
+
+_BITS_64 = (1 << 64) - 1
+
+_ItemFormat = Literal["q", "Q", "h", "d"]
+"""struct formats of the column items, also used to cast the memoryviews"""
+
+_COLUMNS: dict[str, tuple[_ItemFormat, int]] = {
+    "time_ns": ("q", 1),
+    "joints_current": ("d", 16),
+    "joints_set_point": ("d", 16),
+    "position_robot": ("d", 6),
+    "current_joints": ("d", 16),
+    "din": ("Q", 1),
+    "dout": ("Q", 1),
+    "global_signals": ("Q", 2),
+    "kinematics_state": ("h", 1),
+}
+"""item format and number of items per sample of every column"""
+
+
+@dataclass(slots=True)
+class HistoryWindow:
+    """
+    Samples of a ``RobotStateHistory`` as zero-copy views, oldest sample first.
+
+    Every field is a ``memoryview`` of shape `(n,)` or `(n, items)`, use e.g.
+    ``numpy.asarray(window.joints_current)`` to get an array view. The views refer to
+    the memory of the history and are overwritten once the history wrapped around,
+    copy them (e.g. ``window.time_ns.tolist()``) to keep them.
+    """
+
+    time_ns: memoryview
+    """receive time of the STATUS message in nanoseconds since epoch"""
+    joints_current: memoryview
+    """actual axis positions in `JointsState` order"""
+    joints_set_point: memoryview
+    """target axis positions in `JointsState` order"""
+    position_robot: memoryview
+    """cartesian position X, Y, Z, A, B, C of the robot"""
+    current_joints: memoryview
+    """currents of the individual axes"""
+    din: memoryview
+    """digital ins as 64 bit words"""
+    dout: memoryview
+    """digital outs as 64 bit words"""
+    global_signals: memoryview
+    """global signals as two 64 bit words (signals 0-63, signals 64-127)"""
+    kinematics_state: memoryview
+    """value of the `KinematicsState`"""
+
+    def __len__(self) -> int:
+        return len(self.time_ns)
+
+
+class RobotStateHistory:
+    """
+    Fixed-memory ring buffer of the numeric fields of recent robot states.
+
+    All memory is allocated on creation, appending a robot state is O(1) and does not
+    allocate. Every sample is written twice (at its ring position and one capacity
+    behind), so every window of samples is contiguous and queries return views instead
+    of copies.
+
+    Samples are appended for every STATUS message if enabled with
+    ``CRIClient.enable_history``. Time queries assume the receive timestamps are
+    increasing.
+    """
+
+    DEFAULT_CAPACITY = 10000
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """
+        Create an empty history.
+
+        Parameters
+        ----------
+        capacity : int
+            maximum number of samples, the oldest samples are overwritten if exceeded
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._next = 0
+        """ring position of the next sample"""
+        self._count = 0
+
+        self._buffers: dict[str, bytearray] = {}
+        self._structs: dict[str, struct.Struct] = {}
+        self._writers: list[tuple[Callable[..., None], bytearray, int]] = []
+        """pack function, buffer and sample size of every column in `_COLUMNS` order"""
+        for name, (item_format, items) in _COLUMNS.items():
+            packer = struct.Struct(f"={items}{item_format}")
+            buffer = bytearray(2 * capacity * packer.size)
+            self._structs[name] = packer
+            self._buffers[name] = buffer
+            self._writers.append((packer.pack_into, buffer, packer.size))
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the preallocated memory in bytes."""
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    def clear(self) -> None:
+        """Removes all samples."""
+        with self._lock:
+            self._next = 0
+            self._count = 0
+
+    def append(self, robot_state: RobotState) -> None:
+        """
+        Appends the numeric fields of a robot state.
+
+        Parameters
+        ----------
+        robot_state : RobotState
+            robot state to store, timestamp is the receive time of its STATUS message
+        """
+        global_signals = robot_state.global_signals_bits
+        # in `_COLUMNS` order
+        values = (
+            (robot_state.category_time_ns.get("STATUS", 0),),
+            _get_joints(robot_state.joints_current),
+            _get_joints(robot_state.joints_set_point),
+            _get_cartesian(robot_state.position_robot),
+            robot_state.current_joints,
+            (robot_state.din_bits,),
+            (robot_state.dout_bits,),
+            (global_signals & _BITS_64, global_signals >> 64),
+            (robot_state.kinematics_state.value,),
+        )
+
+        with self._lock:
+            position = self._next
+            mirror = position + self.capacity
+            for (pack_into, buffer, size), value in zip(self._writers, values):
+                pack_into(buffer, position * size, *value)
+                pack_into(buffer, mirror * size, *value)
+
+            self._next = (position + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def latest(self, count: int | None = None) -> HistoryWindow:
+        """
+        Returns the most recent samples.
+
+        Parameters
+        ----------
+        count : int | None
+            maximum number of samples, all if `None`
+
+        Returns
+        -------
+        HistoryWindow
+            views of the samples, oldest first
+        """
+        with self._lock:
+            start = self._next - self._count + self.capacity
+            if count is not None:
+                count = max(0, min(count, self._count))
+                start += self._count - count
+            else:
+                count = self._count
+            return self._window(start % self.capacity, count)
+
+    def window(
+        self, start_ns: int | None = None, end_ns: int | None = None
+    ) -> HistoryWindow:
+        """
+        Returns the samples received in a time window.
+
+        Parameters
+        ----------
+        start_ns : int | None
+            first receive time included in nanoseconds since epoch, unbounded if `None`
+        end_ns : int | None
+            first receive time excluded in nanoseconds since epoch, unbounded if `None`
+
+        Returns
+        -------
+        HistoryWindow
+            views of the samples, oldest first
+        """
+        with self._lock:
+            start = (self._next - self._count) % self.capacity
+            time_ns = self._column("time_ns", start, self._count)
+
+            first = 0 if start_ns is None else bisect_left(time_ns, start_ns)
+            last = len(time_ns) if end_ns is None else bisect_left(time_ns, end_ns)
+            return self._window(start + first, max(0, last - first))
+
+    def _window(self, start: int, count: int) -> HistoryWindow:
+        """Creates views of `count` samples beginning at buffer position `start`."""
+        return HistoryWindow(
+            **{name: self._column(name, start, count) for name in _COLUMNS}
+        )
+
+    def _column(self, name: str, start: int, count: int) -> "memoryview[Any]":
+        """Creates a view of `count` samples of a column beginning at `start`."""
+        item_format, items = _COLUMNS[name]
+        size = self._structs[name].size
+        view = memoryview(self._buffers[name])[start * size : (start + count) * size]
+        if items == 1 or count == 0:
+            # memoryviews can not have zeros in their shape
+            return view.cast(item_format)
+        return view.cast(item_format, [count, items])
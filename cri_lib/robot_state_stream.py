@@ -0,0 +1,88 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+from .robot_state import RobotState
+
+
+class RobotStateStream:
+    """
+    Latest-value channel passing robot state snapshots into an event loop.
+
+    Snapshots can be published from any thread, e.g. the receive thread of a
+    ``CRIClient``. The event loop is woken at most once per consumed snapshot: if the
+    consumer is slower than the published snapshots, only the latest one is kept
+    (conflation) and the skipped ones are counted in `skipped_count`.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Create a stream delivering snapshots to `loop`.
+
+        Parameters
+        ----------
+        loop : asyncio.AbstractEventLoop
+            event loop of the consumer
+        """
+        self.loop = loop
+        self.closed = False
+        self.skipped_count = 0
+        """number of snapshots replaced by a newer one before they were consumed"""
+        self._event = asyncio.Event()
+        self._latest: RobotState | None = None
+        self._notified = False
+        """whether a wake-up of the consumer is pending"""
+
+    def publish(self, robot_state: RobotState) -> None:
+        """
+        Replaces the latest snapshot and wakes the consumer. Can be called from any
+        thread.
+
+        Parameters
+        ----------
+        robot_state : RobotState
+            new snapshot
+        """
+        if self._notified:
+            self.skipped_count += 1
+        self._latest = robot_state
+        if not self._notified:
+            self._notified = True
+            self._wake()
+
+    def close(self) -> None:
+        """Ends the iteration of ``updates`` once the latest snapshot was consumed."""
+        self.closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            # the event loop is closed, there is no consumer anymore
+            pass
+
+    async def updates(self, max_rate: float | None = None) -> AsyncIterator[RobotState]:
+        """
+        Yields the published snapshots, each at most once.
+
+        Parameters
+        ----------
+        max_rate : float | None
+            maximum number of snapshots per second, snapshots published in between are
+            conflated to the latest one, unlimited if `None`
+        """
+        interval = 1 / max_rate if max_rate else 0.0
+        last: RobotState | None = None
+        while True:
+            await self._event.wait()
+            self._event.clear()
+            self._notified = False
+            robot_state = self._latest
+            if robot_state is not None and robot_state is not last:
+                last = robot_state
+                next_time = self.loop.time() + interval
+                yield robot_state
+                if interval and (delay := next_time - self.loop.time()) > 0:
+                    await asyncio.sleep(delay)
+            if self.closed and self._latest is last:
+                return
@@ -0,0 +1,286 @@
+import logging
+import re
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import fields
+from operator import attrgetter, itemgetter
+from time import monotonic
+from typing import Any
+
+from .robot_state import RobotState
+
+logger = logging.getLogger(__name__)
+
+_BIT_FIELDS = {
+    "din": "din_bits",
+    "dout": "dout_bits",
+    "global_signals": "global_signals_bits",
+}
+"""bit field properties and the integer field they are computed from"""
+
+_STATE_FIELDS = frozenset(
+    robot_field.name
+    for robot_field in fields(RobotState)
+    if not robot_field.name.startswith("_")
+)
+
+_SPEC_PATTERN = re.compile(r"(?P<name>\w+)|\.(?P<attribute>\w+)|\[(?P<index>-?\d+)\]")
+
+_UNSET: Any = object()
+"""value of a field before the first robot state was seen"""
+
+
+def _compile_getter(spec: str) -> tuple[str, Callable[[RobotState], Any]]:
+    """
+    Compiles a field specification to a getter.
+
+    Parameters
+    ----------
+    spec : str
+        attribute of ``RobotState`` optionally followed by attributes and indices, e.g.
+        `kinematics_state`, `din[12]` or `joints_current.A1`
+
+    Returns
+    -------
+    tuple[str, Callable[[RobotState], Any]]
+        the robot state field the value depends on and the getter of the value
+
+    Raises
+    ------
+    ValueError
+        if the specification is malformed or the field does not exist
+    """
+    getters: list[Callable[[Any], Any]] = []
+    position = 0
+    while position < len(spec):
+        match = _SPEC_PATTERN.match(spec, position)
+        if match is None or (position == 0) != (match["name"] is not None):
+            raise ValueError(f"Invalid field specification {spec!r}")
+        if match["index"] is not None:
+            getters.append(itemgetter(int(match["index"])))
+        else:
+            getters.append(attrgetter(match["name"] or match["attribute"]))
+        position = match.end()
+
+    name = spec.split(".", 1)[0].split("[", 1)[0]
+    source = _BIT_FIELDS.get(name, name)
+    if not getters or source not in _STATE_FIELDS:
+        raise ValueError(f"Unknown robot state field {spec!r}")
+
+    if len(getters) == 1:
+        return source, getters[0]
+
+    def getter(robot_state: RobotState) -> Any:
+        value: Any = robot_state
+        for get in getters:
+            value = get(value)
+        return value
+
+    return source, getter
+
+
+class _TrackedField:
+    """Latest value of a field specification shared by its subscriptions."""
+
+    __slots__ = ("spec", "source", "getter", "source_value", "value", "subscriptions")
+
+    def __init__(self, spec: str) -> None:
+        self.spec = spec
+        self.source, self.getter = _compile_getter(spec)
+        self.source_value: Any = _UNSET
+        """robot state field the value was last computed from"""
+        self.value: Any = _UNSET
+        self.subscriptions: list[StateSubscription] = []
+
+
+class StateSubscription:
+    """
+    Subscription to changes of fields of the robot state, see
+    ``RobotStateSubscriptions.subscribe``.
+    """
+
+    def __init__(
+        self,
+        registry: "RobotStateSubscriptions",
+        specs: tuple[str, ...],
+        callback: Callable[[dict[str, Any], RobotState], None],
+        min_interval: float,
+    ) -> None:
+        self.fields = specs
+        """subscribed field specifications"""
+        self.callback = callback
+        self.min_interval = min_interval
+        """minimum time in seconds between two calls of the callback"""
+        self.active = True
+        self.values: dict[str, Any] = {}
+        """values of the last call of the callback"""
+        self._registry = registry
+        self._tracked: tuple[_TrackedField, ...] = ()
+        self._last_call = -float("inf")
+
+    def cancel(self) -> None:
+        """Stops calling the callback. Pending changes are discarded."""
+        self._registry._remove(self)
+
+
+class RobotStateSubscriptions:
+    """
+    Registry of subscriptions to changes of individual robot state fields.
+
+    Every received message is checked against the subscribed fields only: a field is
+    skipped if the robot state field it depends on is the identical object as before,
+    i.e. it was not touched by the message, and otherwise its value is compared with the
+    previous one. Subscriptions to the same field share this comparison, so the cost
+    per message grows with the number of distinct subscribed fields, not with the
+    number of subscribers.
+
+    Callbacks are executed by the receive thread (or the event loop of an
+    ``AsyncCRIClient``) and should be fast. Exceptions raised by callbacks are logged.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._fields: dict[str, _TrackedField] = {}
+        self._tracked: tuple[_TrackedField, ...] = ()
+        """snapshot of the tracked fields iterated by ``dispatch``"""
+        self._dirty: dict[StateSubscription, None] = {}
+        """subscriptions with changes not yet passed to their callback, in order"""
+
+    def __len__(self) -> int:
+        return len(self._tracked)
+
+    def subscribe(
+        self,
+        fields: str | Iterable[str],
+        callback: Callable[[dict[str, Any], RobotState], None],
+        min_interval: float = 0.0,
+    ) -> StateSubscription:
+        """
+        Calls `callback` whenever the value of one of `fields` changes.
+
+        The callback is called with a dict of the changed fields and their new values
+        and the robot state snapshot containing them:
+        ``def callback(changes: dict[str, Any], state: RobotState)``. The first message
+        after subscribing reports the current values of all fields.
+
+        With a `min_interval`, changes within the interval after a call are coalesced
+        and passed with the first message received after the interval elapsed, fields
+        which changed back to their previously reported value are omitted.
+
+        Parameters
+        ----------
+        fields : str | Iterable[str]
+            field specifications, a ``RobotState`` attribute optionally followed by
+            attributes and indices, e.g. `kinematics_state`, `din[12]`,
+            `joints_current.A1` or `main_runstate`
+        callback : Callable[[dict[str, Any], RobotState], None]
+            function called with the changed values and the robot state
+        min_interval : float
+            minimum time in seconds between two calls of the callback
+
+        Returns
+        -------
+        StateSubscription
+            the subscription, call its ``cancel`` method to unsubscribe
+
+        Raises
+        ------
+        ValueError
+            if a field specification is malformed or refers to an unknown field
+        """
+        specs = (fields,) if isinstance(fields, str) else tuple(dict.fromkeys(fields))
+        if not specs:
+            raise ValueError("At least one field is required")
+        for spec in specs:
+            _compile_getter(spec)
+
+        subscription = StateSubscription(self, specs, callback, min_interval)
+        with self._lock:
+            tracked_fields = []
+            for spec in specs:
+                if (tracked := self._fields.get(spec)) is None:
+                    tracked = self._fields[spec] = _TrackedField(spec)
+                tracked.subscriptions = tracked.subscriptions + [subscription]
+                tracked_fields.append(tracked)
+            subscription._tracked = tuple(tracked_fields)
+            self._tracked = tuple(self._fields.values())
+            # report the current values of fields which are already tracked
+            self._dirty[subscription] = None
+        return subscription
+
+    def _remove(self, subscription: StateSubscription) -> None:
+        with self._lock:
+            if not subscription.active:
+                return
+            subscription.active = False
+            for tracked in subscription._tracked:
+                tracked.subscriptions = [
+                    other
+                    for other in tracked.subscriptions
+                    if other is not subscription
+                ]
+                if not tracked.subscriptions:
+                    del self._fields[tracked.spec]
+            self._tracked = tuple(self._fields.values())
+
+    def dispatch(self, robot_state: RobotState) -> None:
+        """
+        Compares the subscribed fields with a new robot state and calls the callbacks of
+        changed fields. Called by the client for every received message.
+
+        Parameters
+        ----------
+        robot_state : RobotState
+            the latest robot state snapshot
+        """
+        changed: list[StateSubscription] = []
+        for tracked in self._tracked:
+            source_value = getattr(robot_state, tracked.source)
+            if source_value is tracked.source_value:
+                continue
+            tracked.source_value = source_value
+            try:
+                value = tracked.getter(robot_state)
+            except (AttributeError, IndexError, KeyError, TypeError):
+                value = None
+            if value == tracked.value:
+                continue
+            tracked.value = value
+            changed.extend(tracked.subscriptions)
+
+        # an unlocked check is enough, subscriptions added meanwhile are reported
+        # by the next dispatch
+        if not changed and not self._dirty:
+            return
+
+        now = monotonic()
+        due = []
+        # ``subscribe`` marks new subscriptions from other threads
+        with self._lock:
+            dirty = self._dirty
+            for subscription in changed:
+                dirty[subscription] = None
+            for subscription in list(dirty):
+                if not subscription.active:
+                    del dirty[subscription]
+                elif now - subscription._last_call >= subscription.min_interval:
+                    del dirty[subscription]
+                    due.append(subscription)
+
+        for subscription in due:
+            changes = {}
+            for tracked in subscription._tracked:
+                value = tracked.value
+                if value is _UNSET:
+                    continue
+                if subscription.values.get(tracked.spec, _UNSET) != value:
+                    changes[tracked.spec] = value
+            if not changes:
+                continue
+
+            subscription.values.update(changes)
+            subscription._last_call = now
+            try:
+                subscription.callback(changes, robot_state)
+            except Exception:
+                logger.exception("Exception in subscription callback of %s", changes)
@@ -0,0 +1,54 @@
+import socket
+
+import pytest
+
+from cri_lib import CRIController, CRISimulator
+
+
+@pytest.fixture
+def simulator_options():
+    """Keyword arguments of the simulator, overridden by test modules."""
+    return {"status_rate": 10}
+
+
+@pytest.fixture
+def simulator(simulator_options):
+    simulator = CRISimulator(**simulator_options)
+    simulator.start_in_thread()
+    yield simulator
+    simulator.stop_in_thread()
+
+
+@pytest.fixture
+def controller(simulator):
+    controller = CRIController()
+    controller.connect("127.0.0.1", simulator.port)
+    yield controller
+    controller.close()
+
+
+@pytest.fixture
+def socket_controller():
+    """
+    Controller connected to a local socket instead of a robot controller.
+
+    Yields the controller and the peer socket, which only answers what a test sends
+    into it. The receive thread is not started.
+    """
+    controller = CRIController()
+    controller.sock, server_sock = socket.socketpair()
+    controller.connected = True
+    yield controller, server_sock
+    controller.connected = False
+    # ends a started receive thread blocked in `recv`
+    server_sock.close()
+    if controller.receive_thread.is_alive():
+        controller.receive_thread.join()
+    controller.sock.close()
+
+
+@pytest.fixture
+def unanswered_controller(socket_controller):
+    """Controller whose commands are sent to a socket which never answers."""
+    controller, _ = socket_controller
+    return controller
@@ -0,0 +1,20 @@
+import json
+
+from benchmarks import bench_suite
+
+
+def test_bench_suite_results():
+    results = bench_suite.main(
+        duration=0.01, samples=10, status_rates=(0, 100), connections=1
+    )
+    # results must be serializable for comparisons between versions
+    results = json.loads(json.dumps(results))
+
+    assert set(results["parser_messages_per_s"]) == set(bench_suite.CATEGORY_MESSAGES)
+    assert all(value > 0 for value in results["parser_messages_per_s"].values())
+    assert results["framing"]["receive_thread_frames_per_s"] > 0
+    assert results["framing"]["scanner_10_frames_per_read_frames_per_s"] > 0
+    assert set(results["round_trip"]) == {"status_0_hz", "status_100_hz"}
+    assert results["round_trip"]["status_0_hz"]["median_us"] > 0
+    assert results["memory_per_connection"]["CRIClient_threads"] == 2
+    assert "cri_lib_version" in results["metadata"]
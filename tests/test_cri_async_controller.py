@@ -0,0 +1,80 @@
+import asyncio
+
+from cri_lib import AsyncCRIController, CRIFrameScanner
+
+
+class FakeController:
+    """Minimal iRC stand-in acknowledging every `CMD` and sending one STATUS message."""
+
+    def __init__(self) -> None:
+        self.received: list[str] = []
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        scanner = CRIFrameScanner()
+        writer.write(
+            b"CRISTART 1 STATUS KINSTATE 0 ERROR NoError" + b" 0" * 16 + b" CRIEND"
+        )
+        while data := await reader.read(4096):
+            scanner.feed(data)
+            for frame in scanner.frames():
+                message = str(frame, "utf-8")
+                self.received.append(message)
+                parts = message.split()
+                if parts[2] != "CMD":
+                    continue
+                if parts[3] == "Move":
+                    writer.write(f"CRISTART 2 CMDACK {parts[1]} CRIEND".encode())
+                    writer.write(b"CRISTART 3 EXECEND CRIEND")
+                elif parts[3] == "Override" and float(parts[4]) > 100:
+                    writer.write(
+                        f"CRISTART 2 CMDERROR {parts[1]} out of range CRIEND".encode()
+                    )
+                else:
+                    writer.write(f"CRISTART 2 CMDACK {parts[1]} CRIEND".encode())
+        writer.close()
+
+
+async def run_against_fake_controller(test) -> FakeController:
+    fake = FakeController()
+    server = await asyncio.start_server(fake.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    controller = AsyncCRIController()
+    try:
+        await controller.connect("127.0.0.1", port)
+        await test(controller)
+    finally:
+        await controller.close()
+        server.close()
+        await server.wait_closed()
+    return fake
+
+
+def test_async_commands():
+    async def test(controller: AsyncCRIController):
+        assert await controller.enable()
+        assert await controller.set_override(50.0)
+        assert not await controller.set_override(150.0)
+        assert await controller.move_joints(
+            1, 2, 3, 4, 5, 6, 0, 0, 0, 10.0, wait_move_finished=True
+        )
+        assert controller.answers.counters()["entries"] == 0
+
+    fake = asyncio.run(run_against_fake_controller(test))
+
+    commands = [message.split(maxsplit=2)[2] for message in fake.received]
+    assert "CONFIG GetAxes CRIEND" in commands
+    assert "CMD Enable CRIEND" in commands
+    assert "CMD Override 50.0 CRIEND" in commands
+
+
+def test_async_status_and_alivejog():
+    async def test(controller: AsyncCRIController):
+        assert await controller.wait_for_kinematics_ready(timeout=5.0)
+        await asyncio.sleep(2.5 * controller.ALIVE_JOG_INTERVAL_SEC)
+
+    fake = asyncio.run(run_against_fake_controller(test))
+
+    alivejogs = [message for message in fake.received if "ALIVEJOG" in message]
+    assert len(alivejogs) >= 2
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from cri_lib import (
+    AdaptiveTimeout,
+    CRICommandTimeOutError,
+    CRIConnectionError,
+    CRIController,
+)
+from cri_lib.cri_answers import command_kind
+
+
+def test_wait_for_answer():
+    controller = CRIController()
+    controller._register_answer("123")
+
+    threading.Timer(
+        0.05, controller._parse_message, ["CRISTART 1 CMDACK 123 CRIEND"]
+    ).start()
+
+    assert controller._wait_for_answer("123", timeout=5.0) is None
+    assert "123" not in controller.answers
+
+
+def test_wait_for_answer_in_running_event_loop():
+    controller = CRIController()
+    controller._register_answer("123")
+    controller._parse_message("CRISTART 1 CMDERROR 123 There was an exception CRIEND")
+
+    async def wait():
+        return controller._wait_for_answer("123", timeout=5.0)
+
+    assert asyncio.run(wait()) == "There was an exception"
+
+
+def test_wait_for_answer_unregistered():
+    controller = CRIController()
+
+    assert controller._wait_for_answer("123", timeout=5.0) is None
+
+
+def test_wait_for_answer_async():
+    controller = CRIController()
+    controller._register_answer("123")
+
+    async def wait():
+        threading.Timer(
+            0.05,
+            controller._parse_message,
+            ["CRISTART 1 CMDERROR 123 There was an exception CRIEND"],
+        ).start()
+        return await controller._wait_for_answer_async("123", timeout=5.0)
+
+    assert asyncio.run(wait()) == "There was an exception"
+    assert "123" not in controller.answers
+
+
+def test_wait_for_answer_timeout():
+    controller = CRIController()
+    controller._register_answer("123")
+
+    t_start = time.monotonic()
+    with pytest.raises(CRICommandTimeOutError):
+        controller._wait_for_answer("123", timeout=0.05)
+    assert time.monotonic() - t_start < 1.0
+
+    controller._register_answer("124")
+    with pytest.raises(CRICommandTimeOutError):
+        asyncio.run(controller._wait_for_answer_async("124", timeout=0.05))
+
+    assert controller.answers.counters()["timed_out"] == 2
+    assert controller.answers.counters()["entries"] == 0
+
+
+def test_answers_shared_by_waiters():
+    controller = CRIController()
+    results = []
+
+    def wait():
+        controller._register_answer("status")
+        controller.wait_for_status_update(timeout=5.0)
+        results.append(True)
+
+    threads = [threading.Thread(target=wait) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    while controller.answers.counters()["registered"] == 0:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    controller._parse_message("CRISTART 1 STATUS KINSTATE 0 CRIEND")
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 3
+
+
+def test_orphaned_answers_expire():
+    controller = CRIController()
+    controller.answers.max_entries = 10
+
+    for i in range(100):
+        controller._register_answer(str(i))
+
+    counters = controller.answers.counters()
+    assert counters["entries"] == 10
+    assert counters["expired"] == 90
+
+    controller.answers.max_age = 0.0
+    controller.answers.expire()
+    assert controller.answers.counters()["entries"] == 0
+    assert controller.answers.counters()["expired"] == 100
+
+
+def test_fail_all_answers():
+    controller = CRIController()
+    answer = controller._register_answer("123")
+
+    controller.answers.fail_all(CRIConnectionError())
+
+    with pytest.raises(CRIConnectionError):
+        answer.result()
+
+
+def test_command_kind():
+    assert command_kind("CMD Enable") == "CMD Enable"
+    assert command_kind("CMD Move Joint 0 0 0 0 0 0 0 0 0 50") == "CMD Move Joint"
+    assert command_kind("CMD Override 50") == "CMD Override"
+    assert command_kind("SYSTEM GetBoardTemp") == "SYSTEM GetBoardTemp"
+
+
+def test_adaptive_timeout():
+    controller = CRIController()
+    for i in range(20):
+        controller.answers.register(str(i), "CMD Move Joint")
+        controller._parse_message(f"CRISTART 1 CMDACK {i} CRIEND")
+    controller.answers.register("20", "CMD Enable")
+
+    round_trip_times = controller.round_trip_times()
+    assert round_trip_times["CMD Move Joint"]["count"] == 20
+    assert round_trip_times["CMD Move Joint"]["max_us"] < 1e6
+    assert "CMD Enable" not in round_trip_times
+
+    policy = controller.enable_adaptive_timeouts(AdaptiveTimeout(min_timeout=0.05))
+    assert controller.answers.timeout_policy is policy
+
+    controller.answers.register("21", "CMD Move Joint")
+    t_start = time.monotonic()
+    with pytest.raises(CRICommandTimeOutError):
+        controller._wait_for_answer("21", timeout=30.0)
+    assert time.monotonic() - t_start < 1.0
+
+    # not enough samples of the command type for adapting
+    assert policy.timeout(None, 30.0) == 30.0
+    with pytest.raises(CRICommandTimeOutError):
+        controller._wait_for_answer("20", timeout=0.05)
+    # answers which timed out do not count as round trips
+    assert controller.round_trip_times()["CMD Move Joint"]["count"] == 20
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from cri_lib import CRICommandTimeOutError, CRIController
+from cri_lib.cri_deploy import controller_identity
+
+
+@pytest.fixture
+def simulator_options():
+    return {"status_rate": 10, "project_file": "Test.prj"}
+
+
+@pytest.fixture
+def controller(controller):
+    assert controller_identity(controller, timeout=5) == "Simulator|Test.prj"
+    return controller
+
+
+@pytest.fixture
+def project(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    for i in range(5):
+        (project / f"program_{i}.xml").write_text(f"<Program Nr={i} />\n")
+    return project
+
+
+def test_deploy_programs(simulator, controller, project):
+    result = controller.deploy_programs(project)
+    assert result
+    assert len(result.uploaded) == 5
+    assert result.skipped == []
+    assert simulator.files["Programs/program_3.xml"] == ["<Program Nr=3 />"]
+
+    manifest = json.loads((project / ".cri_deploy.json").read_text())
+    assert len(manifest["Simulator|Test.prj"]["Programs"]) == 5
+
+    # only modified and missing files are uploaded again
+    (project / "program_1.xml").write_text("<Program Nr=10 />\n")
+    del simulator.files["Programs/program_4.xml"]
+    result = controller.deploy_programs(project)
+    assert result.uploaded == ["program_1.xml", "program_4.xml"]
+    assert len(result.skipped) == 3
+    assert simulator.files["Programs/program_1.xml"] == ["<Program Nr=10 />"]
+
+    result = controller.deploy_programs(project, force=True)
+    assert len(result.uploaded) == 5
+
+
+def test_deploy_programs_failed(simulator, controller, project, tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    simulator.command_errors["UploadFileFinish"] = "Disk full"
+    result = controller.deploy_programs(project, manifest_path=manifest_path)
+    assert not result
+    assert result.failed["program_0.xml"].error == "Disk full"
+    assert json.loads(manifest_path.read_text())["Simulator|Test.prj"]["Programs"] == {}
+
+    del simulator.command_errors["UploadFileFinish"]
+    result = controller.deploy_programs(project, manifest_path=manifest_path)
+    assert result
+    assert len(result.uploaded) == 5
+
+
+def test_deploy_programs_without_identity(simulator, project):
+    controller = CRIController()
+    controller.DEFAULT_ANSWER_TIMEOUT = 0.3
+    controller.connect("127.0.0.1", simulator.port)
+    controller_identity(controller, timeout=5)
+    # e.g. a robot controller which did not report its project file
+    controller.parser.robot_state.project_file = ""
+
+    with pytest.raises(CRICommandTimeOutError):
+        controller.deploy_programs(project)
+    assert simulator.files == {}
+    assert not (project / ".cri_deploy.json").exists()
+    controller.close()
@@ -0,0 +1,139 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cri_lib import CallbackDispatcher, CRIController
+
+
+def blocked_callback(calls):
+    release = threading.Event()
+    started = threading.Event()
+
+    def callback(value):
+        started.set()
+        release.wait(5)
+        calls.append(value)
+
+    return callback, started, release
+
+
+def test_dispatcher_drop_oldest():
+    calls = []
+    callback, started, release = blocked_callback(calls)
+    with CallbackDispatcher(maxsize=3) as dispatcher:
+        dispatch = dispatcher.wrap(callback)
+        dispatch(0)
+        assert started.wait(5)
+        for value in range(1, 6):
+            dispatch(value)
+        assert dispatcher.counters()["dropped"] == 2
+        release.set()
+
+    assert calls == [0, 3, 4, 5]
+    assert dispatcher.counters() == {
+        "pending": 0,
+        "dispatched": 4,
+        "dropped": 2,
+        "conflated": 0,
+        "blocked": 0,
+        "errors": 0,
+    }
+    dispatch(6)
+    assert dispatcher.dropped_count == 3
+
+
+def test_dispatcher_conflate():
+    calls = []
+    other = []
+    callback, started, release = blocked_callback(calls)
+    dispatcher = CallbackDispatcher(overflow="conflate")
+    dispatch = dispatcher.wrap(callback)
+    dispatch_other = dispatcher.wrap(other.append)
+    dispatch(0)
+    assert started.wait(5)
+    for value in range(1, 10):
+        dispatch(value)
+        dispatch_other(value)
+    release.set()
+    dispatcher.close()
+
+    assert calls == [0, 9]
+    assert other == [9]
+    assert dispatcher.conflated_count == 16
+
+
+def test_dispatcher_block():
+    calls = []
+    callback, started, release = blocked_callback(calls)
+    dispatcher = CallbackDispatcher(maxsize=1, overflow="block")
+    dispatch = dispatcher.wrap(callback)
+    dispatch(0)
+    assert started.wait(5)
+    dispatch(1)
+
+    threading.Timer(0.05, release.set).start()
+    t_start = time.monotonic()
+    dispatch(2)
+    assert time.monotonic() - t_start >= 0.04
+    dispatcher.close()
+    assert calls == [0, 1, 2]
+    assert dispatcher.blocked_count == 1
+
+    with pytest.raises(ValueError):
+        CallbackDispatcher(overflow="latest")
+
+
+def test_dispatcher_executor(caplog):
+    calls = []
+
+    def callback(value):
+        if value == 3:
+            raise RuntimeError("callback failed")
+        calls.append((value, threading.current_thread().name))
+
+    with ThreadPoolExecutor(4, thread_name_prefix="pool") as executor:
+        dispatcher = CallbackDispatcher(executor=executor)
+        dispatch = dispatcher.wrap(callback)
+        for value in range(10):
+            dispatch(value)
+        dispatcher.close()
+
+    assert [value for value, _ in calls] == [0, 1, 2, 4, 5, 6, 7, 8, 9]
+    assert all(name.startswith("pool") for _, name in calls)
+    assert dispatcher.error_count == 1
+    assert "callback failed" in caplog.text
+
+
+def test_client_callbacks_dispatched():
+    controller = CRIController()
+    receive_thread = threading.current_thread()
+    threads = []
+    can_messages = []
+    done = threading.Event()
+
+    def status_callback(state):
+        threads.append(threading.current_thread())
+        time.sleep(0.01)
+        done.set()
+
+    with CallbackDispatcher(overflow="conflate") as dispatcher:
+        controller.register_status_callback(status_callback, dispatcher)
+        controller.register_can_callback(can_messages.append, dispatcher)
+
+        t_start = time.monotonic()
+        for _ in range(100):
+            controller._parse_message("CRISTART 1 STATUS KINSTATE 0 CRIEND")
+        # the slow callback does not delay parsing
+        assert time.monotonic() - t_start < 0.5
+        controller._parse_message(
+            "CRISTART 2 CANBridge Msg ID 42 Len 2 Data 1 2 0 0 0 0 0 0 Time 0 "
+            "SystemTime 10 CRIEND"
+        )
+        assert done.wait(5)
+
+    assert receive_thread not in threads
+    assert len(threads) < 100
+    assert can_messages[0]["id"] == 42
+    assert controller.can_queue.empty()
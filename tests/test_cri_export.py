@@ -0,0 +1,113 @@
+import csv
+
+import pytest
+
+from cri_lib import CRIRecorder, CRIRecordReader, export_recording
+
+AXES = "CRISTART 0 CONFIG Axes " + " ".join(
+    f"{axis} 1 -180 180 100" for axis in ("A1", "A2", "A3", "A4", "A5", "A6", "E1")
+)
+
+
+def status_message(i: int) -> str:
+    # the external axis follows the robot axes in STATUS messages
+    return (
+        f"CRISTART {i} STATUS POSJOINTCURRENT {i} 2 3 4 5 6 7 "
+        + " ".join(["0"] * 9)
+        + f" DIN {i:x} GSIG 10000000000000001"
+    )
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = tmp_path / "session.crirec"
+    messages = [AXES]
+    for i in range(1, 201):
+        messages.append(status_message(i))
+        if i % 50 == 0:
+            messages.append(f"CRISTART {i} RUNSTATE MAIN main.xml sub.xml 10 {i} 1 0")
+            messages.append(f"CRISTART {i} RUNSTATE LOGIC logic.xml logic.xml 3 1 0 1")
+        if i % 20 == 0:
+            messages.append(f"CRISTART {i} CYCLESTAT 9.5 {i}")
+        if i == 100:
+            messages.append(
+                f"CRISTART {i} VARIABLES ValueNrVariable #position 42.5 "
+                "ValuePosVariable #target " + " ".join(str(v) for v in range(15))
+            )
+
+    with CRIRecorder(path, "zlib", block_size=500) as recorder:
+        for i, message in enumerate(messages):
+            recorder.record(f"{message} CRIEND".encode(), timestamp_ns=i * 1000)
+        # sent frames are not exported
+        recorder.record(b"CRISTART 1 CYCLESTAT 1 1 CRIEND", sent=True)
+    return path
+
+
+def test_export_npz(recording, tmp_path):
+    np = pytest.importorskip("numpy")
+    with CRIRecordReader(recording) as reader:
+        assert len(reader.blocks) > 10
+        start_time_ns = reader.to_wall_time_ns(0)
+
+    paths = export_recording(recording, tmp_path / "npz", max_workers=2, chunk_blocks=2)
+    assert set(paths) == {"STATUS", "RUNSTATE", "CYCLESTAT", "VARIABLES"}
+
+    with np.load(paths["STATUS"]) as status:
+        assert status["time_ns"].shape == (200,)
+        assert np.all(np.diff(status["time_ns"]) > 0)
+        assert status["time_ns"][0] == start_time_ns + 1000
+        assert status["joints_current"].shape == (200, 16)
+        # axes are mapped with the CONFIG Axes message of the first chunk
+        assert status["joints_current"][:, 0].tolist() == list(range(1, 201))
+        assert status["joints_current"][-1, 6] == 7
+        assert status["din"].tolist() == list(range(1, 201))
+        assert status["global_signals"][0].tolist() == [1, 1]
+        assert status["mode"][0] == "joint"
+
+    with np.load(paths["RUNSTATE"]) as runstate:
+        assert runstate["interpreter"].tolist() == ["MAIN", "LOGIC"] * 4
+        assert runstate["current_command"].tolist()[::2] == [50, 100, 150, 200]
+        assert runstate["main_program"][1] == "logic.xml"
+
+    with np.load(paths["CYCLESTAT"]) as cyclestat:
+        assert cyclestat["workload"].tolist() == list(range(20, 201, 20))
+
+    with np.load(paths["VARIABLES"]) as variables:
+        assert variables["name"].tolist() == ["#position", "#target"]
+        assert variables["values"][0, 0] == 42.5
+        assert np.isnan(variables["values"][0, 1])
+        assert variables["values"][1].tolist() == list(range(15))
+
+
+def test_export_csv(recording, tmp_path):
+    paths = export_recording(
+        recording, tmp_path / "csv", "csv", ["STATUS", "CYCLESTAT"], max_workers=2
+    )
+    assert set(paths) == {"STATUS", "CYCLESTAT"}
+
+    with open(paths["STATUS"], newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == 200
+    assert [float(row["joints_current_0"]) for row in rows[:3]] == [1, 2, 3]
+    assert float(rows[0]["joints_current_6"]) == 7
+    assert rows[0]["global_signals_1"] == "1"
+
+    with open(paths["CYCLESTAT"], newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [float(row["workload"]) for row in rows] == list(range(20, 201, 20))
+
+    with pytest.raises(ValueError):
+        export_recording(recording, tmp_path / "csv", "csv", ["OPINFO"])
+
+
+def test_export_skips_truncated_frames(tmp_path):
+    path = tmp_path / "truncated.crirec"
+    with CRIRecorder(path) as recorder:
+        recorder.record(b"CRISTART 1", timestamp_ns=0)
+        recorder.record(b"CRISTART 1 CRIEND", timestamp_ns=0)
+        recorder.record(b"CRISTART 2 CYCLESTAT 9.5 20 CRIEND", timestamp_ns=1000)
+
+    paths = export_recording(path, tmp_path / "csv", "csv", ["CYCLESTAT"])
+    with open(paths["CYCLESTAT"], newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [float(row["workload"]) for row in rows] == [20]
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from cri_lib import AsyncCRIController, CRIController, CRISimulator, FileListCache
+
+
+def list_files_count(controller):
+    return controller.round_trip_times().get("CMD ListFiles", {}).get("count", 0)
+
+
+def test_file_list_cache():
+    cache = FileListCache(ttl=60)
+    future, owner = cache.begin("Programs")
+    assert owner
+    assert cache.begin("Programs") == (future, False)
+
+    cache.expect("Programs")
+    cache.receive("/Data/Programs", ["a.xml"])
+    assert cache.finish("Programs", future, True) == ["a.xml"]
+    assert future.result() == ("a.xml",)
+    assert cache.get("Programs") == ["a.xml"]
+    assert cache.get("Programs", max_age=0) is None
+    assert cache.begin("Programs")[1]
+
+    # a listing requested before an invalidation is not cached
+    cache.invalidate("Programs")
+    cache.expect("Programs")
+    cache.invalidate("Programs")
+    cache.receive("Programs", ["b.xml"])
+    assert cache.get("Programs") is None
+
+
+def test_list_files(simulator, controller, tmp_path):
+    simulator.files["Programs/a.xml"] = []
+    assert controller.list_files() == ["a.xml"]
+    assert controller.list_files() == ["a.xml"]
+    assert list_files_count(controller) == 1
+
+    # uploading into the directory invalidates its listing
+    program = tmp_path / "b.xml"
+    program.write_text("<Program />\n")
+    assert controller.upload_file(program, "Programs")
+    assert sorted(controller.list_files()) == ["a.xml", "b.xml"]
+    assert list_files_count(controller) == 2
+
+    assert controller.list_files("Other") == []
+    assert controller.list_files("Programs", max_age=0) is not None
+    assert list_files_count(controller) == 4
+
+
+def test_list_files_deduplicated(socket_controller):
+    # requests are sent to a socket which never answers
+    controller, server_sock = socket_controller
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(controller.list_files()))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+
+    received = b""
+    while b"CRIEND" not in received:
+        received += server_sock.recv(1024)
+    time.sleep(0.1)
+    controller._parse_message("CRISTART 1 INFO FileList Programs a.xml CRIEND")
+    for thread in threads:
+        thread.join()
+
+    server_sock.setblocking(False)
+    with pytest.raises(BlockingIOError):
+        received += server_sock.recv(1024)
+    assert received.count(b"ListFiles") == 1
+    assert results == [["a.xml"]] * 4
+
+
+def test_list_files_shares_owner_deadline(socket_controller):
+    controller, server_sock = socket_controller
+    controller.DEFAULT_ANSWER_TIMEOUT = 0.2
+
+    # a request for another directory holds the lock beyond the deadline
+    controller._list_files_lock.acquire()
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(controller.list_files()))
+        for _ in range(2)
+    ]
+    t_start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    controller._list_files_lock.release()
+
+    assert results == [None, None]
+    assert time.monotonic() - t_start < 1.0
+    server_sock.setblocking(False)
+    with pytest.raises(BlockingIOError):
+        server_sock.recv(1024)
+
+
+def test_list_files_failures_return_none(unanswered_controller):
+    # not connected
+    assert CRIController().list_files() is None
+
+    # no answer in time
+    controller = unanswered_controller
+    controller.DEFAULT_ANSWER_TIMEOUT = 0.1
+    assert controller.list_files() is None
+    assert controller.list_files() is None
+
+    async def run():
+        assert await AsyncCRIController().list_files() is None
+
+    asyncio.run(run())
+
+
+def test_list_files_async():
+    async def run():
+        async with CRISimulator(status_rate=10) as simulator:
+            simulator.files["Programs/a.xml"] = []
+            controller = AsyncCRIController()
+            await controller.connect("127.0.0.1", simulator.port)
+
+            results = await asyncio.gather(*(controller.list_files() for _ in range(4)))
+            assert results == [["a.xml"]] * 4
+            assert list_files_count(controller) == 1
+            await controller.close()
+
+    asyncio.run(run())
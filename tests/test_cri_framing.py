@@ -0,0 +1,106 @@
+from cri_lib import CRIController, CRIFrameScanner
+
+
+def frames_of(scanner: CRIFrameScanner) -> list[bytes]:
+    return [bytes(frame) for frame in scanner.frames()]
+
+
+def test_single_frame():
+    scanner = CRIFrameScanner()
+    scanner.feed(b"CRISTART 1 CYCLESTAT 9.5 12.3 CRIEND ")
+
+    assert frames_of(scanner) == [b"CRISTART 1 CYCLESTAT 9.5 12.3 CRIEND"]
+    assert scanner.pending_bytes == 1
+
+
+def test_multiple_frames_per_read():
+    scanner = CRIFrameScanner()
+    scanner.feed(b"CRISTART 1 CMDACK 1 CRIEND CRISTART 2 CMDACK 2 CRIEND\nCRISTART 3")
+
+    assert frames_of(scanner) == [
+        b"CRISTART 1 CMDACK 1 CRIEND",
+        b"CRISTART 2 CMDACK 2 CRIEND",
+    ]
+
+    scanner.feed(b" CMDACK 3 CRIEND")
+    assert frames_of(scanner) == [b"CRISTART 3 CMDACK 3 CRIEND"]
+    assert scanner.pending_bytes == 0
+
+
+def test_end_marker_split_between_reads():
+    scanner = CRIFrameScanner()
+    message = b"CRISTART 1 CYCLESTAT 9.5 12.3 CRIEND"
+
+    for i in range(len(message)):
+        scanner.feed(message[i : i + 1])
+        if i < len(message) - 1:
+            assert frames_of(scanner) == []
+
+    assert frames_of(scanner) == [message]
+
+
+def test_garbage_without_start_is_dropped():
+    scanner = CRIFrameScanner()
+    scanner.feed(b"1 CMDACK 1 CRIEND CRISTART 2 CMDACK 2 CRIEND")
+
+    assert frames_of(scanner) == [b"CRISTART 2 CMDACK 2 CRIEND"]
+
+
+def test_compaction_keeps_partial_frame():
+    scanner = CRIFrameScanner(capacity=64, min_read_size=16)
+    message = b"CRISTART 1 CYCLESTAT 9.5 12.3 CRIEND"
+
+    received = []
+    for _ in range(20):
+        scanner.feed(message[:20])
+        received.extend(frames_of(scanner))
+        scanner.feed(message[20:])
+        received.extend(frames_of(scanner))
+
+    assert received == [message] * 20
+    assert scanner.capacity == 64
+
+
+def test_buffer_grows_for_large_frame():
+    scanner = CRIFrameScanner(capacity=64, min_read_size=16)
+    message = b"CRISTART 1 INFO FileList Programs " + b"a.xml " * 100 + b"CRIEND"
+
+    for i in range(0, len(message), 16):
+        scanner.feed(message[i : i + 16])
+
+    assert frames_of(scanner) == [message]
+    assert scanner.capacity >= len(message)
+
+
+def test_recv_into():
+    class FakeSocket:
+        def __init__(self, chunks: list[bytes]):
+            self.chunks = chunks
+
+        def recv_into(self, buffer) -> int:
+            if not self.chunks:
+                return 0
+            chunk = self.chunks.pop(0)
+            buffer[: len(chunk)] = chunk
+            return len(chunk)
+
+    scanner = CRIFrameScanner()
+    sock = FakeSocket([b"CRISTART 1 CMDACK 1 CRI", b"END"])
+
+    assert scanner.recv_into(sock) == 23
+    assert frames_of(scanner) == []
+    assert scanner.recv_into(sock) == 3
+    assert frames_of(scanner) == [b"CRISTART 1 CMDACK 1 CRIEND"]
+    assert scanner.recv_into(sock) == 0
+
+
+def test_parse_memoryview_frame():
+    controller = CRIController()
+    scanner = CRIFrameScanner()
+    scanner.feed(b"CRISTART 1234 CYCLESTAT 9.5 12.3 CRIEND")
+
+    for frame in scanner.frames():
+        controller._parse_message(memoryview(frame))
+
+    assert controller.robot_state.cycle_time == 9.5
+    assert controller.robot_state.workload == 12.3
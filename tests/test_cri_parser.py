@@ -431,6 +431,151 @@ def test_regr_parse_status_plattform():
     assert robot_state_equal(controller.robot_state, robot_state_correct)
 
 
+def test_robot_state_snapshot():
+    """Previously obtained robot states must not change when new messages are parsed"""
+
+    controller = CRIController()
+    controller._parse_message(
+        "CRISTART 1234 STATUS OVERRIDE 80.0 DIN 0000000000000001 CRIEND"
+    )
+    snapshot = controller.robot_state
+    snapshot_copy = copy.deepcopy(snapshot)
+
+    controller._parse_message(
+        "CRISTART 1235 STATUS OVERRIDE 50.0 DIN 0000000000000002 CRIEND"
+    )
+    controller._parse_message("CRISTART 1236 CYCLESTAT 9.5 12.3 CRIEND")
+
+    assert snapshot == snapshot_copy
+    assert controller.robot_state is not snapshot
+    assert controller.robot_state.override == 50.0
+    assert controller.robot_state.din[1]
+    assert not controller.robot_state.din[0]
+    assert controller.robot_state.cycle_time == 9.5
+    assert set(controller.robot_state.category_time_ns) == {"STATUS", "CYCLESTAT"}
+    assert set(snapshot.category_time_ns) == {"STATUS"}
+
+
+def test_robot_state_not_copied_without_changes():
+    """Messages not changing any field only update the timestamp of the snapshot"""
+
+    controller = CRIController()
+    controller._parse_message("CRISTART 1 CYCLESTAT 9.5 12.3 CRIEND")
+    controller._parse_message("CRISTART 2 CMDACK 2 CRIEND")
+    snapshot = controller.robot_state
+    timestamps = dict(snapshot.category_time_ns)
+
+    controller._parse_message("CRISTART 3 CMDACK 3 CRIEND")
+    controller._parse_message("CRISTART 4 CYCLESTAT 9.5 12.3 CRIEND")
+
+    assert controller.robot_state is snapshot
+    assert snapshot.category_time_ns["CMDACK"] >= timestamps["CMDACK"]
+    assert snapshot.category_time_ns["CYCLESTAT"] >= timestamps["CYCLESTAT"]
+
+    controller._parse_message("CRISTART 5 CYCLESTAT 9.6 12.3 CRIEND")
+    assert controller.robot_state is not snapshot
+    assert controller.robot_state.cycle_time == 9.6
+    assert snapshot.cycle_time == 9.5
+
+
+def test_robot_state_single_lock_per_message():
+    """Each message is published with a single acquisition of the robot state lock"""
+
+    class CountingLock:
+        def __init__(self):
+            self.count = 0
+
+        def __enter__(self):
+            self.count += 1
+
+        def __exit__(self, *args):
+            pass
+
+    lock = CountingLock()
+    parser = CRIProtocolParser(RobotState(), lock)
+    parser.parse_message(
+        "CRISTART 1234 STATUS MODE joint OVERRIDE 80.0 ESTOP 3 SUPPLY 23000 "
+        "CURRENTALL 2600 KINSTATE 0 OPMODE 1 CARTSPEED 1.0 CRIEND"
+    )
+    assert lock.count == 1
+
+
+def test_robot_state_slots():
+    """Robot state types are slotted and error states are shared between axes"""
+
+    controller = CRIController()
+    controller._parse_message(
+        "CRISTART 1233 CONFIG Axes "
+        + " ".join(f"A{i} 1 -180 180 100" for i in range(1, 7))
+        + " CRIEND"
+    )
+    controller._parse_message(
+        "CRISTART 1234 STATUS ERROR NoError 1 0 1 " + " ".join(["0"] * 13) + " CRIEND"
+    )
+    robot_state = controller.robot_state
+
+    for value in (
+        robot_state,
+        robot_state.joints_current,
+        robot_state.position_robot,
+        robot_state.error_states[0],
+        PosVariable(),
+    ):
+        assert not hasattr(value, "__dict__")
+
+    assert robot_state.error_states[0] == ErrorStates(over_temp=True)
+    assert robot_state.error_states[0] is robot_state.error_states[2]
+    assert robot_state.error_states[1] is robot_state.error_states[3]
+    assert copy.deepcopy(robot_state) == robot_state
+
+
+def test_parse_state_lazy():
+    """Lazily decoded STATUS messages result in the same robot state"""
+
+    messages = [
+        "CRISTART 1233 CONFIG Axes "
+        + " ".join(f"A{i} 1 -180 180 100" for i in range(1, 7))
+        + " CRIEND",
+        "CRISTART 1234 STATUS MODE joint POSJOINTCURRENT "
+        + " ".join(f"{i}.0" for i in range(16))
+        + " ESTOP 3 ERROR NoError 1 "
+        + " ".join(["0"] * 15)
+        + " DIN 0000000000000FF00 KINSTATE 0 FRAMEROBOT MyFrame 1 2 3 4 5 6 CRIEND",
+        "CRISTART 1235 CYCLESTAT 9.5 12.3 CRIEND",
+        "CRISTART 1236 STATUS OVERRIDE 50.0 KINSTATE 30 CRIEND",
+    ]
+
+    eager = CRIProtocolParser(RobotState(), threading.Lock())
+    lazy = CRIProtocolParser(RobotState(), threading.Lock(), lazy_status=True)
+    snapshots = []
+    for message in messages:
+        eager.parse_message(message)
+        lazy.parse_message(message)
+        snapshots.append(lazy.robot_state)
+
+    assert robot_state_equal(lazy.robot_state, eager.robot_state)
+    assert lazy.robot_state.kinematics_state == KinematicsState(30)
+    assert lazy.robot_state.joints_current.A2 == 1.0
+    assert lazy.robot_state.din[8]
+
+    # older snapshots decode their own message
+    assert snapshots[1].kinematics_state == KinematicsState.NO_ERROR
+    assert snapshots[1].override == 100.0
+    assert snapshots[1].error_states[0].over_temp
+
+
+def test_parse_state_lazy_decodes_on_read():
+    """Segments are decoded on first read only"""
+
+    parser = CRIProtocolParser(RobotState(), threading.Lock(), lazy_status=True)
+    parser.parse_message("CRISTART 1 STATUS OVERRIDE invalid KINSTATE 0 CRIEND")
+    robot_state = parser.robot_state
+
+    assert robot_state.kinematics_state == KinematicsState.NO_ERROR
+    with pytest.raises(ValueError):
+        robot_state.override
+
+
 def test_parse_cyclestat():
     """Test for cyclestat message"""
 
@@ -668,21 +813,21 @@ def test_parse_cmdack():
     test_message = "CRISTART 1234 CMDACK 123 CRIEND"
 
     controller = CRIController()
-    controller.answer_events["123"] = threading.Event()
+    answer = controller._register_answer("123")
     controller._parse_message(test_message)
 
-    assert controller.answer_events["123"].is_set()
+    assert answer.done()
 
 
 def test_parse_cmderror():
     test_message = "CRISTART 1234 CMDERROR 123 There was an exception CRIEND"
 
     controller = CRIController()
-    controller.answer_events["123"] = threading.Event()
+    answer = controller._register_answer("123")
     controller._parse_message(test_message)
 
-    assert controller.answer_events["123"].is_set()
-    assert controller.error_messages["123"] == "There was an exception"
+    assert answer.done()
+    assert answer.result() == "There was an exception"
 
 
 def test_info_referencinginfo():
@@ -746,23 +891,21 @@ def test_parse_execend():
     test_message = "CRISTART 1234 EXECEND 0 0 CRIEND"
 
     controller = CRIController()
-    controller.answer_events["EXECEND"] = threading.Event()
+    answer = controller._register_answer("EXECEND")
     controller._parse_message(test_message)
 
-    assert controller.answer_events["EXECEND"].is_set()
+    assert answer.done()
 
 
 def test_parse_execerror():
     test_message = "CRISTART 67 EXECERROR 0 0 PGLinear exception: 'Out of reach' CRIEND"
 
     controller = CRIController()
-    controller.answer_events["EXECEND"] = threading.Event()
+    answer = controller._register_answer("EXECEND")
     controller._parse_message(test_message)
 
-    assert controller.answer_events["EXECEND"].is_set()
-    assert (
-        controller.error_messages["EXECEND"] == "0 0 PGLinear exception: 'Out of reach'"
-    )
+    assert answer.done()
+    assert answer.result() == "0 0 PGLinear exception: 'Out of reach'"
 
 
 def test_parse_can_brdige():
@@ -777,10 +920,10 @@ def test_parse_can_brdige():
     }
 
     controller = CRIController()
-    controller.answer_events["CAN"] = threading.Event()
+    answer = controller._register_answer("CAN")
     controller._parse_message(test_message)
 
-    assert controller.answer_events["CAN"].is_set()
+    assert answer.done()
     assert controller.can_queue.get_nowait() == can_message
 
 
@@ -807,10 +950,10 @@ def test_info_boardtemps():
     ]
 
     controller = CRIController()
-    controller.answer_events["info_boardtemp"] = threading.Event()
+    answer = controller._register_answer("info_boardtemp")
     controller._parse_message(test_message)
 
-    assert controller.answer_events["info_boardtemp"].is_set()
+    assert answer.done()
     assert controller.robot_state.board_temps == pytest.approx(board_temps)
 
 
@@ -837,10 +980,10 @@ def test_info_motortemps():
     ]
 
     controller = CRIController()
-    controller.answer_events["info_motortemp"] = threading.Event()
+    answer = controller._register_answer("info_motortemp")
     controller._parse_message(test_message)
 
-    assert controller.answer_events["info_motortemp"].is_set()
+    assert answer.done()
     assert controller.robot_state.motor_temps == pytest.approx(motor_temps)
 
 
@@ -850,9 +993,8 @@ def test_list_files():
     )
 
     controller = CRIController()
-    controller.answer_events["info_filelist"] = threading.Event()
+    answer = controller._register_answer("info_filelist")
     controller._parse_message(test_message)
 
-    assert controller.answer_events["info_filelist"].is_set()
-    assert "FirstFile.xml" in controller.file_list
-    assert "SecondFile.txt" in controller.file_list
+    assert answer.done()
+    assert controller.file_lists.get("BaseDir") == ["FirstFile.xml", "SecondFile.txt"]
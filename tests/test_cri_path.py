@@ -0,0 +1,116 @@
+import threading
+
+import pytest
+
+from cri_lib import CRICommandTimeOutError, Waypoint
+
+
+@pytest.fixture
+def simulator_options():
+    return {"status_rate": 10, "time_scale": 0.01}
+
+
+@pytest.fixture
+def controller(controller):
+    controller.enable()
+    return controller
+
+
+def test_waypoint_command():
+    assert Waypoint([1, 2, 3, 4, 5, 6], 50, "Joint").command() == (
+        "CMD Move Joint 1 2 3 4 5 6 0.0 0.0 0.0 50"
+    )
+    assert Waypoint([1, 2, 3, 0, 90, 0, 7], 100, acceleration=20).command() == (
+        "CMD Move Cart 1 2 3 0 90 0 7 0.0 0.0 100 #base 20"
+    )
+    with pytest.raises(ValueError):
+        Waypoint([1, 2, 3], 100).command()
+
+
+def test_move_commands_match_waypoints(socket_controller):
+    controller, server_sock = socket_controller
+    controller.MOVE_ANSWER_TIMEOUT = 0.01
+    moves = [
+        (controller.move_joints, (1, 2, 3, 4, 5, 6, 0.0, 0.0, 0.0, 50), "Joint", {}),
+        (
+            controller.move_cartesian,
+            (1, 2, 3, 0, 90, 0, 7, 0.0, 0.0, 100),
+            "Cart",
+            {"acceleration": 20},
+        ),
+        (
+            controller.move_tool_relative,
+            (1, 2, 3, 0, 90, 0, 0.0, 0.0, 0.0, 100),
+            "RelativeTool",
+            {"frame": "#tool"},
+        ),
+    ]
+
+    for move, args, kind, kwargs in moves:
+        with pytest.raises(CRICommandTimeOutError):
+            move(*args, **kwargs)
+        waypoint = Waypoint(args[:9], args[9], kind, **kwargs)
+        received = b""
+        while b"CRIEND" not in received:
+            received += server_sock.recv(1024)
+        assert received.decode().split(" ", 2)[2] == f"{waypoint.command()} CRIEND"
+
+
+def test_execute_path_exclusive(unanswered_controller):
+    controller = unanswered_controller
+    controller.MOVE_ANSWER_TIMEOUT = 0.5
+    start = threading.Barrier(4)
+    errors = []
+
+    def execute():
+        start.wait()
+        try:
+            controller.execute_path([Waypoint([0] * 6, 10)])
+        except Exception as e:
+            errors.append(type(e))
+
+    threads = [threading.Thread(target=execute) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # only one path is executed, its first move is not acknowledged
+    assert errors.count(CRICommandTimeOutError) == 1
+    assert errors.count(RuntimeError) == 3
+
+
+def test_execute_path(simulator, controller):
+    waypoints = [
+        Waypoint([10.0 * i, 0, 100, 0, 90, 0], 20, "Cart") for i in range(1, 21)
+    ]
+    result = controller.execute_path(waypoints, lookahead=3)
+
+    assert result.success
+    assert result.completed == 20
+    assert simulator.position[:3] == [200, 0, 100]
+    assert all(
+        segment.sent <= segment.acknowledged <= segment.finished
+        for segment in result.segments
+    )
+    assert result.total_time >= sum(segment.duration for segment in result.segments)
+    # the next move was queued before the previous one finished
+    assert all(
+        later.sent < earlier.finished
+        for earlier, later in zip(result.segments, result.segments[1:])
+    )
+    assert controller._execend_listener is None
+
+
+def test_execute_path_rejected_move(simulator, controller):
+    def waypoints():
+        for i in range(10):
+            if i == 5:
+                simulator.command_errors["Move"] = "Target not reachable"
+            yield Waypoint([0, 0, 0, 0, 0, i], 100, "RelativeJoint")
+
+    result = controller.execute_path(waypoints(), lookahead=2)
+    assert not result.success
+    assert result.error == "Target not reachable"
+    assert len(result.segments) == 5
+    assert result.completed <= 5
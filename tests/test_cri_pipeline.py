@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from cri_lib import CommandPipeline, CRICommandTimeOutError
+
+
+def test_pipeline(simulator, controller):
+    with controller.pipeline(window=8) as pipeline:
+        futures = [pipeline.submit(f"CMD DOUT {i} true") for i in range(50)]
+        pipeline.submit("CMD Unknown")
+        assert pipeline.in_flight <= 8
+    assert all(future.done() for future in futures)
+    assert pipeline.results() == [None] * 50 + ["Unknown command Unknown"]
+    assert simulator.dout_bits == (1 << 50) - 1
+    # answers are removed from the table once resolved
+    assert controller.answers.counters()["entries"] == 0
+
+    with pytest.raises(ValueError):
+        controller.pipeline(window=0)
+
+
+def test_pipeline_window_timeout(unanswered_controller):
+    controller = unanswered_controller
+    pipeline = CommandPipeline(controller, window=2, timeout=0.05)
+    pipeline.submit("CMD DOUT 1 true")
+    pipeline.submit("CMD DOUT 2 true")
+
+    t_start = time.monotonic()
+    with pytest.raises(CRICommandTimeOutError):
+        pipeline.submit("CMD DOUT 3 true")
+    assert time.monotonic() - t_start < 1.0
+    with pytest.raises(CRICommandTimeOutError):
+        pipeline.wait()
+
+    controller._parse_message("CRISTART 1 CMDACK 0 CRIEND")
+    pipeline.submit("CMD DOUT 3 true")
+    assert pipeline.in_flight == 2
+
+
+def test_command_ids_not_reused_while_outstanding(unanswered_controller):
+    controller = unanswered_controller
+    controller.sent_command_counter = 9998
+    pipeline = CommandPipeline(controller)
+    for i in range(3):
+        pipeline.submit(f"CMD DOUT {i} true")
+    assert controller.answers.is_outstanding("9999")
+    assert controller.answers.is_outstanding("1")
+
+    # 9998, 9999 and 1 are still outstanding after the counter wrapped
+    controller.sent_command_counter = 9998
+    assert controller.send_command("CMD Override 50", True) == 2
+    assert controller.send_command("CMD Override 50") == 3
+
+    controller._parse_message("CRISTART 1 CMDACK 9998 CRIEND")
+    assert pipeline.futures[0].done()
+    controller.sent_command_counter = 9998
+    assert controller.send_command("CMD Override 50") == 9998
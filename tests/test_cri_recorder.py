@@ -0,0 +1,107 @@
+import os
+import time
+
+import pytest
+
+from cri_lib import CRIRecorder, CRIRecordReader
+
+
+def frame(i: int) -> bytes:
+    return f"CRISTART {i} CYCLESTAT 9.5 {i} CRIEND".encode()
+
+
+@pytest.mark.parametrize("compression", [None, "zlib", "lzma"])
+def test_record_and_read(tmp_path, compression):
+    path = tmp_path / "session.crirec"
+    with CRIRecorder(path, compression, block_size=200) as recorder:
+        for i in range(100):
+            recorder.record(memoryview(frame(i)), sent=i % 10 == 0, timestamp_ns=i)
+        assert recorder.frame_count == 100
+
+    with CRIRecordReader(path) as reader:
+        assert reader.compression == compression
+        assert reader.frame_count == 100
+        assert len(reader.blocks) > 1
+
+        frames = list(reader.frames())
+        assert [f.data for f in frames] == [frame(i) for i in range(100)]
+        assert [f.timestamp_ns for f in frames] == list(range(100))
+        assert [f.sent for f in frames[:11]] == [True] + [False] * 9 + [True]
+
+        window = list(reader.frames(start_ns=42, end_ns=58))
+        assert [f.timestamp_ns for f in window] == list(range(42, 58))
+
+
+def test_seek_reads_only_needed_blocks(tmp_path):
+    path = tmp_path / "session.crirec"
+    with CRIRecorder(path, block_size=1) as recorder:
+        for i in range(1000):
+            recorder.record(frame(i), timestamp_ns=i * 1000)
+
+    with CRIRecordReader(path) as reader:
+        read_offsets = []
+        read_block = reader._read_block
+        reader._read_block = lambda offset: (
+            read_offsets.append(offset) or read_block(offset)
+        )
+
+        assert [f.timestamp_ns for f in reader.frames(500_000, 502_000)] == [
+            500_000,
+            501_000,
+        ]
+        assert len(read_offsets) == 2
+
+
+def test_recover_without_index(tmp_path):
+    path = tmp_path / "session.crirec"
+    with CRIRecorder(path, "zlib", block_size=100) as recorder:
+        for i in range(50):
+            recorder.record(frame(i), timestamp_ns=i)
+
+    # drop the last index entries and truncate the last block
+    index_size = os.path.getsize(recorder.index_path)
+    with open(recorder.index_path, "r+b") as index:
+        index.truncate(index_size - 2 * 28)
+    with CRIRecordReader(path) as reader:
+        assert reader.frame_count == 50
+
+    os.remove(recorder.index_path)
+    with open(path, "r+b") as recording:
+        recording.truncate(os.path.getsize(path) - 1)
+    with CRIRecordReader(path) as reader:
+        frames = [f.timestamp_ns for f in reader.frames()]
+        assert 0 < len(frames) < 50
+        assert frames == list(range(len(frames)))
+
+    with pytest.raises(FileExistsError):
+        CRIRecorder(path)
+
+
+def test_client_recording(tmp_path, socket_controller):
+    path = tmp_path / "session.crirec"
+    controller, server_sock = socket_controller
+    recorder = controller.start_recording(path, "lzma")
+    controller.receive_thread.start()
+
+    server_sock.sendall(frame(1) + frame(2)[:10])
+    controller._send_command("ALIVEJOG 0 0 0 0 0 0 0 0 0")
+    server_sock.sendall(frame(2)[10:])
+
+    deadline = time.monotonic() + 5
+    while recorder.frame_count < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    controller.connected = False
+    server_sock.recv(4096)
+    server_sock.close()
+    controller.receive_thread.join()
+    controller.stop_recording()
+    assert controller.recorder is None
+
+    with CRIRecordReader(path) as reader:
+        frames = list(reader.frames())
+    assert [f.data for f in frames if not f.sent] == [frame(1), frame(2)]
+    assert [f.data for f in frames if f.sent] == [
+        b"CRISTART 0 ALIVEJOG 0 0 0 0 0 0 0 0 0 CRIEND"
+    ]
+    assert controller.robot_state.workload == 2
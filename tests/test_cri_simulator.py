@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+
+from cri_lib import (
+    AsyncCRIController,
+    CRISimulator,
+    KinematicsState,
+    RunState,
+)
+
+
+@pytest.fixture
+def simulator_options():
+    return {"axes": ("A1", "A2", "A3", "A4", "A5", "A6", "E1"), "time_scale": 0.01}
+
+
+def test_simulator_status(simulator, controller):
+    controller.wait_for_status_update(timeout=5)
+    deadline = time.monotonic() + 5
+    while controller.robot_state.robot_axes_count == 0:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert controller.robot_state.external_axes_count == 1
+    assert controller.robot_state.robot_control_version == "Simulator"
+
+    assert controller.enable()
+    assert controller.wait_for_kinematics_ready(timeout=5)
+    assert controller.robot_state.kinematics_state == KinematicsState.NO_ERROR
+
+    assert controller.load_programm("test.xml")
+    assert controller.start_programm()
+    deadline = time.monotonic() + 5
+    while controller.robot_state.main_runstate != RunState.RUNNING:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert controller.robot_state.main_main_program == "test.xml"
+
+    assert controller.set_dout(3, True)
+    controller.wait_for_status_update(timeout=5)
+    controller.wait_for_status_update(timeout=5)
+    assert controller.robot_state.dout[3]
+
+
+def test_simulator_commands(simulator, controller):
+    assert not controller.move_joints(10, 0, 0, 0, 0, 0, 0, 0, 0, 50)
+
+    assert controller.enable()
+    assert controller.move_joints(
+        10, 20, 0, 0, 0, 0, 5, 0, 0, 50, wait_move_finished=True
+    )
+    assert controller.move_joints_relative(
+        1, 0, 0, 0, 0, 0, 0, 0, 0, 50, wait_move_finished=True
+    )
+    assert simulator.joints[:3] == [11, 20, 0]
+    controller.wait_for_status_update(timeout=5)
+    controller.wait_for_status_update(timeout=5)
+    assert controller.robot_state.joints_current.A1 == 11
+    assert controller.robot_state.joints_current.E1 == 5
+
+    simulator.command_errors["Reset"] = "Emergency stop"
+    assert not controller.reset()
+    msg_id = controller.send_command("CMD Unknown", True)
+    assert controller._wait_for_answer(msg_id, timeout=5) == "Unknown command Unknown"
+
+    assert controller.set_active_control(True)
+    assert controller.get_board_temperatures(timeout=5)
+
+    controller.enable_can_bridge(True)
+    controller.can_send(42, 2, bytearray(range(8)))
+    message = controller.can_receive(timeout=5)
+    assert message["id"] == 42
+    assert message["data"] == bytearray(range(8))
+
+
+def test_simulator_round_trip_times(simulator, controller):
+    controller.enable_adaptive_timeouts()
+    for _ in range(25):
+        assert controller.set_override(50)
+    assert controller.get_board_temperatures(timeout=5)
+
+    round_trip_times = controller.round_trip_times()
+    assert round_trip_times["CMD Override"]["count"] == 25
+    assert 0 < round_trip_times["CMD Override"]["p50_us"] < 1e6
+    assert round_trip_times["SYSTEM GetBoardTemp"]["count"] == 1
+    assert controller.set_override(100)
+
+
+def test_simulator_async():
+    async def run():
+        async with CRISimulator(status_rate=1000, cyclestat_rate=0) as simulator:
+            controller = AsyncCRIController()
+            await controller.connect("127.0.0.1", simulator.port)
+            counts = {"status": 0}
+
+            def count(state):
+                counts["status"] += 1
+
+            controller.register_status_callback(count)
+            await asyncio.sleep(0.2)
+            assert counts["status"] > 100
+
+            assert await controller.enable()
+            assert await controller.move_cartesian(
+                400, 0, 400, 0, 90, 0, 0, 0, 0, 1000, wait_move_finished=True
+            )
+            assert simulator.position[0] == 400
+            await controller.close()
+
+    asyncio.run(run())
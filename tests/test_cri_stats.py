@@ -0,0 +1,94 @@
+import asyncio
+import json
+import time
+
+from cri_lib import AsyncCRIClient, CRIController, CRISimulator, LatencyHistogram
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.snapshot()["p99_us"] == 0.0
+
+    for duration_ns in [1000] * 98 + [5000, 100_000]:
+        histogram.record(duration_ns)
+    histogram.record(-1)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 101
+    assert snapshot["max_us"] == 100.0
+    assert snapshot["p50_us"] == 1.024
+    assert snapshot["p99_us"] == 8.192
+    assert snapshot["buckets_us"] == {0.001: 1, 1.024: 98, 8.192: 1, 131.072: 1}
+
+
+def test_client_stats():
+    simulator = CRISimulator(status_rate=200, runstate_rate=20)
+    simulator.start_in_thread()
+    controller = CRIController()
+    stats = controller.enable_stats()
+    controller.jog_intervall = 0.01
+    callbacks = []
+    controller.register_status_callback(callbacks.append)
+    try:
+        controller.connect("127.0.0.1", simulator.port)
+        time.sleep(0.3)
+        assert controller.enable()
+        snapshot = controller.stats.snapshot()
+    finally:
+        controller.close()
+        simulator.stop_in_thread()
+
+    json.dumps(snapshot)
+    assert snapshot["frames_received"]["STATUS"] >= len(callbacks) - 1 > 10
+    assert snapshot["frames_received"]["RUNSTATE"] > 0
+    assert snapshot["frames_received"]["CMDACK"] == 1
+    assert snapshot["parse_time"]["STATUS"]["count"] > 10
+    assert snapshot["parse_time"]["STATUS"]["mean_us"] > 0
+    assert snapshot["status_callback_time"]["count"] >= len(callbacks) - 1
+    assert snapshot["bytes_received"] >= snapshot["receive_buffer_high_water"] > 0
+    assert snapshot["frames_sent"] > 10
+    assert snapshot["bytes_sent"] > 100
+    assert snapshot["alivejog_jitter"]["count"] > 10
+    assert snapshot["answers"]["outstanding"] == 0
+    assert snapshot["answers"]["resolved"] == 1
+
+    stats.reset()
+    assert stats.snapshot()["frames_received"] == {}
+
+
+def test_truncated_frames_with_stats(socket_controller):
+    controller, server_sock = socket_controller
+    stats = controller.enable_stats()
+    controller.receive_thread.start()
+
+    server_sock.sendall(
+        b"CRISTART CRIEND CRISTART 1 CRIEND CRISTART 2 CYCLESTAT 9.5 12.3 CRIEND"
+    )
+    deadline = time.monotonic() + 5.0
+    while controller.robot_state.cycle_time != 9.5:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert controller.receive_thread.is_alive()
+
+    snapshot = stats.snapshot()
+    assert snapshot["frames_received"]["UNKNOWN"] == 2
+    assert snapshot["frames_received"]["CYCLESTAT"] == 1
+
+
+def test_async_client_stats():
+    async def run():
+        async with CRISimulator(status_rate=200) as simulator:
+            client = AsyncCRIClient()
+            client.enable_stats()
+            await client.connect("127.0.0.1", simulator.port)
+            await asyncio.sleep(0.1)
+            await client.get_board_temperatures()
+            snapshot = client.stats.snapshot()
+            await client.close()
+        return snapshot
+
+    snapshot = asyncio.run(run())
+    assert snapshot["frames_received"]["STATUS"] > 5
+    assert snapshot["frames_received"]["INFO"] == 1
+    assert snapshot["bytes_received"] > 0
+    assert snapshot["frames_sent"] >= 3
@@ -0,0 +1,156 @@
+import asyncio
+import concurrent.futures
+import threading
+
+import pytest
+
+from cri_lib import (
+    AsyncCRIController,
+    CRIConnectionError,
+    CRISimulator,
+    UploadResult,
+)
+from cri_lib.cri_upload import (
+    read_upload_lines,
+    run_upload,
+    run_upload_async,
+    upload_steps,
+)
+
+
+@pytest.fixture
+def program(tmp_path):
+    path = tmp_path / "program.xml"
+    path.write_text("".join(f"<Line Nr={i} />  \n" for i in range(5000)))
+    return path
+
+
+def test_upload_file(simulator, controller, program):
+    progress = []
+    result = controller.upload_file(
+        program, "Programs", window=16, progress=lambda *args: progress.append(args)
+    )
+
+    assert result
+    assert result.error is None
+    assert result.target == "Programs/program.xml"
+    assert result.lines == result.acknowledged == 5000
+    assert result.lines_per_s > 0
+    assert progress[-1] == (5000, 5000)
+    assert len(progress) == 5000
+    assert simulator.files["Programs/program.xml"] == [
+        f"<Line Nr={i} />" for i in range(5000)
+    ]
+
+
+def test_upload_file_errors(simulator, controller, program, tmp_path):
+    result = controller.upload_file(tmp_path / "missing.xml", "Programs")
+    assert not result
+    assert result.error_line == 0
+
+    simulator.command_errors["UploadFileLine"] = "Line rejected"
+    result = controller.upload_file(program, "Programs")
+    assert not result
+    assert result.error == "Line rejected"
+    assert result.error_line == 1
+    assert result.acknowledged == 0
+    del simulator.command_errors["UploadFileLine"]
+
+    simulator.command_errors["UploadFileFinish"] = "Disk full"
+    result = controller.upload_file(program, "Programs")
+    assert not result
+    assert result.error == "Disk full"
+    assert result.error_line == 5001
+    assert result.acknowledged == 5000
+    assert "Programs/program.xml" not in simulator.files
+
+
+def test_upload_file_disconnected(unanswered_controller, program):
+    controller = unanswered_controller
+    disconnect = threading.Timer(
+        0.1, controller._disconnected, (CRIConnectionError("ConnectionLost"),)
+    )
+    disconnect.start()
+
+    result = controller.upload_file(program, "Programs")
+
+    assert not result
+    assert result.error == "ConnectionLost"
+    assert result.error_line == 0
+
+    # lines sent after the connection was lost
+    controller.connected = False
+    result = controller.upload_file(program, "Programs")
+    assert result.error_line == 0
+    assert result.error.startswith("Not connected")
+
+
+def test_upload_file_async(program):
+    async def run():
+        async with CRISimulator(status_rate=10) as simulator:
+            controller = AsyncCRIController()
+            await controller.connect("127.0.0.1", simulator.port)
+
+            result = await controller.upload_file(program, "Programs", window=8)
+            assert result
+            assert result.acknowledged == 5000
+            assert len(simulator.files["Programs/program.xml"]) == 5000
+
+            simulator.command_errors["UploadFileInit"] = "Invalid path"
+            result = await controller.upload_file(program, "Programs")
+            assert result.error_line == 0
+            assert result.error == "Invalid path"
+            await controller.close()
+
+    asyncio.run(run())
+
+
+def test_read_upload_lines_splits_only_line_endings(tmp_path):
+    path = tmp_path / "program.xml"
+    path.write_text("<A>\x0c</A>  \r\n<B>\x1e\u2028</B>\n")
+
+    assert read_upload_lines(path) == ["<A>\x0c</A>", "<B>\x1e\u2028</B>"]
+
+
+def test_upload_steps_window():
+    sent = []
+
+    def send(command):
+        sent.append(command)
+        future = concurrent.futures.Future()
+        future.set_result("Line rejected" if command.endswith("<C>") else None)
+        return future
+
+    result = UploadResult("Programs/program.xml")
+    run_upload(upload_steps(result, ["<A>", "<B>", "<C>"], send, 2, None), 1.0)
+
+    assert not result
+    assert result.error_line == 3
+    assert result.acknowledged == 2
+    assert sent[0] == "CMD UploadFileInit Programs/program.xml 3 0"
+    # no `UploadFileFinish` after a rejected line
+    assert sent[1:] == [f"CMD UploadFileLine <{c}>" for c in "ABC"]
+
+
+def test_upload_steps_answer_errors():
+    def send(command):
+        future = concurrent.futures.Future()
+        if command.endswith("<B>"):
+            future.set_exception(CRIConnectionError("ConnectionLost"))
+        else:
+            future.set_result(None)
+        return future
+
+    result = UploadResult("Programs/program.xml")
+    run_upload(upload_steps(result, ["<A>", "<B>", "<C>"], send, 1, None), 1.0)
+    assert result.error == "ConnectionLost"
+    assert result.error_line == 2
+    assert result.acknowledged == 1
+
+    result = UploadResult("Programs/program.xml")
+    asyncio.run(
+        run_upload_async(upload_steps(result, ["<A>", "<B>"], send, 2, None), 1.0)
+    )
+    assert result.error == "ConnectionLost"
+    assert result.error_line == 2
+    assert result.acknowledged == 1
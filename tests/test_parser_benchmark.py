@@ -0,0 +1,96 @@
+"""Throughput benchmarks of the message parser.
+
+The measured rates are attached to the test report as properties, e.g. visible in
+the JUnit XML report of `pytest --junitxml=report.xml`.
+"""
+
+import threading
+import time
+
+import pytest
+
+from benchmarks.bench_framing import STATUS_MESSAGE
+from cri_lib import CRIProtocolParser, JointsState, RobotState
+
+AXES_CONFIGURATIONS = {
+    "6-axis": ["A1", "A2", "A3", "A4", "A5", "A6"],
+    "6+3": ["A1", "A2", "A3", "A4", "A5", "A6", "E1", "E2", "E3"],
+    "platform": ["A1", "A2", "A3", "A4", "A5", "A6", "P1", "P2", "P3", "P4"],
+}
+
+
+@pytest.mark.parametrize("configuration", AXES_CONFIGURATIONS)
+def test_benchmark_parse_status(configuration, record_property):
+    parser = CRIProtocolParser(RobotState(), threading.Lock())
+    axes = AXES_CONFIGURATIONS[configuration]
+    parser.parse_message(
+        "CRISTART 1 CONFIG Axes "
+        + " ".join(f"{axis} 1 -180 180 100" for axis in axes)
+        + " CRIEND"
+    )
+
+    iterations = 2000
+    t_start = time.perf_counter()
+    for _ in range(iterations):
+        parser.parse_message(STATUS_MESSAGE)
+    rate = iterations / (time.perf_counter() - t_start)
+
+    record_property("status_messages_per_s", rate)
+    assert rate > 0
+
+    joints = parser.robot_state.joints_current
+    assert joints.A6 == 6.0
+    if configuration == "6+3":
+        assert (joints.E1, joints.E3, joints.P1) == (7.0, 9.0, 0.0)
+    elif configuration == "platform":
+        assert (joints.E1, joints.P1, joints.P4) == (0.0, 7.0, 10.0)
+    else:
+        assert joints == JointsState(1.0, 2.0, 3.0, 4.0, 5.0, 6.0)
+
+
+@pytest.mark.parametrize("lazy_status", [False, True], ids=["eager", "lazy"])
+def test_benchmark_parse_status_few_fields(lazy_status, record_property):
+    """Observer reading only a few fields of every STATUS message."""
+    parser = CRIProtocolParser(RobotState(), threading.Lock(), lazy_status)
+    parser.parse_message(
+        "CRISTART 1 CONFIG Axes "
+        + " ".join(f"{axis} 1 -180 180 100" for axis in AXES_CONFIGURATIONS["6-axis"])
+        + " CRIEND"
+    )
+
+    iterations = 2000
+    t_start = time.perf_counter()
+    for _ in range(iterations):
+        parser.parse_message(STATUS_MESSAGE)
+        robot_state = parser.robot_state
+        robot_state.kinematics_state
+        robot_state.position_robot
+        robot_state.main_runstate
+    rate = iterations / (time.perf_counter() - t_start)
+
+    record_property("status_messages_per_s", rate)
+    assert rate > 0
+
+    assert parser.robot_state.joints_current.A6 == 6.0
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["CRISTART 1 CMDACK 1 CRIEND", "CRISTART 1 CYCLESTAT 9.5 12.3 CRIEND"],
+    ids=["CMDACK", "CYCLESTAT"],
+)
+def test_benchmark_parse_without_changes(message, record_property):
+    """Messages not changing the robot state, which are not copied."""
+    parser = CRIProtocolParser(RobotState(), threading.Lock())
+    parser.parse_message(message)
+    robot_state = parser.robot_state
+
+    iterations = 20000
+    t_start = time.perf_counter()
+    for _ in range(iterations):
+        parser.parse_message(message)
+    rate = iterations / (time.perf_counter() - t_start)
+
+    record_property("messages_per_s", rate)
+    assert rate > 0
+    assert parser.robot_state is robot_state
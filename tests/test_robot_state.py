@@ -0,0 +1,77 @@
+import copy
+
+import pytest
+
+from cri_lib import CRIController, RobotState, changed_bits, din_mask, test_bits
+
+
+def test_bit_view():
+    state = RobotState()
+    state.din_bits = din_mask(0, 8, 63)
+
+    assert len(state.din) == 64
+    assert state.din[0] and state.din[8] and state.din[-1]
+    assert not state.din[1]
+    assert state.din[7:10] == [False, True, False]
+    assert [i for i, value in enumerate(state.din) if value] == [0, 8, 63]
+    assert state.din == [i in (0, 8, 63) for i in range(64)]
+    with pytest.raises(IndexError):
+        state.din[64]
+
+    state.din[1] = True
+    state.din[8:10] = [False, True]
+    assert state.din_bits == din_mask(0, 1, 9, 63)
+    with pytest.raises(ValueError):
+        state.din[0:2] = [True]
+
+    state.global_signals = [True] * 128
+    assert state.global_signals_bits == (1 << 128) - 1
+
+
+def test_bit_lists_in_constructor():
+    state = RobotState(din=[True, False, True], dout=[False, True])
+    assert state.din_bits == din_mask(0, 2)
+    assert state.dout_bits == din_mask(1)
+    assert state.global_signals_bits == 0
+    assert state == RobotState(din_bits=din_mask(0, 2), dout_bits=din_mask(1))
+
+
+def test_bit_helpers():
+    mask = din_mask(2, 3)
+    assert mask == 0b1100
+
+    assert test_bits(0b1110, mask)
+    assert not test_bits(0b0110, mask)
+    assert test_bits(0b0110, mask, expected=din_mask(2))
+    assert not test_bits(0b1110, mask, expected=0)
+
+    assert changed_bits(0b1010, 0b0110) == 0b1100
+    assert changed_bits(0b1010, 0b0110, mask=0b0100) == 0b0100
+
+
+def test_parse_signal_bits():
+    controller = CRIController()
+    controller._parse_message(
+        "CRISTART 1 STATUS DIN 0000000000000FF00 DOUT 8000000000000001 "
+        "GSIG 100000000000000000000000000000001 CRIEND"
+    )
+    state = controller.robot_state
+
+    assert state.din_bits == 0xFF00
+    assert state.dout_bits == din_mask(0, 63)
+    # surplus bits sent by the robot controller are ignored
+    assert state.global_signals_bits == 1
+
+
+def test_copy_shares_fields():
+    state = RobotState(din=[True])
+    state.cycle_time = 9.5
+    state.category_time_ns["CYCLESTAT"] = 1
+    state.arrays
+
+    copied = copy.copy(state)
+
+    assert copied == state
+    assert copied.joints_current is state.joints_current
+    assert copied._arrays is None
+    assert copied._pending is None
@@ -0,0 +1,98 @@
+import copy
+
+import pytest
+
+from cri_lib import CRIController, JointsState, RobotState, numpy_available
+
+np = pytest.importorskip("numpy")
+
+STATUS_MESSAGE = " ".join(
+    [
+        "CRISTART 1 STATUS",
+        "POSJOINTSETPOINT " + " ".join(f"{i}.00" for i in range(1, 17)),
+        "POSJOINTCURRENT " + " ".join(f"{i}.50" for i in range(1, 17)),
+        "POSCARTROBOT 10.0 20.0 30.0 0.00 90.00 0.00",
+        "DIN 0000000000000FF00 DOUT 0000000000000001",
+        "CURRENTJOINTS " + " ".join(str(10 * i) for i in range(1, 17)),
+        "GSIG 00ff00ff00ff CRIEND",
+    ]
+)
+
+
+def test_arrays():
+    controller = CRIController()
+    controller._parse_message(
+        "CRISTART 1 CONFIG Axes "
+        + " ".join(f"A{i} 1 -180 180 100" for i in range(1, 7))
+        + " CRIEND"
+    )
+    controller._parse_message(STATUS_MESSAGE)
+    arrays = controller.robot_state.arrays
+
+    assert numpy_available()
+    assert arrays.joints_set_point.dtype == np.float64
+    assert arrays.joints_set_point.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(
+        arrays.joints_set_point, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0] + [0.0] * 10
+    )
+    np.testing.assert_array_equal(arrays.joints_current[:6], np.arange(6) + 1.5)
+    np.testing.assert_array_equal(arrays.position_robot, [10, 20, 30, 0, 90, 0])
+    np.testing.assert_array_equal(
+        arrays.current_joints, [0.01 * i for i in range(1, 7)] + [0.0] * 10
+    )
+    np.testing.assert_array_equal(arrays.board_temps, np.zeros(16))
+    np.testing.assert_array_equal(arrays.motor_temps, np.zeros(16))
+
+    assert arrays.din.dtype == np.bool_
+    assert np.flatnonzero(arrays.din).tolist() == list(range(8, 16))
+    assert np.flatnonzero(arrays.dout).tolist() == [0]
+    assert arrays.global_signals.shape == (128,)
+    assert arrays.global_signals[:8].all() and not arrays.global_signals[8:16].any()
+
+
+def test_arrays_cached_per_snapshot():
+    controller = CRIController()
+    controller._parse_message(STATUS_MESSAGE)
+    robot_state = controller.robot_state
+    joints = robot_state.arrays.joints_current
+
+    assert robot_state.arrays.joints_current is joints
+    with pytest.raises(ValueError):
+        joints[0] = 1.0
+
+    controller._parse_message(
+        "CRISTART 2 STATUS POSJOINTCURRENT " + " ".join(["2.0"] * 16) + " CRIEND"
+    )
+    assert controller.robot_state.arrays is not robot_state.arrays
+    assert controller.robot_state.arrays.joints_current is not joints
+    # the previous snapshot keeps its arrays
+    assert robot_state.arrays.joints_current is joints
+    assert RobotState().arrays.joints_current.sum() == 0.0
+
+
+def test_arrays_follow_modifications():
+    robot_state = RobotState()
+    arrays = robot_state.arrays
+    din = arrays.din
+    temps = arrays.board_temps
+
+    robot_state.din[3] = True
+    assert np.flatnonzero(arrays.din).tolist() == [3]
+    robot_state.dout = [True, False, True]
+    assert np.flatnonzero(arrays.dout).tolist() == [0, 2]
+    robot_state.board_temps = [42.0] + robot_state.board_temps[1:]
+    assert arrays.board_temps[0] == 42.0
+    robot_state.joints_current = JointsState(A2=7.0)
+    assert arrays.joints_current[1] == 7.0
+    assert arrays.din is not din and arrays.board_temps is not temps
+
+    # the cache is keyed on the field object, modifications in place are not seen
+    robot_state.motor_temps[0] = 42.0
+    assert arrays.motor_temps[0] == 42.0
+    robot_state.motor_temps[1] = 43.0
+    assert arrays.motor_temps[1] == 0.0
+
+    copied = copy.copy(robot_state)
+    copied.din_bits = 0
+    assert not copied.arrays.din.any()
+    assert robot_state.arrays.din[3]
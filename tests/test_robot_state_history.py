@@ -0,0 +1,84 @@
+import pytest
+
+from cri_lib import CRIController, KinematicsState, RobotStateHistory
+
+
+def status_message(i: int) -> str:
+    return (
+        f"CRISTART {i} STATUS POSJOINTCURRENT "
+        + " ".join([f"{i}.5"] * 16)
+        + f" POSCARTROBOT {i} 2 3 4 5 6 DIN {i:x} KINSTATE {30 if i % 2 else 0}"
+        + " GSIG 10000000000000001 CRIEND"
+    )
+
+
+def make_controller(capacity: int) -> CRIController:
+    controller = CRIController()
+    controller._parse_message(
+        "CRISTART 0 CONFIG Axes "
+        + " ".join(f"A{i} 1 -180 180 100" for i in range(1, 7))
+        + " CRIEND"
+    )
+    controller.enable_history(capacity)
+    return controller
+
+
+def test_history_latest():
+    controller = make_controller(capacity=4)
+    history = controller.history
+    assert len(history) == 0
+    assert len(history.latest()) == 0
+
+    for i in range(1, 7):
+        controller._parse_message(status_message(i))
+    # other categories are not recorded
+    controller._parse_message("CRISTART 7 CYCLESTAT 9.5 12.3 CRIEND")
+
+    window = history.latest()
+    assert len(history) == len(window) == 4
+    assert [row[0] for row in window.joints_current.tolist()] == [3.5, 4.5, 5.5, 6.5]
+    assert window.joints_current.shape == (4, 16)
+    assert window.joints_current[0, 6] == 0.0
+    assert [row[0] for row in window.position_robot.tolist()] == [3, 4, 5, 6]
+    assert window.din.tolist() == [3, 4, 5, 6]
+    assert window.global_signals.tolist() == [[1, 1]] * 4
+    kinematics_states = [KinematicsState.VIRTUAL_BOX0, KinematicsState.NO_ERROR] * 2
+    assert window.kinematics_state.tolist() == [
+        state.value for state in kinematics_states
+    ]
+    assert history.latest(2).din.tolist() == [5, 6]
+    assert history.latest(10).din.tolist() == [3, 4, 5, 6]
+
+
+def test_history_window():
+    controller = make_controller(capacity=3)
+    history = controller.history
+    for i in range(1, 6):
+        controller._parse_message(status_message(i))
+
+    time_ns = history.latest().time_ns.tolist()
+    assert time_ns == sorted(time_ns)
+    assert len(history.window()) == 3
+    assert history.window(time_ns[1]).din.tolist() == [4, 5]
+    assert history.window(end_ns=time_ns[1]).din.tolist() == [3]
+    assert history.window(time_ns[1], time_ns[2]).din.tolist() == [4]
+    assert len(history.window(time_ns[-1] + 1)) == 0
+
+
+def test_history_views_and_memory():
+    history = RobotStateHistory(100)
+    nbytes = history.nbytes
+    controller = CRIController()
+    controller.history = history
+    for i in range(250):
+        controller._parse_message(status_message(i))
+
+    assert history.nbytes == nbytes
+    np = pytest.importorskip("numpy")
+    joints = np.asarray(history.latest().joints_current)
+    assert joints.shape == (100, 16)
+    assert not joints.flags.owndata
+    np.testing.assert_array_equal(joints[-10:], history.latest(10).joints_current)
+
+    with pytest.raises(ValueError):
+        RobotStateHistory(0)
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+
+from cri_lib import AsyncCRIClient, CRIClient, CRIConnector, CRISimulator
+
+
+def status(i: int) -> str:
+    return f"CRISTART {i} STATUS OVERRIDE {i} CRIEND"
+
+
+def test_status_updates_from_receive_thread():
+    client = CRIClient()
+    overrides = []
+
+    def receive():
+        for i in range(1, 1001):
+            client._parse_message(status(i))
+
+    async def consume():
+        async for state in client.status_updates():
+            overrides.append(state.override)
+            if state.override == 1000:
+                break
+            # slower than the receive thread
+            await asyncio.sleep(0.005)
+
+    async def run():
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+        thread = threading.Thread(target=receive)
+        thread.start()
+        await asyncio.wait_for(task, 5)
+        thread.join()
+
+    asyncio.run(run())
+    assert overrides[-1] == 1000
+    # intermediate snapshots are conflated, the order is kept
+    assert len(overrides) < 500
+    assert overrides == sorted(overrides)
+    assert client._status_streams == ()
+
+
+def test_status_updates_max_rate_and_close():
+    async def run():
+        async with CRISimulator(status_rate=1000) as simulator:
+            connector = CRIConnector("127.0.0.1", simulator.port)
+            async with connector.observe() as client:
+                t_start = time.monotonic()
+                count = 0
+                async for state in client.status_updates(max_rate=20):
+                    count += 1
+                    if count == 5:
+                        break
+                # 4 intervals of 50 ms
+                assert time.monotonic() - t_start > 0.15
+
+            client = AsyncCRIClient()
+            await client.connect("127.0.0.1", simulator.port)
+            updates = []
+
+            async def consume():
+                async for state in client.status_updates():
+                    updates.append(state)
+
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0.2)
+            await client.close()
+            # the iteration ends with the connection
+            await asyncio.wait_for(task, 5)
+            assert len(updates) > 10
+
+    asyncio.run(run())
@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+
+from cri_lib import CRIController, KinematicsState, RunState
+
+
+def status(kinstate: int = 0, din: int = 0, a1: float = 0.0) -> str:
+    joints = " ".join([str(a1)] + ["0"] * 15)
+    return (
+        f"CRISTART 1 STATUS POSJOINTCURRENT {joints} KINSTATE {kinstate} "
+        f"DIN {din:x} CRIEND"
+    )
+
+
+def test_subscribe_changes():
+    controller = CRIController()
+    calls = []
+    controller.subscribe(
+        ["kinematics_state", "din[12]"], lambda changes, state: calls.append(changes)
+    )
+    runstates = []
+    controller.subscribe(
+        "main_runstate", lambda changes, state: runstates.append(changes)
+    )
+
+    controller._parse_message(status())
+    assert calls == [{"kinematics_state": KinematicsState.NO_ERROR, "din[12]": False}]
+
+    # neither unchanged values nor other fields are reported
+    controller._parse_message(status(a1=10.0))
+    controller._parse_message(status(din=1))
+    assert len(calls) == 1
+
+    controller._parse_message(status(din=1 << 12))
+    controller._parse_message(status(kinstate=13, din=1 << 12))
+    assert calls[1:] == [
+        {"din[12]": True},
+        {"kinematics_state": KinematicsState.JOINT_MIN},
+    ]
+
+    controller._parse_message(
+        "CRISTART 2 RUNSTATE MAIN main.xml main.xml 12 3 2 0 CRIEND"
+    )
+    assert runstates == [
+        {"main_runstate": RunState.STOPPED},
+        {"main_runstate": RunState.RUNNING},
+    ]
+    assert len(calls) == 3
+
+
+def test_subscribe_coalescing():
+    controller = CRIController()
+    controller._parse_message(
+        "CRISTART 0 CONFIG Axes "
+        + " ".join(f"A{i} 1 -180 180 100" for i in range(1, 7))
+        + " CRIEND"
+    )
+    calls = []
+    subscription = controller.subscribe(
+        "joints_current.A1",
+        lambda changes, state: calls.append((changes, state.joints_current.A1)),
+        min_interval=0.1,
+    )
+    controller.subscribe("joints_current.A1", lambda changes, state: None)
+    assert len(controller.subscriptions) == 1
+
+    for a1 in range(10):
+        controller._parse_message(status(a1=a1))
+    assert calls == [({"joints_current.A1": 0.0}, 0.0)]
+
+    time.sleep(0.1)
+    controller._parse_message(status(a1=9))
+    assert calls[-1] == ({"joints_current.A1": 9.0}, 9.0)
+
+    subscription.cancel()
+    time.sleep(0.1)
+    controller._parse_message(status(a1=20))
+    assert len(calls) == 2
+
+
+def test_subscribe_errors(caplog):
+    controller = CRIController()
+    with pytest.raises(ValueError):
+        controller.subscribe("no_field", print)
+    with pytest.raises(ValueError):
+        controller.subscribe("din[", print)
+    with pytest.raises(ValueError):
+        controller.subscribe([], print)
+
+    def fail(changes, state):
+        raise RuntimeError("callback failed")
+
+    calls = []
+    controller.subscribe("din[0]", fail)
+    controller.subscribe("din[0]", lambda changes, state: calls.append(changes))
+    controller._parse_message(status(din=1))
+    assert calls == [{"din[0]": True}]
+    assert "callback failed" in caplog.text
+
+
+def test_subscribe_while_dispatching():
+    controller = CRIController()
+    controller._parse_message(status())
+    stop = threading.Event()
+
+    def receive():
+        kinstate = 0
+        while not stop.is_set():
+            kinstate ^= 13
+            controller._parse_message(status(kinstate=kinstate))
+
+    receiver = threading.Thread(target=receive)
+    receiver.start()
+    try:
+        calls = []
+        for _ in range(200):
+            controller.subscribe(
+                "kinematics_state", lambda changes, state: calls.append(changes)
+            )
+    finally:
+        stop.set()
+        receiver.join()
+
+    # every subscription reports at least the current value once
+    controller._parse_message(status())
+    assert len(calls) >= 200